@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from app.application.security.authenticated_user import AuthenticatedUser
+
+
+class IdentityCache(ABC):
+    """Short-lived cache of authenticated identities keyed by user id."""
+
+    @abstractmethod
+    async def get(self, user_id: UUID) -> AuthenticatedUser | None:
+        ...
+
+    @abstractmethod
+    async def set(self, user: AuthenticatedUser) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drops the identity on this node and on every other node."""
+        ...
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+
+class MembershipCache(ABC):
+    """
+    Answers "is user X a member of room Y" for hot paths.
+    get() returns None on a miss, so the caller falls back to the repository.
+    """
+
+    @abstractmethod
+    def get(self, room_id: UUID, user_id: UUID) -> bool | None:
+        ...
+
+    @abstractmethod
+    def set(self, room_id: UUID, user_id: UUID, is_member: bool) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate(self, room_id: UUID, user_id: UUID) -> None:
+        """Drops the entry on this node and on every other node."""
+        ...
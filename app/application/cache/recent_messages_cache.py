@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Iterable
+from uuid import UUID
+
+from app.domain.entities.message import Message
+
+
+class RecentMessagesCache(ABC):
+    """
+    Newest messages of hot rooms, so the first history page skips the database.
+    Buffers hold a contiguous newest-first suffix of room history.
+    """
+
+    @abstractmethod
+    async def get(self, room_id: UUID, limit: int) -> list[Message] | None:
+        """Newest-first page, or None when the buffer cannot answer it."""
+        ...
+
+    @abstractmethod
+    async def load(
+        self,
+        room_id: UUID,
+        messages: list[Message],
+        *,
+        complete: bool,
+    ) -> None:
+        """
+        Replaces the buffer with newest-first `messages` read from the database.
+        `complete` means there is no older history in the room.
+        """
+        ...
+
+    @abstractmethod
+    async def append(self, messages: Iterable[Message]) -> None:
+        """Adds committed messages to rooms that are already buffered."""
+        ...
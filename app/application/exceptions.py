@@ -32,3 +32,11 @@ class SecondUserIsRequired(ApplicationError):
 
 class UserNotInRoomError(ApplicationError):
     pass
+
+
+class PasswordHasherBusyError(ApplicationError):
+    pass
+
+
+class UserNotFoundError(ApplicationError):
+    pass
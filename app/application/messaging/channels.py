@@ -0,0 +1,12 @@
+from uuid import UUID
+
+
+ROOM_CHANNEL_PREFIX = "ws_events:room:"
+
+
+def room_channel(room_id: UUID) -> str:
+    return f"{ROOM_CHANNEL_PREFIX}{room_id}"
+
+
+# служебные события между инстансами (инвалидация кэшей и т.п.)
+CONTROL_CHANNEL = "ws_events:control"
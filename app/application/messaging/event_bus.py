@@ -1,10 +1,34 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
+from uuid import UUID
 
 class EventBus(ABC):
     @abstractmethod
     async def publish(self, event: dict) -> None:
         ...
 
+    @abstractmethod
+    async def publish_many(self, events: Iterable[dict]) -> None:
+        ...
+
     @abstractmethod
     async def subscribe(self, channel: str) -> None:
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    async def subscribe_room(self, room_id: UUID) -> None:
+        ...
+
+    @abstractmethod
+    async def unsubscribe_room(self, room_id: UUID) -> None:
+        ...
+
+    async def replay(
+        self,
+        room_id: UUID,
+        after_id: str,
+        *,
+        limit: int = 1000,
+    ) -> list[dict]:
+        """Room events published after `after_id`; empty when the bus keeps no history."""
+        return []
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from app.domain.entities.user import User
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.user_id import UserId
+
+
+class AuthenticatedUser:
+    """
+    Identity of the caller as seen by the auth layer.
+    Unlike User it carries no password hash, so it is safe to cache and share.
+    """
+
+    def __init__(
+        self,
+        user_id: UserId,
+        email: Email,
+        is_active: bool,
+        created_at: datetime,
+    ):
+        self._id = user_id
+        self._email = email
+        self._is_active = is_active
+        self._created_at = created_at
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(
+            user_id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            created_at=user.created_at,
+        )
+
+    @property
+    def id(self) -> UserId:
+        return self._id
+
+    @property
+    def email(self) -> Email:
+        return self._email
+
+    @property
+    def is_active(self) -> bool:
+        return self._is_active
+
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
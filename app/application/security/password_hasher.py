@@ -10,3 +10,13 @@ class PasswordHasher(ABC):
     @abstractmethod
     def verify(self, raw_password: str, hashed_password: str) -> bool:
         ...
+
+    @abstractmethod
+    async def hash_async(self, raw_password: str) -> str:
+        """Same as hash(), but does not block the event loop."""
+        ...
+
+    @abstractmethod
+    async def verify_async(self, raw_password: str, hashed_password: str) -> bool:
+        """Same as verify(), but does not block the event loop."""
+        ...
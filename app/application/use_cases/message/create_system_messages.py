@@ -0,0 +1,38 @@
+from typing import Iterable
+
+from app.application.uow.unit_of_work import UnitOfWork
+from app.domain.entities.message import Message
+from app.domain.repositories.message_repository import MessageRepository
+from app.domain.value_objects.room_id import RoomId
+
+
+class CreateSystemMessagesUseCase:
+    """Posts the same system notice into many rooms in one transaction."""
+
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        message_repository: MessageRepository,
+    ):
+        self._uow = uow
+        self._message_repo = message_repository
+
+    async def execute(
+        self,
+        *,
+        room_ids: Iterable[RoomId],
+        content: str,
+    ) -> list[Message]:
+        async with self._uow:
+            messages = [
+                Message.system(
+                    room_id=room_id,
+                    content=content,
+                )
+                for room_id in room_ids
+            ]
+
+            if messages:
+                await self._message_repo.add_many(messages)
+
+            return messages
@@ -1,4 +1,5 @@
 from app.application.uow.unit_of_work import UnitOfWork
+from app.application.cache.membership_cache import MembershipCache
 from app.application.exceptions import RoomNotFoundError, UserNotInRoomError
 from app.domain.entities.message import Message
 from app.domain.enums.message_type import MessageType
@@ -16,10 +17,12 @@ class CreateUserMessageUseCase:
         uow: UnitOfWork,
         message_repository: MessageRepository,
         room_repository: RoomRepository,
+        membership_cache: MembershipCache | None = None,
     ):
         self._uow = uow
         self._message_repo = message_repository
         self._room_repo = room_repository
+        self._membership_cache = membership_cache
 
     async def execute(
         self,
@@ -29,11 +32,10 @@ class CreateUserMessageUseCase:
         content: str,
     ) -> Message:
         async with self._uow:
-            room = await self._room_repo.get_by_id(room_id)
-            if room is None:
-                raise RoomNotFoundError()
-
-            if not room.is_member(sender_id.value):
+            if not await self._is_member(room_id, sender_id):
+                # отказ — редкий путь, здесь можно позволить себе второй запрос
+                if not await self._room_repo.exists(room_id):
+                    raise RoomNotFoundError()
                 raise UserNotInRoomError()
 
             message = Message(
@@ -47,3 +49,16 @@ class CreateUserMessageUseCase:
             await self._message_repo.add(message)
 
             return message
+
+    async def _is_member(self, room_id: RoomId, sender_id: UserId) -> bool:
+        if self._membership_cache is not None:
+            cached = self._membership_cache.get(room_id.value, sender_id.value)
+            if cached is not None:
+                return cached
+
+        is_member = await self._room_repo.is_member(room_id, sender_id.value)
+
+        if self._membership_cache is not None:
+            self._membership_cache.set(room_id.value, sender_id.value, is_member)
+
+        return is_member
@@ -0,0 +1,69 @@
+from typing import Iterable
+from uuid import UUID
+
+from app.application.cache.membership_cache import MembershipCache
+from app.domain.repositories.room_repository import RoomRepository
+from app.domain.value_objects.room_id import RoomId
+
+
+class CheckRoomMembershipUseCase:
+    def __init__(
+        self,
+        room_repository: RoomRepository,
+        membership_cache: MembershipCache | None = None,
+    ):
+        self._room_repository = room_repository
+        self._membership_cache = membership_cache
+
+    async def execute(
+        self,
+        *,
+        room_id: UUID,
+        user_id: UUID,
+    ) -> bool:
+        if self._membership_cache is not None:
+            cached = self._membership_cache.get(room_id, user_id)
+            if cached is not None:
+                return cached
+
+        is_member = await self._room_repository.is_member(RoomId(room_id), user_id)
+
+        if self._membership_cache is not None:
+            self._membership_cache.set(room_id, user_id, is_member)
+
+        return is_member
+
+    async def execute_many(
+        self,
+        *,
+        room_ids: Iterable[UUID],
+        user_id: UUID,
+    ) -> set[UUID]:
+        """Returns the rooms from `room_ids` the user is a member of."""
+        member_rooms: set[UUID] = set()
+        unknown: list[UUID] = []
+
+        for room_id in room_ids:
+            cached = (
+                self._membership_cache.get(room_id, user_id)
+                if self._membership_cache is not None
+                else None
+            )
+            if cached is None:
+                unknown.append(room_id)
+            elif cached:
+                member_rooms.add(room_id)
+
+        if unknown:
+            # один запрос на все непрокэшированные комнаты
+            found = await self._room_repository.get_member_room_ids(
+                [RoomId(room_id) for room_id in unknown],
+                user_id,
+            )
+            member_rooms |= found
+
+            if self._membership_cache is not None:
+                for room_id in unknown:
+                    self._membership_cache.set(room_id, user_id, room_id in found)
+
+        return member_rooms
@@ -1,6 +1,7 @@
 from uuid import UUID
 
 from app.application.uow.unit_of_work import UnitOfWork
+from app.application.cache.membership_cache import MembershipCache
 from app.application.exceptions import RoomNotFoundError, UserNotInRoomError
 from app.domain.repositories.room_repository import RoomRepository
 from app.domain.value_objects.room_id import RoomId
@@ -11,9 +12,11 @@ class LeaveRoomUseCase:
         self,
         uow: UnitOfWork,
         room_repository: RoomRepository,
+        membership_cache: MembershipCache | None = None,
     ):
         self._uow = uow
         self._room_repository = room_repository
+        self._membership_cache = membership_cache
 
     async def execute(
         self,
@@ -32,3 +35,7 @@ class LeaveRoomUseCase:
             room.remove_member(user_id)
 
             await self._room_repository.remove_member(room.id, user_id)
+
+        # инвалидируем только после коммита, иначе соседний запрос закэширует старое состояние
+        if self._membership_cache is not None:
+            await self._membership_cache.invalidate(room_id, user_id)
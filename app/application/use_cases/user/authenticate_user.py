@@ -0,0 +1,40 @@
+from uuid import UUID
+
+from app.application.cache.identity_cache import IdentityCache
+from app.application.exceptions import InactiveUserError, UserNotFoundError
+from app.application.security.authenticated_user import AuthenticatedUser
+from app.domain.repositories.user_repository import UserRepository
+from app.domain.value_objects.user_id import UserId
+
+
+class AuthenticateUserUseCase:
+    """Resolves the user id from a verified token into an active identity."""
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        identity_cache: IdentityCache | None = None,
+    ):
+        self._user_repository = user_repository
+        self._identity_cache = identity_cache
+
+    async def execute(self, user_id: UUID) -> AuthenticatedUser:
+        identity = None
+        if self._identity_cache is not None:
+            identity = await self._identity_cache.get(user_id)
+
+        if identity is None:
+            user = await self._user_repository.get_by_id(UserId(user_id))
+            if user is None:
+                raise UserNotFoundError()
+
+            identity = AuthenticatedUser.from_user(user)
+
+            # неактивных тоже кэшируем: их запросы не должны доходить до БД
+            if self._identity_cache is not None:
+                await self._identity_cache.set(identity)
+
+        if not identity.is_active:
+            raise InactiveUserError()
+
+        return identity
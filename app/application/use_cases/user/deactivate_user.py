@@ -0,0 +1,33 @@
+from uuid import UUID
+
+from app.application.cache.identity_cache import IdentityCache
+from app.application.exceptions import UserNotFoundError
+from app.application.uow.unit_of_work import UnitOfWork
+from app.domain.repositories.user_repository import UserRepository
+from app.domain.value_objects.user_id import UserId
+
+
+class DeactivateUserUseCase:
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        user_repository: UserRepository,
+        identity_cache: IdentityCache | None = None,
+    ):
+        self._uow = uow
+        self._user_repository = user_repository
+        self._identity_cache = identity_cache
+
+    async def execute(self, user_id: UUID) -> None:
+        async with self._uow:
+            user = await self._user_repository.get_by_id(UserId(user_id))
+            if user is None:
+                raise UserNotFoundError()
+
+            user.deactivate()
+
+            await self._user_repository.update(user)
+
+        # после коммита: закэшированная активная личность больше не пускает пользователя
+        if self._identity_cache is not None:
+            await self._identity_cache.invalidate(user_id)
@@ -30,7 +30,8 @@ class LoginUserUseCase:
             if not user.is_active:
                 raise InactiveUserError()
 
-            if not self._password_hasher.verify(raw_password, user.password.value):
-                raise InvalidCredentialsError()
+        # bcrypt проверяется вне транзакции, чтобы не держать соединение пула
+        if not await self._password_hasher.verify_async(raw_password, user.password.value):
+            raise InvalidCredentialsError()
 
-            return user
+        return user
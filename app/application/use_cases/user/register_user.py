@@ -27,14 +27,16 @@ class RegisterUserUseCase:
             if await self._user_repository.exists_by_email(email_vo):
                 raise EmailAlreadyExistsError()
 
-            hashed_password = self._password_hasher.hash(raw_password)
+        # bcrypt считается вне транзакции, чтобы не держать соединение пула
+        hashed_password = await self._password_hasher.hash_async(raw_password)
 
-            user = User(
-                user_id=UserId(),
-                email=email_vo,
-                password=Password(hashed_password),
-            )
+        user = User(
+            user_id=UserId(),
+            email=email_vo,
+            password=Password(hashed_password),
+        )
 
+        async with self._uow:
             await self._user_repository.add(user)
 
-            return user
+        return user
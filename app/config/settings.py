@@ -20,6 +20,86 @@ class Settings(BaseSettings):
     app_env: Literal["dev", "test", "prod"]
     app_debug: str
 
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+
+    ws_max_concurrent_sends: int = 256
+    ws_send_timeout_seconds: float = 5.0
+    ws_json_encoder: Literal["auto", "json", "orjson"] = "auto"
+    ws_send_queue_size: int = 256
+    ws_queue_overflow_policy: Literal["drop_oldest_typing", "coalesce", "disconnect"] = "drop_oldest_typing"
+    ws_slow_consumer_close_code: int = 1013
+    ws_max_frames_per_transaction: int = 32
+
+    redis_publish_batching_enabled: bool = True
+    redis_publish_flush_interval_ms: float = 2.0
+    redis_publish_batch_size: int = 100
+    redis_event_codec: Literal["json", "msgpack"] = "json"
+
+    event_bus_backend: Literal["pubsub", "streams"] = "pubsub"
+    event_stream_max_len: int = 10_000
+    event_stream_read_count: int = 100
+    event_stream_block_ms: int = 1000
+    event_stream_replay_limit: int = 1000
+    # простаивающий поток комнаты удаляется целиком; 0 — хранить без срока
+    event_stream_ttl_seconds: float = 24 * 3600
+
+    event_listener_batch_size: int = 100
+    event_listener_initial_backoff_seconds: float = 0.1
+    event_listener_max_backoff_seconds: float = 10.0
+
+    typing_coalescing_enabled: bool = True
+    typing_window_ms: int = 1000
+    typing_flush_interval_ms: int = 100
+    typing_stop_after_ms: int = 3000
+
+    message_partitions_months_ahead: int = 3
+    message_partitions_check_interval_seconds: float = 6 * 3600
+
+    # срок хранения по типу комнаты в днях, например {"public": 365}; тип без срока хранится вечно
+    message_retention_enabled: bool = False
+    message_retention_days: dict[Literal["public", "private"], int] = {}
+    message_retention_archive_dir: str = "archive/messages"
+    message_retention_batch_size: int = 5000
+    message_retention_interval_seconds: float = 3600.0
+
+    message_export_batch_size: int = 1000
+    message_export_chunk_bytes: int = 64 * 1024
+
+    message_write_behind_enabled: bool = False
+    message_write_batch_size: int = 500
+    message_write_flush_interval_ms: int = 20
+
+    recent_messages_cache_enabled: bool = True
+    recent_messages_cache_capacity: int = 100
+    recent_messages_cache_ttl_seconds: float = 5.0
+    recent_messages_cache_idle_seconds: float = 60.0
+    recent_messages_cache_max_bytes: int = 64 * 1024 * 1024
+    recent_messages_cache_redis_enabled: bool = False
+    recent_messages_cache_redis_ttl_seconds: float = 60.0
+
+    membership_cache_enabled: bool = True
+    membership_cache_max_entries: int = 100_000
+    membership_cache_ttl_seconds: float = 30.0
+
+    identity_cache_enabled: bool = True
+    identity_cache_max_entries: int = 50_000
+    identity_cache_ttl_seconds: float = 30.0
+    identity_cache_redis_enabled: bool = False
+    identity_cache_redis_ttl_seconds: float = 60.0
+
+    jwt_verified_cache_size: int = 10_000
+
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
+    # /metrics выключен, пока не задан токен; запрос должен прийти с Authorization: Bearer <token>
+    metrics_token: str | None = None
+
     model_config = ConfigDict(
         env_file=os.getenv("ENV_FILE", ".env"),
         env_file_encoding="utf-8"
@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from datetime import datetime
+from typing import AsyncIterator, Iterable
+from uuid import UUID
 
 from app.domain.entities.message import Message
 from app.domain.value_objects.room_id import RoomId
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MessageSearchHit
 
 
 class MessageRepository(ABC):
@@ -11,12 +16,53 @@ class MessageRepository(ABC):
     async def add(self, message: Message) -> None:
         ...
 
+    @abstractmethod
+    async def add_many(self, messages: Iterable[Message]) -> None:
+        ...
+
     @abstractmethod
     async def get_room_history(
         self,
         room_id: RoomId,
         *,
         limit: int,
-        offset: int,
+        offset: int = 0,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
     ) -> Iterable[Message]:
+        """
+        Newest-first page of room history.
+        `before` / `after` restrict the page to messages older / newer than the cursor.
+        """
+        ...
+
+    @abstractmethod
+    def stream_room_history(
+        self,
+        room_id: RoomId,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Message]:
+        """
+        Whole room history, oldest first, read in batches of `batch_size`
+        through a server-side cursor. `since` is inclusive, `until` exclusive.
+        """
+        ...
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        *,
+        user_id: UUID,
+        room_id: RoomId | None = None,
+        limit: int,
+        after: MessageSearchCursor | None = None,
+    ) -> list[MessageSearchHit]:
+        """
+        Full-text search over rooms `user_id` is a member of, best match first.
+        `room_id` narrows the search to one room; `after` continues past a previous page.
+        """
         ...
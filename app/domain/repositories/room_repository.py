@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterable, Optional
 from uuid import UUID
 
 from app.domain.entities.room import Room
@@ -16,6 +16,23 @@ class RoomRepository(ABC):
     async def get_by_id(self, room_id: RoomId) -> Optional[Room]:
         ...
 
+    @abstractmethod
+    async def exists(self, room_id: RoomId) -> bool:
+        ...
+
+    @abstractmethod
+    async def is_member(self, room_id: RoomId, user_id: UUID) -> bool:
+        ...
+
+    @abstractmethod
+    async def get_member_room_ids(
+        self,
+        room_ids: Iterable[RoomId],
+        user_id: UUID,
+    ) -> set[UUID]:
+        """Returns the subset of `room_ids` the user is a member of."""
+        ...
+
     @abstractmethod
     async def exists_private_room(self, user_a_id, user_b_id) -> bool:
         ...
@@ -12,6 +12,10 @@ class UserRepository(ABC):
     async def add(self, user: User) -> None:
         ...
 
+    @abstractmethod
+    async def update(self, user: User) -> None:
+        ...
+
     @abstractmethod
     async def get_by_id(self, user_id: UserId) -> Optional[User]:
         ...
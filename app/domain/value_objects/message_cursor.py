@@ -0,0 +1,28 @@
+from datetime import datetime
+from uuid import UUID
+
+
+class MessageCursor:
+    """Position in room history: (created_at, id) of a boundary message."""
+
+    def __init__(self, created_at: datetime, message_id: UUID):
+        self._created_at = created_at
+        self._message_id = message_id
+
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
+
+    @property
+    def message_id(self) -> UUID:
+        return self._message_id
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, MessageCursor)
+            and self.created_at == other.created_at
+            and self.message_id == other.message_id
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.created_at, self.message_id))
@@ -0,0 +1,34 @@
+from datetime import datetime
+from uuid import UUID
+
+
+class MessageSearchCursor:
+    """Position in ranked search results: (rank, created_at, id) of the last hit."""
+
+    def __init__(self, rank: float, created_at: datetime, message_id: UUID):
+        self._rank = rank
+        self._created_at = created_at
+        self._message_id = message_id
+
+    @property
+    def rank(self) -> float:
+        return self._rank
+
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
+
+    @property
+    def message_id(self) -> UUID:
+        return self._message_id
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, MessageSearchCursor)
+            and self.rank == other.rank
+            and self.created_at == other.created_at
+            and self.message_id == other.message_id
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.rank, self.created_at, self.message_id))
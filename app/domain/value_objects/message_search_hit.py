@@ -0,0 +1,30 @@
+from app.domain.entities.message import Message
+
+
+# границы совпадений в сниппете — управляющие символы, которых не бывает в обычном тексте
+MATCH_START = "\x02"
+MATCH_STOP = "\x03"
+
+
+class MessageSearchHit:
+    """
+    Message matched by a search query with its relevance and snippet.
+    The snippet is plain message text; matches are wrapped in MATCH_START / MATCH_STOP.
+    """
+
+    def __init__(self, message: Message, rank: float, snippet: str):
+        self._message = message
+        self._rank = rank
+        self._snippet = snippet
+
+    @property
+    def message(self) -> Message:
+        return self._message
+
+    @property
+    def rank(self) -> float:
+        return self._rank
+
+    @property
+    def snippet(self) -> str:
+        return self._snippet
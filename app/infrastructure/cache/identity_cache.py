@@ -0,0 +1,168 @@
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from app.application.cache.identity_cache import IdentityCache
+from app.application.messaging.channels import CONTROL_CHANNEL
+from app.application.messaging.event_bus import EventBus
+from app.application.security.authenticated_user import AuthenticatedUser
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.user_id import UserId
+
+
+IDENTITY_INVALIDATED = "identity_invalidated"
+
+
+class InMemoryIdentityCache(IdentityCache):
+    """
+    Per-process identity cache with TTL and LRU eviction.
+    Invalidations are published on the control channel like membership ones.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 50_000,
+        ttl_seconds: float = 30.0,
+        event_bus: EventBus | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._event_bus = event_bus
+        self._clock = clock
+
+        self._entries: OrderedDict[UUID, tuple[AuthenticatedUser, float]] = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    async def get(self, user_id: UUID) -> AuthenticatedUser | None:
+        entry = self._entries.get(user_id)
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        user, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[user_id]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self._hits += 1
+        return user
+
+    async def set(self, user: AuthenticatedUser) -> None:
+        key = user.id.value
+        self._entries[key] = (user, self._clock() + self._ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def invalidate(self, user_id: UUID) -> None:
+        self.invalidate_local(user_id)
+
+        if self._event_bus is not None:
+            await self._event_bus.publish({
+                "channel": CONTROL_CHANNEL,
+                "message": {
+                    "type": IDENTITY_INVALIDATED,
+                    "payload": {"user_id": str(user_id)},
+                },
+            })
+
+    def invalidate_local(self, user_id: UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+        }
+
+
+class RedisIdentityCache(IdentityCache):
+    """Identity tier shared by all instances, stored as JSON with SETEX."""
+
+    _KEY_PREFIX = "auth:user:"
+
+    def __init__(self, redis: Redis, *, ttl_seconds: float = 60.0) -> None:
+        self._redis = redis
+        self._ttl = ttl_seconds
+
+    async def get(self, user_id: UUID) -> AuthenticatedUser | None:
+        raw = await self._redis.get(self._key(user_id))
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        return AuthenticatedUser(
+            user_id=UserId(user_id),
+            email=Email(data["email"]),
+            is_active=data["is_active"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+        )
+
+    async def set(self, user: AuthenticatedUser) -> None:
+        await self._redis.set(
+            self._key(user.id.value),
+            json.dumps({
+                "email": user.email.value,
+                "is_active": user.is_active,
+                "created_at": user.created_at.isoformat(),
+            }),
+            px=int(self._ttl * 1000),
+        )
+
+    async def invalidate(self, user_id: UUID) -> None:
+        await self._redis.delete(self._key(user_id))
+
+    def _key(self, user_id: UUID) -> str:
+        return f"{self._KEY_PREFIX}{user_id}"
+
+
+class TieredIdentityCache(IdentityCache):
+    """Local cache in front of the shared Redis tier."""
+
+    def __init__(self, local: InMemoryIdentityCache, shared: RedisIdentityCache) -> None:
+        self._local = local
+        self._shared = shared
+
+    async def get(self, user_id: UUID) -> AuthenticatedUser | None:
+        user = await self._local.get(user_id)
+        if user is not None:
+            return user
+
+        user = await self._shared.get(user_id)
+        if user is not None:
+            await self._local.set(user)
+        return user
+
+    async def set(self, user: AuthenticatedUser) -> None:
+        await self._local.set(user)
+        await self._shared.set(user)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        # сначала общий уровень, иначе соседний узел успеет перечитать старую запись
+        await self._shared.invalidate(user_id)
+        await self._local.invalidate(user_id)
+
+    def invalidate_local(self, user_id: UUID) -> None:
+        self._local.invalidate_local(user_id)
+
+    def stats(self) -> dict:
+        return self._local.stats()
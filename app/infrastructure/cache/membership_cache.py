@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from typing import Callable
+from uuid import UUID
+
+from app.application.cache.membership_cache import MembershipCache
+from app.application.messaging.channels import CONTROL_CHANNEL
+from app.application.messaging.event_bus import EventBus
+
+
+MEMBERSHIP_INVALIDATED = "membership_invalidated"
+
+
+class InMemoryMembershipCache(MembershipCache):
+    """
+    Per-process membership cache with TTL and LRU eviction.
+    Invalidations are applied locally and published on the control channel,
+    so other instances drop their copy as well (see ControlEventHandler).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 100_000,
+        ttl_seconds: float = 30.0,
+        event_bus: EventBus | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._event_bus = event_bus
+        self._clock = clock
+
+        # (room_id, user_id) -> (is_member, expires_at)
+        self._entries: OrderedDict[tuple[UUID, UUID], tuple[bool, float]] = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, room_id: UUID, user_id: UUID) -> bool | None:
+        key = (room_id, user_id)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        is_member, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return is_member
+
+    def set(self, room_id: UUID, user_id: UUID, is_member: bool) -> None:
+        key = (room_id, user_id)
+        self._entries[key] = (is_member, self._clock() + self._ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def invalidate(self, room_id: UUID, user_id: UUID) -> None:
+        self.invalidate_local(room_id, user_id)
+
+        if self._event_bus is not None:
+            await self._event_bus.publish({
+                "channel": CONTROL_CHANNEL,
+                "message": {
+                    "type": MEMBERSHIP_INVALIDATED,
+                    "payload": {
+                        "room_id": str(room_id),
+                        "user_id": str(user_id),
+                    },
+                },
+            })
+
+    def invalidate_local(self, room_id: UUID, user_id: UUID) -> None:
+        if self._entries.pop((room_id, user_id), None) is not None:
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+        }
@@ -0,0 +1,427 @@
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterator, Callable, Iterable
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from app.application.cache.recent_messages_cache import RecentMessagesCache
+from app.domain.entities.message import Message
+from app.domain.enums.message_type import MessageType
+from app.domain.repositories.message_repository import MessageRepository
+from app.domain.value_objects.message_content import MessageContent
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MessageSearchHit
+from app.domain.value_objects.message_id import MessageId
+from app.domain.value_objects.room_id import RoomId
+from app.domain.value_objects.user_id import UserId
+
+
+# грубая оценка памяти сообщения без текста: объекты домена, UUID, datetime
+_MESSAGE_OVERHEAD_BYTES = 600
+
+
+def _message_size(message: Message) -> int:
+    return _MESSAGE_OVERHEAD_BYTES + len(message.content.value.encode())
+
+
+def _position(message: Message) -> tuple:
+    return message.created_at, message.id.value
+
+
+class _RoomBuffer:
+    __slots__ = ("messages", "ids", "complete", "loaded_at", "read_at", "size_bytes")
+
+    def __init__(self, messages: list[Message], complete: bool, now: float) -> None:
+        # от старых к новым: новое сообщение дописывается в конец
+        self.messages = messages
+        self.ids = {message.id.value for message in messages}
+        self.complete = complete
+        self.loaded_at = now
+        self.read_at = now
+        self.size_bytes = sum(_message_size(message) for message in messages)
+
+
+class InMemoryRecentMessagesCache(RecentMessagesCache):
+    """
+    Per-process ring buffer of the newest `capacity` messages of each room.
+
+    Messages committed by this node are appended right away; a buffer is
+    reloaded after `ttl_seconds`, which bounds how late messages written by
+    other nodes show up. Rooms not read for `idle_seconds` are evicted, and
+    least recently read rooms go first once `max_bytes` is exceeded.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int = 100,
+        ttl_seconds: float = 5.0,
+        idle_seconds: float = 60.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._capacity = capacity
+        self._ttl = ttl_seconds
+        self._idle = idle_seconds
+        self._max_bytes = max_bytes
+        self._clock = clock
+
+        # порядок — давность чтения: в начале комнаты, которые дольше всех не открывали
+        self._rooms: OrderedDict[UUID, _RoomBuffer] = OrderedDict()
+        self._size_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    async def get(self, room_id: UUID, limit: int) -> list[Message] | None:
+        now = self._clock()
+        buffer = self._rooms.get(room_id)
+
+        if buffer is not None and (
+            now - buffer.loaded_at > self._ttl or now - buffer.read_at > self._idle
+        ):
+            self._drop(room_id)
+            buffer = None
+
+        if buffer is None or (len(buffer.messages) < limit and not buffer.complete):
+            self._misses += 1
+            return None
+
+        buffer.read_at = now
+        self._rooms.move_to_end(room_id)
+        self._hits += 1
+        return buffer.messages[::-1][:limit]
+
+    async def load(
+        self,
+        room_id: UUID,
+        messages: list[Message],
+        *,
+        complete: bool,
+    ) -> None:
+        self._drop(room_id)
+
+        kept = messages[: self._capacity]
+        buffer = _RoomBuffer(
+            kept[::-1],
+            complete and len(kept) == len(messages),
+            self._clock(),
+        )
+        self._rooms[room_id] = buffer
+        self._size_bytes += buffer.size_bytes
+
+        self._evict()
+
+    async def append(self, messages: Iterable[Message]) -> None:
+        for message in messages:
+            buffer = self._rooms.get(message.room_id.value)
+            # незагруженную комнату не заполняем: буфер обязан быть непрерывным хвостом истории
+            if buffer is None:
+                continue
+
+            # буфер мог загрузиться из БД уже после коммита, но до этого append
+            if message.id.value in buffer.ids:
+                continue
+
+            buffer.messages.append(message)
+            buffer.ids.add(message.id.value)
+            buffer.size_bytes += _message_size(message)
+            self._size_bytes += _message_size(message)
+
+            # коммиты соседних соединений могут прийти не в порядке created_at
+            if len(buffer.messages) > 1 and _position(buffer.messages[-2]) > _position(message):
+                buffer.messages.sort(key=_position)
+
+            while len(buffer.messages) > self._capacity:
+                dropped = buffer.messages.pop(0)
+                buffer.ids.discard(dropped.id.value)
+                buffer.size_bytes -= _message_size(dropped)
+                self._size_bytes -= _message_size(dropped)
+                buffer.complete = False
+
+        self._evict()
+
+    def _drop(self, room_id: UUID) -> None:
+        buffer = self._rooms.pop(room_id, None)
+        if buffer is not None:
+            self._size_bytes -= buffer.size_bytes
+
+    def _evict(self) -> None:
+        now = self._clock()
+
+        while self._rooms:
+            room_id, buffer = next(iter(self._rooms.items()))
+            if self._size_bytes <= self._max_bytes and now - buffer.read_at <= self._idle:
+                break
+
+            self._drop(room_id)
+            self._evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "rooms": len(self._rooms),
+            "messages": sum(len(buffer.messages) for buffer in self._rooms.values()),
+            "size_bytes": self._size_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+        }
+
+
+def _encode_message(message: Message) -> str:
+    return json.dumps({
+        "id": str(message.id.value),
+        "room_id": str(message.room_id.value),
+        "sender_id": str(message.sender_id.value) if message.sender_id is not None else None,
+        "content": message.content.value,
+        "message_type": message.message_type.value,
+        "created_at": message.created_at.isoformat(),
+    })
+
+
+def _decode_message(raw: bytes | str) -> Message:
+    data = json.loads(raw)
+    return Message(
+        message_id=MessageId(UUID(data["id"])),
+        room_id=RoomId(UUID(data["room_id"])),
+        sender_id=UserId(UUID(data["sender_id"])) if data["sender_id"] else None,
+        content=MessageContent(data["content"]),
+        message_type=MessageType(data["message_type"]),
+        created_at=datetime.fromisoformat(data["created_at"]),
+    )
+
+
+class RedisRecentMessagesCache(RecentMessagesCache):
+    """
+    Shared mirror of the buffers: one sorted set per room scored by created_at.
+    Every node adds its own messages, so the mirror stays current across nodes.
+    Both load and append merge with ZADD, so neither can erase the other's
+    messages, and a message seen by both paths is stored once. Only load sets
+    the TTL: the mirror is rebuilt from the database at least every `ttl_seconds`.
+    """
+
+    _KEY_PREFIX = "recent_messages:room:"
+    # маркер «старше истории нет» со счётом -inf; обрезка по рангу удалит его сама, когда буфер переполнится
+    _HISTORY_START = b""
+
+    # незагруженную комнату не создаём: зеркало обязано быть непрерывным хвостом истории
+    _APPEND_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return 0
+    end
+    redis.call('ZADD', KEYS[1], unpack(ARGV, 2))
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -tonumber(ARGV[1]) - 1)
+    return 1
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        capacity: int = 100,
+        ttl_seconds: float = 3600.0,
+    ) -> None:
+        self._redis = redis
+        self._capacity = capacity
+        self._ttl_ms = int(ttl_seconds * 1000)
+        self._append_script = redis.register_script(self._APPEND_SCRIPT)
+
+    async def get(self, room_id: UUID, limit: int) -> list[Message] | None:
+        # на один элемент больше, чтобы увидеть маркер начала истории
+        raw_items = await self._redis.zrevrange(self._key(room_id), 0, limit)
+
+        complete = False
+        messages = []
+        for raw in raw_items:
+            if raw == self._HISTORY_START:
+                complete = True
+                break
+            messages.append(_decode_message(raw))
+
+        if not complete and len(messages) < limit:
+            return None
+
+        # счёт — float, при совпадении до микросекунд порядок задаёт (created_at, id)
+        messages.sort(key=_position, reverse=True)
+        return messages[:limit]
+
+    async def load(
+        self,
+        room_id: UUID,
+        messages: list[Message],
+        *,
+        complete: bool,
+    ) -> None:
+        key = self._key(room_id)
+        items = self._scored(messages[: self._capacity])
+        if complete and len(messages) <= self._capacity:
+            items[self._HISTORY_START] = float("-inf")
+
+        if not items:
+            return
+
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zadd(key, items)
+        pipe.zremrangebyrank(key, 0, -self._capacity - 1)
+        pipe.pexpire(key, self._ttl_ms)
+        await pipe.execute()
+
+    async def append(self, messages: Iterable[Message]) -> None:
+        by_room: dict[UUID, list[Message]] = {}
+        for message in messages:
+            by_room.setdefault(message.room_id.value, []).append(message)
+
+        if not by_room:
+            return
+
+        pipe = self._redis.pipeline(transaction=False)
+        for room_id, room_messages in by_room.items():
+            args = [self._capacity]
+            for member, score in self._scored(room_messages).items():
+                args += [score, member]
+            await self._append_script(keys=[self._key(room_id)], args=args, client=pipe)
+        await pipe.execute()
+
+    @staticmethod
+    def _scored(messages: Iterable[Message]) -> dict:
+        return {_encode_message(message): message.created_at.timestamp() for message in messages}
+
+    def _key(self, room_id: UUID) -> str:
+        return f"{self._KEY_PREFIX}{room_id}"
+
+
+class TieredRecentMessagesCache(RecentMessagesCache):
+    """Local buffers in front of the shared Redis mirror."""
+
+    def __init__(
+        self,
+        local: InMemoryRecentMessagesCache,
+        shared: RedisRecentMessagesCache,
+    ) -> None:
+        self._local = local
+        self._shared = shared
+
+    async def get(self, room_id: UUID, limit: int) -> list[Message] | None:
+        messages = await self._local.get(room_id, limit)
+        if messages is not None:
+            return messages
+
+        messages = await self._shared.get(room_id, limit)
+        if messages is not None:
+            await self._local.load(room_id, messages, complete=len(messages) < limit)
+        return messages
+
+    async def load(
+        self,
+        room_id: UUID,
+        messages: list[Message],
+        *,
+        complete: bool,
+    ) -> None:
+        await self._local.load(room_id, messages, complete=complete)
+        await self._shared.load(room_id, messages, complete=complete)
+
+    async def append(self, messages: Iterable[Message]) -> None:
+        messages = list(messages)
+        await self._local.append(messages)
+        await self._shared.append(messages)
+
+    def stats(self) -> dict:
+        return self._local.stats()
+
+
+class CachedMessageRepository(MessageRepository):
+    """
+    Serves the first history page (no offset, no cursor) from RecentMessagesCache.
+    A miss reads a whole buffer worth of messages and loads it into the cache.
+    """
+
+    def __init__(
+        self,
+        read_repository: MessageRepository,
+        cache: RecentMessagesCache,
+        *,
+        capacity: int = 100,
+    ) -> None:
+        self._read_repository = read_repository
+        self._cache = cache
+        self._capacity = capacity
+
+    async def add(self, message: Message) -> None:
+        await self._read_repository.add(message)
+
+    async def add_many(self, messages: Iterable[Message]) -> None:
+        await self._read_repository.add_many(messages)
+
+    async def get_room_history(
+        self,
+        room_id: RoomId,
+        *,
+        limit: int,
+        offset: int = 0,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> Iterable[Message]:
+        is_first_page = offset == 0 and before is None and after is None
+        if not is_first_page or limit > self._capacity:
+            return await self._read_repository.get_room_history(
+                room_id,
+                limit=limit,
+                offset=offset,
+                before=before,
+                after=after,
+            )
+
+        cached = await self._cache.get(room_id.value, limit)
+        if cached is not None:
+            return cached
+
+        messages = list(
+            await self._read_repository.get_room_history(room_id, limit=self._capacity)
+        )
+        await self._cache.load(
+            room_id.value,
+            messages,
+            complete=len(messages) < self._capacity,
+        )
+        return messages[:limit]
+
+    def stream_room_history(
+        self,
+        room_id: RoomId,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Message]:
+        # выгрузка всей истории идёт мимо буфера
+        return self._read_repository.stream_room_history(
+            room_id,
+            since=since,
+            until=until,
+            batch_size=batch_size,
+        )
+
+    async def search(
+        self,
+        query: str,
+        *,
+        user_id: UUID,
+        room_id: RoomId | None = None,
+        limit: int,
+        after: MessageSearchCursor | None = None,
+    ) -> list[MessageSearchHit]:
+        return await self._read_repository.search(
+            query,
+            user_id=user_id,
+            room_id=room_id,
+            limit=limit,
+            after=after,
+        )
@@ -1,12 +1,21 @@
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config.settings import settings
+from app.infrastructure.database.pool import InstrumentedAsyncQueuePool
 
 
 engine = create_async_engine(
     settings.database_url,
     echo=False,
-    future=True
+    future=True,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    # кэш prepared statements asyncpg; 0 — для pgbouncer в transaction mode
+    connect_args={"statement_cache_size": settings.db_statement_cache_size},
 )
 
 AsyncSessionLocal = async_sessionmaker(
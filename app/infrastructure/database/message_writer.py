@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.entities.message import Message
+from app.domain.repositories.message_repository import MessageRepository
+from app.domain.value_objects.room_id import RoomId
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MessageSearchHit
+
+from app.infrastructure.database.models.message_model import MessageModel
+from app.infrastructure.database.repositories.message_repository import message_to_row
+
+
+logger = logging.getLogger(__name__)
+
+# ошибки самих строк: повтор не поможет, плохую строку нужно отделить от остальных
+_ROW_ERRORS = (IntegrityError, DataError)
+
+
+class BatchedMessageWriter:
+    """
+    Write-behind persistence for chat messages.
+    Messages are buffered in submission order and flushed by a single background
+    task with one multi-row INSERT per batch, either when the batch is full or
+    when the flush interval elapses. A single flusher keeps per-room ordering.
+    A batch rejected because of its rows is bisected, so only the bad rows are
+    dropped. `on_flushed` is called with the rows of every committed batch.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.02,
+        max_attempts: int = 3,
+        on_flushed: Callable[[list[Message]], Awaitable[None]] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._on_flushed = on_flushed
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._max_attempts = max_attempts
+
+        self._pending: deque[Message] = deque()
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+        self._batches = 0
+        self._rows = 0
+        self._failed_rows = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    # ---------- Lifecycle ----------
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flushes everything that is still buffered and stops the flusher."""
+        self._stopping = True
+        self._has_pending.set()
+        self._batch_full.set()
+
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    # ---------- Producer side ----------
+
+    def submit(self, message: Message) -> None:
+        if self._stopping:
+            raise RuntimeError("Message writer is stopped")
+
+        self._pending.append(message)
+        self._has_pending.set()
+
+        if len(self._pending) >= self._max_batch_size:
+            self._batch_full.set()
+
+    # ---------- Flusher ----------
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+
+            if not self._stopping:
+                # даём батчу набраться: до заполнения или до истечения интервала
+                try:
+                    await asyncio.wait_for(
+                        self._batch_full.wait(),
+                        timeout=self._flush_interval,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            while self._pending:
+                await self._flush_batch()
+                if not self._stopping:
+                    break
+
+            if not self._pending:
+                self._has_pending.clear()
+            if len(self._pending) < self._max_batch_size:
+                self._batch_full.clear()
+
+            if self._stopping and not self._pending:
+                return
+
+    async def _flush_batch(self) -> None:
+        batch = [
+            self._pending.popleft()
+            for _ in range(min(self._max_batch_size, len(self._pending)))
+        ]
+
+        started = time.perf_counter()
+
+        persisted = await self._persist(batch)
+        if not persisted:
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._batches += 1
+        self._rows += len(persisted)
+        self._last_flush_ms = elapsed_ms
+        self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+
+        if self._on_flushed is not None:
+            try:
+                await self._on_flushed(persisted)
+            except Exception:
+                # строки уже в БД; ошибка подписчика не должна останавливать запись
+                logger.exception("Message flush callback failed")
+
+    async def _persist(self, batch: list[Message]) -> list[Message]:
+        """Writes the batch and returns the rows that were committed."""
+        try:
+            await self._write_with_retries(batch)
+            return batch
+        except _ROW_ERRORS:
+            if len(batch) == 1:
+                self._failed_rows += 1
+                logger.exception("Dropping message %s that cannot be persisted", batch[0].id.value)
+                return []
+        except Exception:
+            self._failed_rows += len(batch)
+            logger.exception("Failed to persist %s messages", len(batch))
+            return []
+
+        # половины пишутся по порядку — порядок внутри комнаты сохраняется
+        middle = len(batch) // 2
+        return await self._persist(batch[:middle]) + await self._persist(batch[middle:])
+
+    async def _write_with_retries(self, batch: list[Message]) -> None:
+        for attempt in range(1, self._max_attempts):
+            try:
+                await self._write(batch)
+                return
+            except _ROW_ERRORS:
+                raise
+            except Exception:
+                logger.warning("Message batch flush failed, attempt %s", attempt)
+                await asyncio.sleep(self._flush_interval * attempt)
+
+        await self._write(batch)
+
+    async def _write(self, batch: list[Message]) -> None:
+        async with self._session_factory() as session:
+            await session.execute(
+                insert(MessageModel),
+                [message_to_row(message) for message in batch],
+            )
+            await session.commit()
+
+    # ---------- Introspection ----------
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "batches": self._batches,
+            "rows": self._rows,
+            "failed_rows": self._failed_rows,
+            "last_flush_ms": round(self._last_flush_ms, 3),
+            "max_flush_ms": round(self._max_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self._batches, 3)
+            if self._batches
+            else 0.0,
+        }
+
+
+class WriteBehindMessageRepository(MessageRepository):
+    """
+    MessageRepository that hands new messages to BatchedMessageWriter
+    instead of the current session. Reads are served by the wrapped repository.
+    """
+
+    def __init__(
+        self,
+        writer: BatchedMessageWriter,
+        read_repository: MessageRepository,
+    ):
+        self._writer = writer
+        self._read_repository = read_repository
+
+    async def add(self, message: Message) -> None:
+        self._writer.submit(message)
+
+    async def add_many(self, messages: Iterable[Message]) -> None:
+        for message in messages:
+            self._writer.submit(message)
+
+    async def get_room_history(
+        self,
+        room_id: RoomId,
+        *,
+        limit: int,
+        offset: int = 0,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> Iterable[Message]:
+        return await self._read_repository.get_room_history(
+            room_id,
+            limit=limit,
+            offset=offset,
+            before=before,
+            after=after,
+        )
+
+    def stream_room_history(
+        self,
+        room_id: RoomId,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Message]:
+        return self._read_repository.stream_room_history(
+            room_id,
+            since=since,
+            until=until,
+            batch_size=batch_size,
+        )
+
+    async def search(
+        self,
+        query: str,
+        *,
+        user_id: UUID,
+        room_id: RoomId | None = None,
+        limit: int,
+        after: MessageSearchCursor | None = None,
+    ) -> list[MessageSearchHit]:
+        return await self._read_repository.search(
+            query,
+            user_id=user_id,
+            room_id=room_id,
+            limit=limit,
+            after=after,
+        )
@@ -0,0 +1,36 @@
+"""add messages room keyset index
+
+Revision ID: b7c41e9d2a10
+Revises: 582afbaa9269
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41e9d2a10'
+down_revision: Union[str, Sequence[str], None] = '582afbaa9269'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_messages_room_created_at_id',
+        'messages',
+        ['room_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    # префикс составного индекса покрывает поиск по room_id
+    op.drop_index(op.f('ix_messages_room_id'), table_name='messages')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_messages_room_id'), 'messages', ['room_id'], unique=False)
+    op.drop_index('ix_messages_room_created_at_id', table_name='messages')
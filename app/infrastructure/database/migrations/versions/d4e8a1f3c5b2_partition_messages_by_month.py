@@ -0,0 +1,127 @@
+"""partition messages by month
+
+Revision ID: d4e8a1f3c5b2
+Revises: b7c41e9d2a10
+Create Date: 2026-10-18 14:05:47.918263
+
+Rebuilds `messages` as a table range-partitioned by `created_at`, one
+partition per calendar month (UTC) named messages_pYYYY_MM, plus a default
+partition as a safety net. The primary key becomes (id, created_at): a
+unique constraint on a partitioned table has to include the partition key.
+
+Existing rows are copied with a single INSERT ... SELECT, so on a large
+table this migration needs a maintenance window.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e8a1f3c5b2'
+down_revision: Union[str, Sequence[str], None] = 'b7c41e9d2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# сколько месяцев вперёд создаём партиции сразу; дальше их досоздаёт приложение
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, room_id, sender_id, content, message_type, created_at"
+
+
+def _create_messages_table(**kwargs) -> None:
+    op.create_table('messages',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('room_id', sa.Uuid(), nullable=False),
+    sa.Column('sender_id', sa.Uuid(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('message_type', postgresql.ENUM('TEXT', 'SYSTEM', name='message_type', create_type=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+    **kwargs,
+    )
+
+
+def _create_messages_indexes() -> None:
+    op.create_index(op.f('ix_messages_created_at'), 'messages', ['created_at'], unique=False)
+    op.create_index(op.f('ix_messages_sender_id'), 'messages', ['sender_id'], unique=False)
+    op.create_index(
+        'ix_messages_room_created_at_id',
+        'messages',
+        ['room_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def _drop_messages_indexes(table_name: str) -> None:
+    op.drop_index('ix_messages_room_created_at_id', table_name=table_name)
+    op.drop_index(op.f('ix_messages_sender_id'), table_name=table_name)
+    op.drop_index(op.f('ix_messages_created_at'), table_name=table_name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # старая таблица уступает имена таблицы, PK и индексов новой
+    op.rename_table('messages', 'messages_unpartitioned')
+    op.execute(
+        "ALTER TABLE messages_unpartitioned "
+        "RENAME CONSTRAINT messages_pkey TO messages_unpartitioned_pkey"
+    )
+    _drop_messages_indexes('messages_unpartitioned')
+
+    _create_messages_table(
+        sa.PrimaryKeyConstraint('id', 'created_at', name='messages_pkey'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    _create_messages_indexes()
+
+    # партиции от самого старого сообщения до MONTHS_AHEAD месяцев вперёд
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month timestamp;
+            last_month timestamp;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(created_at), now()) AT TIME ZONE 'UTC')
+            INTO month
+            FROM messages_unpartitioned;
+
+            last_month := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MONTHS_AHEAD} months';
+
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF messages FOR VALUES FROM (%L) TO (%L)',
+                    'messages_p' || to_char(month, 'YYYY_MM'),
+                    to_char(month, 'YYYY-MM-DD') || ' 00:00:00+00',
+                    to_char(month + interval '1 month', 'YYYY-MM-DD') || ' 00:00:00+00'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END
+        $$;
+    """)
+    op.execute("CREATE TABLE messages_default PARTITION OF messages DEFAULT")
+
+    op.execute(f"INSERT INTO messages ({COLUMNS}) SELECT {COLUMNS} FROM messages_unpartitioned")
+    op.drop_table('messages_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('messages', 'messages_partitioned')
+    op.execute(
+        "ALTER TABLE messages_partitioned "
+        "RENAME CONSTRAINT messages_pkey TO messages_partitioned_pkey"
+    )
+    _drop_messages_indexes('messages_partitioned')
+
+    _create_messages_table(sa.PrimaryKeyConstraint('id', name='messages_pkey'))
+    _create_messages_indexes()
+
+    op.execute(f"INSERT INTO messages ({COLUMNS}) SELECT {COLUMNS} FROM messages_partitioned")
+    # партиции удаляются вместе с родительской таблицей
+    op.drop_table('messages_partitioned')
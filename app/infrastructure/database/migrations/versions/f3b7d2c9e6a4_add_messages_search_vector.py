@@ -0,0 +1,51 @@
+"""add messages search vector
+
+Revision ID: f3b7d2c9e6a4
+Revises: d4e8a1f3c5b2
+Create Date: 2026-10-18 16:42:09.551370
+
+Adds a stored generated `search_vector` column (to_tsvector('simple', content))
+and a GIN index over it. Both are created on the partitioned parent and
+cascade to every existing and future partition. Filling the column rewrites
+each partition, and CREATE INDEX CONCURRENTLY is not available on a
+partitioned table, so on a large table this migration needs a maintenance window.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d2c9e6a4'
+down_revision: Union[str, Sequence[str], None] = 'd4e8a1f3c5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'messages',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple'::regconfig, content)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_messages_search_vector',
+        'messages',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_search_vector', table_name='messages', postgresql_using='gin')
+    op.drop_column('messages', 'search_vector')
@@ -1,15 +1,22 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Text
+from sqlalchemy import Computed, DateTime, Enum, ForeignKey, Index, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.database.models.base import Base
 from app.domain.enums.message_type import MessageType
 
 
+# конфигурация без стемминга: в чатах смешаны языки, слова ищутся как есть
+MESSAGE_SEARCH_CONFIG = "simple"
+
+
 class MessageModel(Base):
     __tablename__ = "messages"
+    # помесячные партиции по created_at, см. app/infrastructure/database/partitions.py
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -18,7 +25,6 @@ class MessageModel(Base):
     room_id: Mapped[UUID] = mapped_column(
         ForeignKey("rooms.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     sender_id: Mapped[UUID | None] = mapped_column(
@@ -36,8 +42,32 @@ class MessageModel(Base):
         nullable=False,
     )
 
+    # ключ партиционирования обязан входить в первичный ключ
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         index=True,
     )
+
+    # заполняется самой БД; не читается вместе с сообщением, нужен только для поиска
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{MESSAGE_SEARCH_CONFIG}'::regconfig, content)", persisted=True),
+        deferred=True,
+    )
+
+
+# история комнаты читается страницами по (created_at, id) от новых к старым
+Index(
+    "ix_messages_room_created_at_id",
+    MessageModel.room_id,
+    MessageModel.created_at.desc(),
+    MessageModel.id.desc(),
+)
+
+Index(
+    "ix_messages_search_vector",
+    MessageModel.search_vector,
+    postgresql_using="gin",
+)
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+logger = logging.getLogger(__name__)
+
+
+MESSAGES_TABLE = "messages"
+
+_PARTITION_NAME_RE = re.compile(r"^messages_p(\d{4})_(\d{2})$")
+
+# узлы создают партиции по очереди, иначе параллельный CREATE упадёт на каталоге
+_PARTITION_DDL_LOCK = 731_044_201
+
+# DROP партиции берёт ACCESS EXCLUSIVE на всю `messages`; ждать его дольше нельзя,
+# иначе все чтения и вставки встанут в очередь за ним
+PARTITION_DROP_LOCK_TIMEOUT = "2s"
+
+
+def month_start(moment: datetime | date) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def message_partition_name(month: date) -> str:
+    return f"messages_p{month:%Y_%m}"
+
+
+def parse_message_partition_name(name: str) -> date | None:
+    match = _PARTITION_NAME_RE.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_message_partition_sql(month: date) -> str:
+    # границы — полночь UTC; имена и даты генерируются здесь, а не приходят извне
+    return (
+        f"CREATE TABLE IF NOT EXISTS {message_partition_name(month)} "
+        f"PARTITION OF {MESSAGES_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
+
+
+async def ensure_message_partitions(
+    session: AsyncSession,
+    *,
+    months_ahead: int = 3,
+    now: datetime | None = None,
+) -> list[str]:
+    """
+    Creates the monthly partitions from the current month up to `months_ahead`
+    months ahead. Returns the names of partitions that did not exist before.
+    """
+    current = month_start(now or datetime.now(timezone.utc))
+    existing = {name for name, _ in await list_message_partitions(session)}
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = message_partition_name(month)
+        if name in existing:
+            continue
+
+        try:
+            # каждая партиция в своей транзакции: ошибка одной не откатывает остальные
+            await session.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"),
+                {"key": _PARTITION_DDL_LOCK},
+            )
+            await session.execute(text(create_message_partition_sql(month)))
+            await session.commit()
+        except DBAPIError:
+            # обычно это строки месяца, уже попавшие в DEFAULT-партицию: их нужно перенести вручную
+            await session.rollback()
+            logger.exception("Failed to create message partition %s", name)
+            continue
+
+        created.append(name)
+
+    return created
+
+
+async def list_message_partitions(session: AsyncSession) -> list[tuple[str, date]]:
+    """Monthly partitions of `messages`, oldest first; the default partition is skipped."""
+    result = await session.execute(
+        text(
+            "SELECT child.relname "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": MESSAGES_TABLE},
+    )
+
+    partitions = []
+    for name in result.scalars():
+        month = parse_message_partition_name(name)
+        if month is not None:
+            partitions.append((name, month))
+
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def drop_message_partitions_before(
+    session: AsyncSession,
+    cutoff: datetime | date,
+) -> list[str]:
+    """
+    Drops partitions whose whole month is older than `cutoff`.
+    Dropping a partition is instant and leaves no dead tuples, unlike DELETE.
+    Partitions whose lock is not granted in time are kept for the next call.
+    """
+    dropped = []
+    for name, month in await list_message_partitions(session):
+        # верхняя граница партиции — полночь первого числа следующего месяца
+        if add_months(month, 1) > _as_date(cutoff):
+            continue
+
+        if await drop_message_partition(session, name):
+            dropped.append(name)
+
+    return dropped
+
+
+async def drop_message_partition(session: AsyncSession, name: str) -> bool:
+    """
+    Drops one partition in the current transaction and commits it.
+    Gives up after PARTITION_DROP_LOCK_TIMEOUT instead of queueing behind
+    long readers; returns False if the partition was not dropped.
+    """
+    # DETACH ... CONCURRENTLY недоступен: у `messages` есть DEFAULT-партиция
+    try:
+        await session.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_DROP_LOCK_TIMEOUT}'"))
+        await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        await session.commit()
+    except DBAPIError:
+        await session.rollback()
+        logger.warning("Message partition %s not dropped, will retry later", name, exc_info=True)
+        return False
+
+    return True
+
+
+def _as_date(moment: datetime | date) -> date:
+    return moment.date() if isinstance(moment, datetime) else moment
+
+
+class MessagePartitionMaintainer:
+    """Periodically makes sure upcoming monthly partitions of `messages` exist."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        months_ahead: int = 3,
+        check_interval: float = 6 * 3600,
+    ) -> None:
+        self._session_factory = session_factory
+        self._months_ahead = months_ahead
+        self._check_interval = check_interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> list[str]:
+        async with self._session_factory() as session:
+            created = await ensure_message_partitions(
+                session,
+                months_ahead=self._months_ahead,
+            )
+
+        if created:
+            logger.info("Created message partitions: %s", ", ".join(created))
+        return created
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                # БД может быть временно недоступна: попробуем на следующем круге
+                logger.exception("Message partition maintenance failed")
+
+            await asyncio.sleep(self._check_interval)
@@ -1,6 +1,8 @@
-from typing import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterable
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import REAL, func, insert, literal_column, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.message import Message
@@ -8,10 +10,47 @@ from app.domain.repositories.message_repository import MessageRepository
 from app.domain.value_objects.message_id import MessageId
 from app.domain.value_objects.message_content import MessageContent
 from app.domain.value_objects.room_id import RoomId
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MATCH_START, MATCH_STOP, MessageSearchHit
 from app.domain.value_objects.user_id import UserId
 from app.domain.enums.message_type import MessageType
 
-from app.infrastructure.database.models.message_model import MessageModel
+from app.infrastructure.database.models.message_model import MESSAGE_SEARCH_CONFIG, MessageModel
+from app.infrastructure.database.models.room_member_model import RoomMemberModel
+
+
+def message_to_row(message: Message) -> dict:
+    return {
+        "id": message.id.value,
+        "room_id": message.room_id.value,
+        "sender_id": message.sender_id.value
+        if message.sender_id is not None
+        else None,
+        "content": message.content.value,
+        "message_type": message.message_type,
+        "created_at": message.created_at,
+    }
+
+
+def message_from_row(row: MessageModel) -> Message:
+    return Message(
+        message_id=MessageId(row.id),
+        room_id=RoomId(row.room_id),
+        sender_id=UserId(row.sender_id)
+        if row.sender_id is not None
+        else None,
+        content=MessageContent(row.content),
+        message_type=MessageType(row.message_type),
+        created_at=row.created_at,
+    )
+
+
+# не HTML-разметка: сниппет остаётся текстом, подсветку строит слой представления
+SEARCH_HEADLINE_OPTIONS = (
+    f'StartSel="{MATCH_START}", StopSel="{MATCH_STOP}", '
+    "MaxWords=35, MinWords=15, MaxFragments=2"
+)
 
 
 class PostgresMessageRepository(MessageRepository):
@@ -19,47 +58,187 @@ class PostgresMessageRepository(MessageRepository):
         self._session = session
 
     async def add(self, message: Message) -> None:
-        self._session.add(
-            MessageModel(
-                id=message.id.value,
-                room_id=message.room_id.value,
-                sender_id=message.sender_id.value
-                if message.sender_id is not None
-                else None,
-                content=message.content.value,
-                message_type=message.message_type,
-                created_at=message.created_at,
-            )
-        )
+        self._session.add(MessageModel(**message_to_row(message)))
+
+    async def add_many(self, messages: Iterable[Message]) -> None:
+        # один multi-row INSERT вместо отдельного INSERT на каждый объект ORM
+        rows = [message_to_row(message) for message in messages]
+        if rows:
+            await self._session.execute(insert(MessageModel), rows)
+
+    # страница «от новых к старым» сначала читается только из свежих партиций;
+    # не набралась — один запрос без нижней границы
+    HISTORY_WINDOW = timedelta(days=31)
 
     async def get_room_history(
         self,
         room_id: RoomId,
         *,
         limit: int,
-        offset: int,
+        offset: int = 0,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
     ) -> Iterable[Message]:
+        if after is not None:
+            rows = await self._fetch_history(
+                room_id, limit=limit, offset=offset, before=before, after=after,
+            )
+            # ближайшие к курсору новые сообщения читались по возрастанию
+            rows = list(reversed(rows))
+        else:
+            anchor = before.created_at if before is not None else datetime.now(timezone.utc)
+
+            rows = await self._fetch_history(
+                room_id,
+                limit=limit,
+                offset=offset,
+                before=before,
+                since=anchor - self.HISTORY_WINDOW,
+            )
+            # полная страница в окне — ровно те же строки, что и без окна
+            if len(rows) < limit:
+                rows = await self._fetch_history(
+                    room_id,
+                    limit=limit,
+                    offset=offset,
+                    before=before,
+                )
+
+        return [message_from_row(row) for row in rows]
+
+    async def stream_room_history(
+        self,
+        room_id: RoomId,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Message]:
         stmt = (
             select(MessageModel)
             .where(MessageModel.room_id == room_id.value)
-            .order_by(MessageModel.created_at.desc())
+            .order_by(MessageModel.created_at.asc(), MessageModel.id.asc())
+            # серверный курсор: в памяти держится не больше batch_size строк
+            .execution_options(yield_per=batch_size)
+        )
+
+        # простые условия на created_at заодно отсекают лишние партиции
+        if since is not None:
+            stmt = stmt.where(MessageModel.created_at >= since)
+        if until is not None:
+            stmt = stmt.where(MessageModel.created_at < until)
+
+        result = await self._session.stream_scalars(stmt)
+        try:
+            async for row in result:
+                yield message_from_row(row)
+        finally:
+            # курсор закрывается и при обрыве выгрузки на середине
+            await result.close()
+
+    async def search(
+        self,
+        query: str,
+        *,
+        user_id: UUID,
+        room_id: RoomId | None = None,
+        limit: int,
+        after: MessageSearchCursor | None = None,
+    ) -> list[MessageSearchHit]:
+        config = literal_column(f"'{MESSAGE_SEARCH_CONFIG}'::regconfig")
+        # websearch-синтаксис: кавычки, OR и минус, без ошибок на произвольном вводе
+        ts_query = func.websearch_to_tsquery(config, query)
+        rank = func.ts_rank(MessageModel.search_vector, ts_query, type_=REAL)
+
+        # комнаты пользователя — подзапросом в том же запросе, а не отдельным запросом на комнату
+        member_rooms = select(RoomMemberModel.room_id).where(RoomMemberModel.user_id == user_id)
+
+        stmt = select(
+            MessageModel.id,
+            MessageModel.room_id,
+            MessageModel.sender_id,
+            MessageModel.content,
+            MessageModel.message_type,
+            MessageModel.created_at,
+            rank.label("rank"),
+        ).where(
+            # @@ по search_vector идёт через GIN-индекс каждой партиции
+            MessageModel.search_vector.bool_op("@@")(ts_query),
+            MessageModel.room_id.in_(member_rooms),
+        )
+
+        if room_id is not None:
+            stmt = stmt.where(MessageModel.room_id == room_id.value)
+
+        # keyset по (rank, created_at, id): ранг для одного запроса детерминирован
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(rank, MessageModel.created_at, MessageModel.id)
+                < tuple_(after.rank, after.created_at, after.message_id)
+            )
+
+        page = (
+            stmt.order_by(rank.desc(), MessageModel.created_at.desc(), MessageModel.id.desc())
             .limit(limit)
-            .offset(offset)
+            .subquery("page")
         )
 
-        result = await self._session.execute(stmt)
-        rows = result.scalars().all()
+        # ts_headline дорогой: считаем его только для строк уже отобранной страницы
+        snippet = func.ts_headline(config, page.c.content, ts_query, SEARCH_HEADLINE_OPTIONS)
+        result = await self._session.execute(
+            select(page, snippet.label("snippet")).order_by(
+                page.c.rank.desc(),
+                page.c.created_at.desc(),
+                page.c.id.desc(),
+            )
+        )
 
         return [
-            Message(
-                message_id=MessageId(row.id),
-                room_id=RoomId(row.room_id),
-                sender_id=UserId(row.sender_id)
-                if row.sender_id is not None
-                else None,
-                content=MessageContent(row.content),
-                message_type=MessageType(row.message_type),
-                created_at=row.created_at,
+            MessageSearchHit(
+                message=message_from_row(row),
+                rank=row.rank,
+                snippet=row.snippet,
             )
-            for row in rows
+            for row in result.all()
         ]
+
+    async def _fetch_history(
+        self,
+        room_id: RoomId,
+        *,
+        limit: int,
+        offset: int,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+        since: datetime | None = None,
+    ) -> list[MessageModel]:
+        # keyset: сравнение по (created_at, id) идёт по индексу
+        # ix_messages_room_created_at_id, пропущенные строки не сканируются
+        position = tuple_(MessageModel.created_at, MessageModel.id)
+
+        stmt = select(MessageModel).where(MessageModel.room_id == room_id.value)
+
+        # планировщик отсекает партиции только по простым условиям на created_at,
+        # сравнение кортежей для этого не годится — дублируем границы отдельно
+        if before is not None:
+            stmt = stmt.where(
+                MessageModel.created_at <= before.created_at,
+                position < tuple_(before.created_at, before.message_id),
+            )
+
+        if after is not None:
+            stmt = stmt.where(
+                MessageModel.created_at >= after.created_at,
+                position > tuple_(after.created_at, after.message_id),
+            )
+            stmt = stmt.order_by(MessageModel.created_at.asc(), MessageModel.id.asc())
+        else:
+            stmt = stmt.order_by(MessageModel.created_at.desc(), MessageModel.id.desc())
+
+        if since is not None:
+            stmt = stmt.where(MessageModel.created_at >= since)
+
+        stmt = stmt.limit(limit).offset(offset)
+
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterable, Optional
 from uuid import UUID
 
 from sqlalchemy import select, and_, delete
@@ -61,6 +61,36 @@ class PostgresRoomRepository(RoomRepository):
             created_at=room_model.created_at,
         )
 
+    async def exists(self, room_id: RoomId) -> bool:
+        stmt = select(RoomModel.id).where(RoomModel.id == room_id.value)
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def is_member(self, room_id: RoomId, user_id: UUID) -> bool:
+        # точечный поиск по PK (room_id, user_id), состав комнаты не загружается
+        stmt = select(RoomMemberModel.room_id).where(
+            RoomMemberModel.room_id == room_id.value,
+            RoomMemberModel.user_id == user_id,
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def get_member_room_ids(
+        self,
+        room_ids: Iterable[RoomId],
+        user_id: UUID,
+    ) -> set[UUID]:
+        ids = [room_id.value for room_id in room_ids]
+        if not ids:
+            return set()
+
+        stmt = select(RoomMemberModel.room_id).where(
+            RoomMemberModel.user_id == user_id,
+            RoomMemberModel.room_id.in_(ids),
+        )
+        result = await self._session.execute(stmt)
+        return set(result.scalars().all())
+
     async def exists_private_room(self, user_a_id: UUID, user_b_id: UUID) -> bool:
         stmt = (
             select(RoomModel.id)
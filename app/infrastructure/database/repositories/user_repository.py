@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.user import User
@@ -26,6 +26,18 @@ class PostgresUserRepository(UserRepository):
         )
         self._session.add(model)
 
+    async def update(self, user: User) -> None:
+        stmt = (
+            update(UserModel)
+            .where(UserModel.id == user.id.value)
+            .values(
+                email=user.email.value,
+                password_hash=user.password.value,
+                is_active=user.is_active,
+            )
+        )
+        await self._session.execute(stmt)
+
     async def get_by_id(self, user_id: UserId) -> Optional[User]:
         stmt = select(UserModel).where(UserModel.id == user_id.value)
         result = await self._session.execute(stmt)
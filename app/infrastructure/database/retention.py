@@ -0,0 +1,221 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import delete, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.enums.room_type import RoomType
+
+from app.infrastructure.database.models.message_model import MessageModel
+from app.infrastructure.database.models.room_model import RoomModel
+from app.infrastructure.database.partitions import (
+    add_months,
+    drop_message_partition,
+    list_message_partitions,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def message_archive_row(row: MessageModel) -> dict:
+    return {
+        "id": str(row.id),
+        "room_id": str(row.room_id),
+        "sender_id": str(row.sender_id) if row.sender_id is not None else None,
+        "content": row.content,
+        "message_type": row.message_type.value,
+        "created_at": row.created_at.isoformat(),
+    }
+
+
+def append_archive_batch(path: Path, rows: list[dict]) -> None:
+    """
+    Appends rows to a gzip JSONL file as a separate gzip member and fsyncs it,
+    so the rows are durable before they are deleted from the database.
+    Multi-member files are read back by gzip.open as one stream.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            for row in rows:
+                archive.write(json.dumps(row, ensure_ascii=False).encode())
+                archive.write(b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def retention_policies(days: dict[str, int]) -> dict[RoomType, timedelta]:
+    return {RoomType(room_type): timedelta(days=value) for room_type, value in days.items()}
+
+
+class MessageRetentionJob:
+    """
+    Archives and deletes messages older than the retention of their room type.
+
+    Expired rows are processed in batches of `batch_size`, each in its own short
+    transaction: lock the batch (SKIP LOCKED, so concurrent runs on other nodes
+    take disjoint rows), append it to a gzip JSONL archive, delete it, commit.
+    Archival is at-least-once: if a commit fails after the archive write, the
+    rows are archived again by the next run. Room types without a policy are
+    kept forever.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        policies: dict[RoomType, timedelta],
+        archive_dir: Path,
+        batch_size: int = 5000,
+        interval: float = 3600.0,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self._session_factory = session_factory
+        self._policies = policies
+        self._archive_dir = archive_dir
+        self._batch_size = batch_size
+        self._interval = interval
+        self._clock = clock
+        self._task: asyncio.Task | None = None
+
+        self._runs = 0
+        self._archived = 0
+        self._dropped_partitions = 0
+        self._last_run_at: datetime | None = None
+
+    # ---------- Lifecycle ----------
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Message retention run failed")
+
+            await asyncio.sleep(self._interval)
+
+    # ---------- Retention ----------
+
+    async def run_once(self) -> dict[str, int]:
+        """Processes every policy once; returns archived row counts per room type."""
+        now = self._clock()
+        archived: dict[str, int] = {}
+
+        for room_type, retention in self._policies.items():
+            archive_path = self._archive_dir / (
+                f"messages-{room_type.value}-{now:%Y%m%dT%H%M%SZ}.jsonl.gz"
+            )
+            archived[room_type.value] = await self._expire(
+                room_type,
+                now - retention,
+                archive_path,
+            )
+
+        # если политики есть для всех типов, месяцы старше самой короткой из них уже пусты
+        if self._policies and set(self._policies) == set(RoomType):
+            await self._drop_empty_partitions(now - min(self._policies.values()))
+
+        self._runs += 1
+        self._last_run_at = now
+        return archived
+
+    async def _expire(self, room_type: RoomType, cutoff: datetime, archive_path: Path) -> int:
+        total = 0
+
+        while True:
+            async with self._session_factory() as session:
+                rows = await self._lock_batch(session, room_type, cutoff)
+                if not rows:
+                    return total
+
+                # файл пишется в потоке, чтобы не блокировать event loop на gzip и fsync
+                await asyncio.to_thread(
+                    append_archive_batch,
+                    archive_path,
+                    [message_archive_row(row) for row in rows],
+                )
+
+                await session.execute(
+                    delete(MessageModel).where(
+                        tuple_(MessageModel.id, MessageModel.created_at).in_(
+                            [(row.id, row.created_at) for row in rows]
+                        )
+                    )
+                )
+                await session.commit()
+
+            total += len(rows)
+            self._archived += len(rows)
+
+            if len(rows) < self._batch_size:
+                return total
+
+    async def _lock_batch(
+        self,
+        session: AsyncSession,
+        room_type: RoomType,
+        cutoff: datetime,
+    ) -> list[MessageModel]:
+        stmt = (
+            select(MessageModel)
+            .join(RoomModel, RoomModel.id == MessageModel.room_id)
+            .where(
+                RoomModel.room_type == room_type,
+                MessageModel.created_at < cutoff,
+            )
+            .order_by(MessageModel.created_at, MessageModel.id)
+            .limit(self._batch_size)
+            .with_for_update(of=MessageModel, skip_locked=True)
+        )
+
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def _drop_empty_partitions(self, cutoff: datetime) -> None:
+        async with self._session_factory() as session:
+            for name, month in await list_message_partitions(session):
+                if add_months(month, 1) > cutoff.date():
+                    continue
+
+                # пустоту проверяем явно: строки могли остаться после сбоя прошлых батчей
+                is_empty = (
+                    await session.execute(text(f"SELECT NOT EXISTS (SELECT 1 FROM {name})"))
+                ).scalar()
+                if not is_empty:
+                    await session.rollback()
+                    continue
+
+                # не дождавшись блокировки, партиция остаётся до следующего прогона
+                if await drop_message_partition(session, name):
+                    self._dropped_partitions += 1
+                    logger.info("Dropped empty message partition %s", name)
+
+    # ---------- Introspection ----------
+
+    def stats(self) -> dict:
+        return {
+            "runs": self._runs,
+            "archived": self._archived,
+            "dropped_partitions": self._dropped_partitions,
+            "last_run_at": self._last_run_at.isoformat() if self._last_run_at else None,
+        }
@@ -0,0 +1,118 @@
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+from uuid import UUID
+
+try:
+    import msgpack
+except ImportError:  # msgpack — опциональная зависимость
+    msgpack = None
+
+
+class EventCodec(ABC):
+    """Wire format of events travelling through the Redis event bus."""
+
+    @abstractmethod
+    def encode(self, event: dict) -> bytes | str:
+        ...
+
+
+class JsonEventCodec(EventCodec):
+    def encode(self, event: dict) -> str:
+        return json.dumps(event)
+
+
+# первый байт бинарного кадра — версия формата; JSON всегда начинается с "{"
+MSGPACK_V1 = 1
+
+_EXT_UUID = 1
+_EXT_TIMESTAMP = 2
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _pack_string(value: str):
+    """
+    UUID and UTC ISO timestamp strings are packed as ext types, but only when
+    unpacking gives back exactly the same string, so the codec stays lossless.
+    """
+    if len(value) == 36:
+        try:
+            if str(UUID(value)) == value:
+                return msgpack.ExtType(_EXT_UUID, UUID(value).bytes)
+        except ValueError:
+            pass
+
+    elif 25 <= len(value) <= 32 and value[10:11] == "T":
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+
+        if moment.utcoffset() == timedelta(0):
+            micros = (moment - _EPOCH) // timedelta(microseconds=1)
+            if _unpack_timestamp(micros) == value:
+                return msgpack.ExtType(_EXT_TIMESTAMP, micros.to_bytes(8, "big", signed=True))
+
+    return value
+
+
+def _unpack_timestamp(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+def _compact(value):
+    if isinstance(value, str):
+        return _pack_string(value)
+    if isinstance(value, dict):
+        return {key: _compact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_compact(item) for item in value]
+    return value
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == _EXT_UUID:
+        return str(UUID(bytes=data))
+    if code == _EXT_TIMESTAMP:
+        return _unpack_timestamp(int.from_bytes(data, "big", signed=True))
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackEventCodec(EventCodec):
+    """
+    msgpack with UUIDs as 16 raw bytes and UTC timestamps as epoch micros.
+    Decoding restores the original strings, so handlers see the same dict
+    as with the JSON codec.
+    """
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+
+    def encode(self, event: dict) -> bytes:
+        return bytes([MSGPACK_V1]) + msgpack.packb(_compact(event), use_bin_type=True)
+
+
+def decode_event(data: bytes | str) -> dict:
+    """
+    Decodes any supported wire format, so nodes of a rolling upgrade
+    understand each other regardless of the codec they publish with.
+    """
+    if isinstance(data, str) or data[:1] == b"{":
+        return json.loads(data)
+
+    if data[0] == MSGPACK_V1:
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        return msgpack.unpackb(data[1:], ext_hook=_ext_hook, raw=False)
+
+    raise ValueError(f"Unknown event format version: {data[0]}")
+
+
+def get_event_codec(name: Literal["json", "msgpack"] = "json") -> EventCodec:
+    if name == "msgpack":
+        return MsgpackEventCodec()
+
+    return JsonEventCodec()
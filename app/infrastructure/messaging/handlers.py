@@ -1,6 +1,15 @@
 from uuid import UUID
 
 from app.infrastructure.websocket.manager import ConnectionManager
+from app.infrastructure.cache.membership_cache import (
+    InMemoryMembershipCache,
+    MEMBERSHIP_INVALIDATED,
+)
+from app.infrastructure.cache.identity_cache import (
+    IDENTITY_INVALIDATED,
+    InMemoryIdentityCache,
+    TieredIdentityCache,
+)
 
 
 class WebSocketEventHandler:
@@ -16,9 +25,42 @@ class WebSocketEventHandler:
                 room_id=UUID(payload["room_id"]),
                 message=event,
             )
-        elif event_type == "typing":
+        elif event_type in ("typing", "typing_stop"):
             await self._manager.broadcast_to_room(
                 room_id=UUID(payload["room_id"]),
                 message=event,
-                exclude_user_id=UUID(payload.get("user_id")),
+                exclude_user_id=self._typing_author(payload),
             )
+
+    @staticmethod
+    def _typing_author(payload: dict) -> UUID | None:
+        # объединённый кадр нескольких пользователей получают все, свои id клиент отфильтрует
+        if "user_id" in payload:
+            return UUID(payload["user_id"])
+
+        user_ids = payload.get("user_ids", [])
+        return UUID(user_ids[0]) if len(user_ids) == 1 else None
+
+
+class ControlEventHandler:
+    """Applies control-channel events published by other instances."""
+
+    def __init__(
+        self,
+        membership_cache: InMemoryMembershipCache | None = None,
+        identity_cache: InMemoryIdentityCache | TieredIdentityCache | None = None,
+    ):
+        self._membership_cache = membership_cache
+        self._identity_cache = identity_cache
+
+    async def handle(self, event: dict) -> None:
+        event_type = event.get("type")
+        payload = event.get("payload", {})
+
+        if event_type == MEMBERSHIP_INVALIDATED and self._membership_cache is not None:
+            self._membership_cache.invalidate_local(
+                room_id=UUID(payload["room_id"]),
+                user_id=UUID(payload["user_id"]),
+            )
+        elif event_type == IDENTITY_INVALIDATED and self._identity_cache is not None:
+            self._identity_cache.invalidate_local(UUID(payload["user_id"]))
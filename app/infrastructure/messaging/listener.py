@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def as_batches(events: AsyncIterator[dict]) -> AsyncIterator[list[dict]]:
+    """Adapts a plain event stream (e.g. `subscribe`) to the batch interface."""
+    async for event in events:
+        yield [event]
+
+
+def event_timestamp(message: dict) -> float | None:
+    """
+    When the event was produced, as a unix timestamp: the stream ID carries it
+    for Redis Streams, otherwise the payload's created_at if there is one.
+    """
+    stream_id = message.get("stream_id")
+    if stream_id:
+        return int(stream_id.split("-", 1)[0]) / 1000
+
+    created_at = message.get("payload", {}).get("created_at")
+    if created_at:
+        try:
+            return datetime.fromisoformat(created_at).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    return None
+
+
+class SupervisedListener:
+    """
+    Keeps an event bus subscription alive and dispatches what it delivers.
+
+    Any failure of the source is logged, followed by an exponential backoff,
+    `reconnect` (which must restore every subscription) and a fresh source.
+    Each delivered batch is grouped by room: rooms are dispatched concurrently,
+    events of one room stay sequential so their order is preserved.
+    """
+
+    _RATE_WINDOW_SECONDS = 10.0
+
+    def __init__(
+        self,
+        source: Callable[[], AsyncIterator[list[dict]]],
+        handle: Callable[[dict], Awaitable[None]],
+        *,
+        name: str,
+        reconnect: Callable[[], Awaitable[None]] | None = None,
+        initial_backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._source = source
+        self._handle = handle
+        self._name = name
+        self._reconnect = reconnect
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+
+        self._connected = False
+        self._reconnects = 0
+        self._events = 0
+        self._batches = 0
+        self._failed_events = 0
+        self._last_lag_ms = 0.0
+        self._max_lag_ms = 0.0
+        # (момент, число событий) за последние _RATE_WINDOW_SECONDS
+        self._recent: deque[tuple[float, int]] = deque()
+
+    async def run(self) -> None:
+        backoff = self._initial_backoff
+
+        while True:
+            try:
+                async for batch in self._source():
+                    self._connected = True
+                    backoff = self._initial_backoff
+                    await self._dispatch(batch)
+
+                # источник не должен заканчиваться сам — считаем это обрывом
+                raise ConnectionError(f"{self._name} listener source ended")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._connected = False
+                logger.exception("%s listener failed, retrying in %.2fs", self._name, backoff)
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self._max_backoff)
+            self._reconnects += 1
+
+            if self._reconnect is not None:
+                try:
+                    await self._reconnect()
+                except Exception:
+                    # Redis ещё недоступен: следующая попытка после большего backoff
+                    logger.warning("%s listener reconnect failed", self._name, exc_info=True)
+
+    # ---------- Dispatch ----------
+
+    async def _dispatch(self, batch: list[dict]) -> None:
+        by_room: dict[str | None, list[dict]] = {}
+        for event in batch:
+            message = event["message"]
+            by_room.setdefault(message.get("payload", {}).get("room_id"), []).append(message)
+
+        if len(by_room) == 1:
+            # без лишней задачи на типичный случай — пачка из одной комнаты
+            await self._dispatch_room(next(iter(by_room.values())))
+        else:
+            await asyncio.gather(*(self._dispatch_room(messages) for messages in by_room.values()))
+
+        self._record(batch)
+
+    async def _dispatch_room(self, messages: list[dict]) -> None:
+        for message in messages:
+            try:
+                await self._handle(message)
+            except Exception:
+                # одно битое событие не должно останавливать доставку остальных
+                self._failed_events += 1
+                logger.exception("Failed to handle %s event", self._name)
+
+    def _record(self, batch: list[dict]) -> None:
+        now = self._clock()
+
+        self._events += len(batch)
+        self._batches += 1
+        self._recent.append((now, len(batch)))
+        while self._recent and now - self._recent[0][0] > self._RATE_WINDOW_SECONDS:
+            self._recent.popleft()
+
+        produced_at = event_timestamp(batch[-1]["message"])
+        if produced_at is not None:
+            self._last_lag_ms = max(0.0, (now - produced_at) * 1000)
+            self._max_lag_ms = max(self._max_lag_ms, self._last_lag_ms)
+
+    # ---------- Introspection ----------
+
+    def stats(self) -> dict:
+        now = self._clock()
+        recent = sum(count for moment, count in self._recent if now - moment <= self._RATE_WINDOW_SECONDS)
+
+        return {
+            "connected": self._connected,
+            "reconnects": self._reconnects,
+            "events": self._events,
+            "batches": self._batches,
+            "failed_events": self._failed_events,
+            "events_per_second": round(recent / self._RATE_WINDOW_SECONDS, 3),
+            "last_lag_ms": round(self._last_lag_ms, 3),
+            "max_lag_ms": round(self._max_lag_ms, 3),
+        }
@@ -1,16 +1,138 @@
-import json
+import asyncio
+import logging
+from typing import Iterable
+from uuid import UUID
+
 import redis.asyncio as redis
+from app.application.messaging.channels import room_channel
 from app.application.messaging.event_bus import EventBus
+from app.infrastructure.messaging.codecs import EventCodec, JsonEventCodec, decode_event
+
+logger = logging.getLogger(__name__)
+
 
 class RedisEventBus(EventBus):
-    def __init__(self, redis_url: str):
+    _POLL_TIMEOUT_SECONDS = 1.0
+
+    def __init__(
+        self,
+        redis_url: str,
+        *,
+        publish_flush_interval: float | None = None,
+        publish_batch_size: int = 100,
+        codec: EventCodec | None = None,
+    ):
         self._redis = redis.from_url(redis_url)
+        # кодек определяет только формат публикации; читаются все известные форматы
+        self._codec = codec or JsonEventCodec()
+
+        # буферизованная публикация: None — каждое событие уходит сразу
+        self._publish_flush_interval = publish_flush_interval
+        self._publish_batch_size = publish_batch_size
+        self._publish_buffer: list[dict] = []
+        self._publish_pending = asyncio.Event()
+        self._publish_batch_full = asyncio.Event()
+        self._publish_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+        self._closing = False
+        self._published = 0
+        self._publish_batches = 0
+
+        # один pubsub на инстанс: подписки на комнаты добавляются и снимаются динамически
+        self._room_pubsub = None
+        self._rooms: set[UUID] = set()
+        self._subscribed_channels: set[str] = set()
+        self._subscription_lock = asyncio.Lock()
+        self._has_subscriptions = asyncio.Event()
 
     async def init(self):
         await self._redis.ping()  # проверяем соединение
 
+        if self._publish_flush_interval is not None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def close(self) -> None:
+        """Sends everything still buffered and stops the flusher."""
+        self._closing = True
+        self._publish_pending.set()
+        self._publish_batch_full.set()
+
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+
+        await self._flush_buffer()
+
+    # ---------- Publishing ----------
+
     async def publish(self, event: dict) -> None:
-        await self._redis.publish(event["channel"], json.dumps(event))
+        if self._flusher is None or self._closing:
+            await self._send([event])
+            return
+
+        self._publish_buffer.append(event)
+        self._publish_pending.set()
+        if len(self._publish_buffer) >= self._publish_batch_size:
+            self._publish_batch_full.set()
+
+    async def publish_many(self, events: Iterable[dict]) -> None:
+        # буфер уходит вместе с пачкой, чтобы не нарушить порядок событий
+        async with self._publish_lock:
+            batch, self._publish_buffer = self._publish_buffer + list(events), []
+            await self._send_unlocked(batch)
+
+    async def _run_flusher(self) -> None:
+        while not self._closing:
+            await self._publish_pending.wait()
+
+            try:
+                await asyncio.wait_for(
+                    self._publish_batch_full.wait(),
+                    timeout=self._publish_flush_interval,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self._flush_buffer()
+            except Exception:
+                # flusher не должен умирать: иначе буфер перестанет уходить совсем
+                logger.exception("Failed to publish buffered events")
+
+    async def _flush_buffer(self) -> None:
+        async with self._publish_lock:
+            batch, self._publish_buffer = self._publish_buffer, []
+            self._publish_pending.clear()
+            self._publish_batch_full.clear()
+            await self._send_unlocked(batch)
+
+    async def _send(self, events: list[dict]) -> None:
+        async with self._publish_lock:
+            await self._send_unlocked(events)
+
+    async def _send_unlocked(self, events: list[dict]) -> None:
+        if not events:
+            return
+
+        if len(events) == 1:
+            event = events[0]
+            await self._redis.publish(event["channel"], self._codec.encode(event))
+        else:
+            # один round-trip до Redis на всю пачку; транзакция не нужна
+            pipe = self._redis.pipeline(transaction=False)
+            for event in events:
+                pipe.publish(event["channel"], self._codec.encode(event))
+            await pipe.execute()
+
+        self._published += len(events)
+        self._publish_batches += 1
+
+    def publish_stats(self) -> dict:
+        return {
+            "buffered": len(self._publish_buffer),
+            "published": self._published,
+            "batches": self._publish_batches,
+        }
 
     async def subscribe(self, channel: str):
         pubsub = self._redis.pubsub()
@@ -18,4 +140,96 @@ class RedisEventBus(EventBus):
         async for raw_message in pubsub.listen():
             if raw_message["type"] != "message":
                 continue
-            yield json.loads(raw_message["data"])
+            yield decode_event(raw_message["data"])
+
+    # ---------- Per-room routing ----------
+
+    async def subscribe_room(self, room_id: UUID) -> None:
+        self._rooms.add(room_id)
+        await self._sync_room(room_id)
+
+    async def unsubscribe_room(self, room_id: UUID) -> None:
+        self._rooms.discard(room_id)
+        await self._sync_room(room_id)
+
+    async def _sync_room(self, room_id: UUID) -> None:
+        # приводим подписку к желаемому состоянию: join/leave одной комнаты могут гоняться
+        async with self._subscription_lock:
+            channel = room_channel(room_id)
+            wanted = room_id in self._rooms
+            subscribed = channel in self._subscribed_channels
+
+            if wanted and not subscribed:
+                await self._get_room_pubsub().subscribe(channel)
+                self._subscribed_channels.add(channel)
+            elif subscribed and not wanted:
+                await self._get_room_pubsub().unsubscribe(channel)
+                self._subscribed_channels.discard(channel)
+
+            if self._subscribed_channels:
+                self._has_subscriptions.set()
+            else:
+                self._has_subscriptions.clear()
+
+    def _get_room_pubsub(self):
+        if self._room_pubsub is None:
+            self._room_pubsub = self._redis.pubsub()
+        return self._room_pubsub
+
+    async def reconnect(self) -> None:
+        """Replaces the room pubsub and re-subscribes to every wanted room channel."""
+        async with self._subscription_lock:
+            old_pubsub, self._room_pubsub = self._room_pubsub, None
+            if old_pubsub is not None:
+                try:
+                    await old_pubsub.aclose()
+                except Exception:
+                    # старое соединение уже может быть мёртвым
+                    logger.debug("Failed to close stale pubsub", exc_info=True)
+
+            channels = [room_channel(room_id) for room_id in self._rooms]
+            self._subscribed_channels = set()
+            if channels:
+                await self._get_room_pubsub().subscribe(*channels)
+                self._subscribed_channels.update(channels)
+                self._has_subscriptions.set()
+            else:
+                self._has_subscriptions.clear()
+
+    async def listen(self):
+        """Yields events of every room this instance is currently subscribed to."""
+        async for batch in self.listen_batches(max_batch_size=1):
+            for event in batch:
+                yield event
+
+    async def listen_batches(self, max_batch_size: int = 100):
+        """
+        Like `listen`, but after the first event drains whatever is already
+        buffered, up to `max_batch_size`, and yields it as one list.
+        """
+        while True:
+            if not self._subscribed_channels:
+                await self._has_subscriptions.wait()
+                continue
+
+            # pubsub могли пересоздать в reconnect, поэтому берём его на каждой итерации
+            pubsub = self._get_room_pubsub()
+            raw_message = await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=self._POLL_TIMEOUT_SECONDS,
+            )
+            if raw_message is None or raw_message["type"] != "message":
+                continue
+
+            batch = [decode_event(raw_message["data"])]
+            while len(batch) < max_batch_size:
+                raw_message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=0.0,
+                )
+                if raw_message is None:
+                    break
+                if raw_message["type"] == "message":
+                    batch.append(decode_event(raw_message["data"]))
+
+            yield batch
@@ -0,0 +1,217 @@
+import asyncio
+import re
+from typing import Iterable
+from uuid import UUID
+
+import redis.asyncio as redis
+from app.application.messaging.channels import room_channel
+from app.application.messaging.event_bus import EventBus
+from app.infrastructure.messaging.codecs import EventCodec, JsonEventCodec, decode_event
+
+
+# ID, меньший любого реального: XREAD с ним вернёт поток с самого начала
+STREAM_START_ID = "0-0"
+
+_STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+
+# эфемерные события не имеет смысла отдавать при догоне
+_NOT_REPLAYED = frozenset({"typing"})
+
+
+class RedisStreamEventBus(EventBus):
+    """
+    EventBus on Redis Streams: one capped stream per channel.
+
+    Every node reads the streams of its rooms with XREAD and remembers the last
+    ID it has seen, so a lagging or reconnecting listener continues where it
+    stopped instead of losing events. Consumer groups are deliberately not used:
+    a group splits entries between consumers, while every node needs a full copy
+    to fan out to its own sockets. Delivered events carry `stream_id`, which a
+    reconnecting client can pass back to catch up through `replay`.
+    """
+
+    _EVENT_FIELD = b"event"
+
+    def __init__(
+        self,
+        redis_url: str,
+        *,
+        max_len: int = 10_000,
+        read_count: int = 100,
+        block_ms: int = 1000,
+        ttl_seconds: float | None = 24 * 3600,
+        codec: EventCodec | None = None,
+    ):
+        self._redis = redis.from_url(redis_url)
+        self._codec = codec or JsonEventCodec()
+        self._max_len = max_len
+        self._read_count = read_count
+        self._block_ms = block_ms
+        # поток комнаты без новых событий удаляется через ttl после последнего XADD
+        self._ttl_ms = int(ttl_seconds * 1000) if ttl_seconds else None
+
+        # stream key -> последний ID, прочитанный этим инстансом
+        self._last_ids: dict[str, str] = {}
+        self._subscription_lock = asyncio.Lock()
+        self._has_subscriptions = asyncio.Event()
+
+        self._published = 0
+        self._publish_batches = 0
+
+    async def init(self):
+        await self._redis.ping()  # проверяем соединение
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    # ---------- Publishing ----------
+
+    async def publish(self, event: dict) -> None:
+        await self.publish_many([event])
+
+    async def publish_many(self, events: Iterable[dict]) -> None:
+        events = list(events)
+        if not events:
+            return
+
+        # один round-trip до Redis на всю пачку; транзакция не нужна
+        pipe = self._redis.pipeline(transaction=False)
+        for event in events:
+            pipe.xadd(
+                event["channel"],
+                {self._EVENT_FIELD: self._codec.encode(event)},
+                maxlen=self._max_len,
+                approximate=True,
+            )
+
+        if self._ttl_ms is not None:
+            for channel in {event["channel"] for event in events}:
+                pipe.pexpire(channel, self._ttl_ms)
+
+        await pipe.execute()
+
+        self._published += len(events)
+        self._publish_batches += 1
+
+    def publish_stats(self) -> dict:
+        return {
+            "buffered": 0,
+            "published": self._published,
+            "batches": self._publish_batches,
+            "streams": len(self._last_ids),
+        }
+
+    # ---------- Reading ----------
+
+    def _decode_entry(self, entry_id, fields: dict) -> dict:
+        stream_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+        event = decode_event(fields[self._EVENT_FIELD])
+        # клиент запоминает ID последнего события и догоняет по нему после переподключения
+        event["message"]["stream_id"] = stream_id
+        return event
+
+    async def _latest_id(self, stream: str) -> str:
+        entries = await self._redis.xrevrange(stream, count=1)
+        if not entries:
+            return STREAM_START_ID
+
+        entry_id = entries[0][0]
+        return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+    async def subscribe(self, channel: str):
+        last_id = await self._latest_id(channel)
+
+        while True:
+            response = await self._redis.xread(
+                {channel: last_id},
+                count=self._read_count,
+                block=self._block_ms,
+            )
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    event = self._decode_entry(entry_id, fields)
+                    last_id = event["message"]["stream_id"]
+                    yield event
+
+    # ---------- Per-room routing ----------
+
+    async def subscribe_room(self, room_id: UUID) -> None:
+        async with self._subscription_lock:
+            stream = room_channel(room_id)
+            if stream in self._last_ids:
+                return
+
+            # читаем только новое: историю до подписки клиент догоняет через replay
+            self._last_ids[stream] = await self._latest_id(stream)
+            self._has_subscriptions.set()
+
+    async def unsubscribe_room(self, room_id: UUID) -> None:
+        async with self._subscription_lock:
+            self._last_ids.pop(room_channel(room_id), None)
+            if not self._last_ids:
+                self._has_subscriptions.clear()
+
+    async def reconnect(self) -> None:
+        # клиент Redis переподключается сам, а позиции чтения хранятся в _last_ids:
+        # следующий XREAD продолжит с последнего увиденного события
+        return None
+
+    async def listen(self):
+        """Yields events of every room this instance is currently subscribed to."""
+        async for batch in self.listen_batches():
+            for event in batch:
+                yield event
+
+    async def listen_batches(self, max_batch_size: int | None = None):
+        """Yields every XREAD response as one list of events."""
+        count = max_batch_size or self._read_count
+
+        while True:
+            if not self._last_ids:
+                await self._has_subscriptions.wait()
+                continue
+
+            response = await self._redis.xread(
+                dict(self._last_ids),
+                count=count,
+                block=self._block_ms,
+            )
+
+            batch = []
+            for stream, entries in response or []:
+                stream = stream.decode() if isinstance(stream, bytes) else stream
+
+                for entry_id, fields in entries:
+                    # комнату могли покинуть, пока шёл XREAD
+                    if stream not in self._last_ids:
+                        break
+                    event = self._decode_entry(entry_id, fields)
+                    self._last_ids[stream] = event["message"]["stream_id"]
+                    batch.append(event)
+
+            if batch:
+                yield batch
+
+    async def replay(
+        self,
+        room_id: UUID,
+        after_id: str,
+        *,
+        limit: int = 1000,
+    ) -> list[dict]:
+        if not _STREAM_ID_RE.match(after_id):
+            raise ValueError(f"Invalid stream id: {after_id!r}")
+
+        entries = await self._redis.xrange(
+            room_channel(room_id),
+            min=f"({after_id}",
+            max="+",
+            count=limit,
+        )
+
+        events = [self._decode_entry(entry_id, fields) for entry_id, fields in entries]
+        return [
+            event
+            for event in events
+            if event["message"].get("type") not in _NOT_REPLAYED
+        ]
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+from uuid import UUID
+
+from app.application.messaging.channels import room_channel
+from app.application.messaging.event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+
+TYPING = "typing"
+TYPING_STOP = "typing_stop"
+
+
+class TypingCoalescer:
+    """
+    Server-side throttling of typing indicators.
+
+    A user/room pair publishes at most one typing event per `window`; repeated
+    keystrokes only extend its deadline. Every `flush_interval` the pairs that
+    are due are published as a single "users typing" event per room, and pairs
+    silent for `stop_after` get an automatic typing_stop.
+    """
+
+    def __init__(
+        self,
+        event_bus: EventBus,
+        *,
+        window: float = 1.0,
+        flush_interval: float = 0.1,
+        stop_after: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._event_bus = event_bus
+        self._window = window
+        self._flush_interval = flush_interval
+        self._stop_after = stop_after
+        self._clock = clock
+
+        # (room_id, user_id) -> момент последней публикации / дедлайн авто-стопа
+        self._published_at: dict[tuple[UUID, UUID], float] = {}
+        self._expires_at: dict[tuple[UUID, UUID], float] = {}
+        # room_id -> пользователи, которых нужно опубликовать в ближайший flush
+        self._pending: dict[UUID, set[UUID]] = {}
+
+        self._task: asyncio.Task | None = None
+
+        self._received = 0
+        self._suppressed = 0
+        self._published_frames = 0
+        self._stops = 0
+
+    # ---------- Lifecycle ----------
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # индикаторы не должны зависнуть у клиентов других инстансов
+        await self.flush(stop_all=True)
+
+    # ---------- Producer side ----------
+
+    def typing(self, room_id: UUID, user_id: UUID) -> None:
+        now = self._clock()
+        key = (room_id, user_id)
+
+        self._received += 1
+        self._expires_at[key] = now + self._stop_after
+
+        published_at = self._published_at.get(key)
+        if published_at is not None and now - published_at < self._window:
+            self._suppressed += 1
+            return
+
+        self._pending.setdefault(room_id, set()).add(user_id)
+
+    # ---------- Flusher ----------
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+
+            try:
+                await self.flush()
+            except Exception:
+                # flusher не должен умирать: иначе индикаторы перестанут ходить совсем
+                logger.exception("Failed to publish typing events")
+
+    async def flush(self, *, stop_all: bool = False) -> None:
+        now = self._clock()
+        events = []
+
+        pending, self._pending = self._pending, {}
+        for room_id, user_ids in pending.items():
+            for user_id in user_ids:
+                self._published_at[(room_id, user_id)] = now
+            events.append(self._event(TYPING, room_id, user_ids))
+
+        expired: dict[UUID, set[UUID]] = {}
+        for key, expires_at in list(self._expires_at.items()):
+            if stop_all or expires_at <= now:
+                del self._expires_at[key]
+                self._published_at.pop(key, None)
+                expired.setdefault(key[0], set()).add(key[1])
+
+        for room_id, user_ids in expired.items():
+            events.append(self._event(TYPING_STOP, room_id, user_ids))
+            self._stops += len(user_ids)
+
+        if not events:
+            return
+
+        await self._event_bus.publish_many(events)
+        self._published_frames += len(events)
+
+    @staticmethod
+    def _event(event_type: str, room_id: UUID, user_ids: set[UUID]) -> dict:
+        return {
+            "channel": room_channel(room_id),
+            "message": {
+                "type": event_type,
+                "payload": {
+                    "room_id": str(room_id),
+                    "user_ids": sorted(str(user_id) for user_id in user_ids),
+                },
+            },
+        }
+
+    # ---------- Introspection ----------
+
+    def stats(self) -> dict:
+        return {
+            "received": self._received,
+            "suppressed": self._suppressed,
+            "published_frames": self._published_frames,
+            "stops": self._stops,
+            "typing_now": len(self._expires_at),
+        }
@@ -1,4 +1,8 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from typing import Callable
 from uuid import UUID
 
 from jose import jwt, JWTError
@@ -16,6 +20,19 @@ class JoseJWTService(JWTService):
     _ACCESS_TOKEN_TTL_MIN = 15
     _REFRESH_TOKEN_TTL_DAYS = 7
 
+    def __init__(
+        self,
+        *,
+        verified_cache_size: int = 0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        # кэш проверенных access-токенов: sha256(token) -> (user_id, exp)
+        self._verified_cache_size = verified_cache_size
+        self._verified: OrderedDict[bytes, tuple[UUID, float]] = OrderedDict()
+        self._clock = clock
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     def create_access_token(self, user_id: UUID) -> str:
         now = datetime.now(timezone.utc)
         payload = {
@@ -45,12 +62,39 @@ class JoseJWTService(JWTService):
         )
 
     def verify_access_token(self, token: str) -> UUID:
-        return self._verify(token, expected_type="access")
+        if not self._verified_cache_size:
+            return self._verify(token, expected_type="access")
+
+        digest = hashlib.sha256(token.encode()).digest()
+        cached = self._verified.get(digest)
+
+        if cached is not None:
+            user_id, expires_at = cached
+            if expires_at > self._clock():
+                self._verified.move_to_end(digest)
+                self._cache_hits += 1
+                return user_id
+            del self._verified[digest]
+
+        self._cache_misses += 1
+        payload = self._decode(token, expected_type="access")
+        user_id = UUID(payload["sub"])
+
+        self._verified[digest] = (user_id, float(payload["exp"]))
+        if len(self._verified) > self._verified_cache_size:
+            self._verified.popitem(last=False)
+
+        return user_id
 
     def verify_refresh_token(self, token: str) -> UUID:
+        # refresh-токены не кэшируются: они редкие и долгоживущие
         return self._verify(token, expected_type="refresh")
 
     def _verify(self, token: str, expected_type: str) -> UUID:
+        payload = self._decode(token, expected_type)
+        return UUID(payload["sub"])
+
+    def _decode(self, token: str, expected_type: str) -> dict:
         try:
             payload = jwt.decode(
                 token,
@@ -65,4 +109,11 @@ class JoseJWTService(JWTService):
         if payload.get("type") != expected_type:
             raise JWTErrorInvalidToken()
 
-        return UUID(payload["sub"])
+        return payload
+
+    def cache_stats(self) -> dict:
+        return {
+            "size": len(self._verified),
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+        }
@@ -1,6 +1,11 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 from passlib.context import CryptContext
 
 from app.application.security.password_hasher import PasswordHasher
+from app.application.exceptions import PasswordHasherBusyError
 
 
 _pwd_context = CryptContext(
@@ -8,10 +13,67 @@ _pwd_context = CryptContext(
     deprecated="auto",
 )
 
+T = TypeVar("T")
+
 
 class BCryptPasswordHasher(PasswordHasher):
+    """
+    bcrypt hasher. The async methods run bcrypt in a bounded thread pool
+    (the bcrypt extension releases the GIL), so a login storm occupies the
+    pool instead of the event loop. Once `max_workers + max_pending` calls
+    are in flight new ones fail fast with PasswordHasherBusyError.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 4,
+        max_pending: int = 64,
+    ) -> None:
+        self._max_workers = max_workers
+        self._max_in_flight = max_workers + max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        self._rejected = 0
+
     def hash(self, raw_password: str) -> str:
         return _pwd_context.hash(raw_password)
 
     def verify(self, raw_password: str, hashed_password: str) -> bool:
         return _pwd_context.verify(raw_password, hashed_password)
+
+    async def hash_async(self, raw_password: str) -> str:
+        return await self._run(self.hash, raw_password)
+
+    async def verify_async(self, raw_password: str, hashed_password: str) -> bool:
+        return await self._run(self.verify, raw_password, hashed_password)
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._in_flight >= self._max_in_flight:
+            self._rejected += 1
+            raise PasswordHasherBusyError()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="bcrypt",
+            )
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self._max_workers,
+            "in_flight": self._in_flight,
+            "rejected": self._rejected,
+        }
@@ -0,0 +1,208 @@
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Hashable, NamedTuple
+from uuid import UUID
+
+from fastapi import WebSocket, status
+
+from app.infrastructure.websocket.fanout import FanOut, SendStatus
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST_TYPING = "drop_oldest_typing"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class EnqueueStatus(str, Enum):
+    QUEUED = "queued"
+    COALESCED = "coalesced"
+    DROPPED = "dropped"
+    EVICTED = "evicted"
+    CLOSED = "closed"
+
+
+class EnqueueResult(NamedTuple):
+    user_id: UUID
+    websocket: WebSocket
+    status: EnqueueStatus
+
+
+class OutboundFrame(NamedTuple):
+    data: str
+    # typing-события можно терять без потери данных
+    droppable: bool = False
+    # кадры с одинаковым ключом взаимозаменяемы (последний актуальнее)
+    coalesce_key: Hashable | None = None
+
+
+class Connection:
+    """
+    One registered WebSocket with its own bounded outbound queue.
+    A dedicated writer task drains the queue, so producers (the Redis listener)
+    never await the socket itself. When the queue is full the overflow policy
+    decides whether to drop typing frames, coalesce them or evict the client.
+    """
+
+    def __init__(
+        self,
+        user_id: UUID,
+        websocket: WebSocket,
+        fanout: FanOut,
+        *,
+        max_queue_size: int = 256,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST_TYPING,
+        close_code: int = status.WS_1013_TRY_AGAIN_LATER,
+    ) -> None:
+        self._user_id = user_id
+        self._websocket = websocket
+        self._fanout = fanout
+        self._max_queue_size = max_queue_size
+        self._overflow_policy = overflow_policy
+        self._close_code = close_code
+
+        self._queue: deque[OutboundFrame] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._writer: asyncio.Task | None = None
+        self._closing = False
+
+        self._sent = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._send_timeouts = 0
+        self._send_errors = 0
+        self._evicted = False
+
+    @property
+    def user_id(self) -> UUID:
+        return self._user_id
+
+    @property
+    def websocket(self) -> WebSocket:
+        return self._websocket
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def evicted(self) -> bool:
+        return self._evicted
+
+    # ---------- Lifecycle ----------
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._run())
+
+    def close(self) -> None:
+        self._closing = True
+        self._queue.clear()
+        self._idle.set()
+        if self._writer is not None:
+            self._writer.cancel()
+
+    async def wait_idle(self) -> None:
+        await self._idle.wait()
+
+    # ---------- Producer side ----------
+
+    def enqueue(self, frame: OutboundFrame) -> EnqueueStatus:
+        if self._closing:
+            return EnqueueStatus.CLOSED
+
+        if len(self._queue) >= self._max_queue_size:
+            overflow_status = self._handle_overflow(frame)
+            if overflow_status is not None:
+                return overflow_status
+
+        self._queue.append(frame)
+        self._idle.clear()
+        self._wakeup.set()
+        return EnqueueStatus.QUEUED
+
+    def _handle_overflow(self, frame: OutboundFrame) -> EnqueueStatus | None:
+        """
+        Returns the final status if the frame was not queued,
+        None if room was made and the frame should be appended.
+        """
+        if self._overflow_policy == OverflowPolicy.DISCONNECT:
+            return self._evict()
+
+        if self._overflow_policy == OverflowPolicy.COALESCE and frame.coalesce_key is not None:
+            for index, queued in enumerate(self._queue):
+                if queued.coalesce_key == frame.coalesce_key:
+                    self._queue[index] = frame
+                    self._coalesced += 1
+                    return EnqueueStatus.COALESCED
+
+        for queued in self._queue:
+            if queued.droppable:
+                self._queue.remove(queued)
+                self._dropped += 1
+                return None
+
+        if frame.droppable:
+            self._dropped += 1
+            return EnqueueStatus.DROPPED
+
+        # в очереди только значимые кадры — клиент не успевает, отключаем его
+        return self._evict()
+
+    def _evict(self) -> EnqueueStatus:
+        self._evicted = True
+        self._closing = True
+        self._dropped += len(self._queue)
+        self._queue.clear()
+        self._wakeup.set()
+        return EnqueueStatus.EVICTED
+
+    # ---------- Writer side ----------
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._idle.set()
+                if self._closing:
+                    break
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            frame = self._queue.popleft()
+            result = await self._fanout.send(self._user_id, self._websocket, frame.data)
+
+            if result.status == SendStatus.OK:
+                self._sent += 1
+            elif result.status == SendStatus.TIMEOUT:
+                # отменённый send_text мог оборвать кадр посередине: поток сломан,
+                # закрываем соединение как медленного клиента
+                self._send_timeouts += 1
+                self._evict()
+            else:
+                # сокет уже мёртв: дальше писать бессмысленно, разрыв обработает receive-цикл
+                self._send_errors += 1
+                self._closing = True
+                self._queue.clear()
+
+        if self._evicted:
+            try:
+                await self._websocket.close(code=self._close_code)
+            except Exception:
+                pass
+
+    # ---------- Introspection ----------
+
+    def stats(self) -> dict:
+        return {
+            "user_id": str(self._user_id),
+            "queue_depth": len(self._queue),
+            "sent": self._sent,
+            "dropped": self._dropped,
+            "coalesced": self._coalesced,
+            "send_timeouts": self._send_timeouts,
+            "send_errors": self._send_errors,
+            "evicted": self._evicted,
+        }
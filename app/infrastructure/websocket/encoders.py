@@ -0,0 +1,37 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Literal
+
+try:
+    import orjson
+except ImportError:  # orjson — опциональная зависимость
+    orjson = None
+
+
+class JsonEncoder(ABC):
+
+    @abstractmethod
+    def encode(self, data: dict) -> str:
+        ...
+
+
+class StdlibJsonEncoder(JsonEncoder):
+    def encode(self, data: dict) -> str:
+        # тот же формат, что и у WebSocket.send_json
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+class OrjsonEncoder(JsonEncoder):
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+
+    def encode(self, data: dict) -> str:
+        return orjson.dumps(data).decode("utf-8")
+
+
+def get_json_encoder(name: Literal["auto", "json", "orjson"] = "auto") -> JsonEncoder:
+    if name == "orjson" or (name == "auto" and orjson is not None):
+        return OrjsonEncoder()
+
+    return StdlibJsonEncoder()
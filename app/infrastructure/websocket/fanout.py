@@ -0,0 +1,54 @@
+import asyncio
+from enum import Enum
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi import WebSocket
+
+
+class SendStatus(str, Enum):
+    OK = "ok"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+class SendResult(NamedTuple):
+    user_id: UUID
+    websocket: WebSocket
+    status: SendStatus
+
+
+class FanOut:
+    """
+    Send limiter shared by all connection writers.
+    The number of in-flight sends is capped and every send has its own deadline,
+    so a single slow client cannot hold back the rest of the room.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 256,
+        send_timeout: float = 5.0,
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._send_timeout = send_timeout
+
+    async def send(
+        self,
+        user_id: UUID,
+        websocket: WebSocket,
+        frame: str,
+    ) -> SendResult:
+        async with self._semaphore:
+            try:
+                await asyncio.wait_for(
+                    websocket.send_text(frame),
+                    timeout=self._send_timeout,
+                )
+            except asyncio.TimeoutError:
+                return SendResult(user_id, websocket, SendStatus.TIMEOUT)
+            except Exception:
+                return SendResult(user_id, websocket, SendStatus.ERROR)
+
+        return SendResult(user_id, websocket, SendStatus.OK)
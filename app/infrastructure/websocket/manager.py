@@ -1,17 +1,50 @@
 from typing import Dict, Set
 from uuid import UUID
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
+
+from app.infrastructure.websocket.connection import (
+    Connection,
+    EnqueueResult,
+    OutboundFrame,
+    OverflowPolicy,
+)
+from app.infrastructure.websocket.encoders import JsonEncoder, get_json_encoder
+from app.infrastructure.websocket.fanout import FanOut
 
 
 class ConnectionManager:
-    def __init__(self) -> None:
-        # user_id -> set[WebSocket]
-        self._user_connections: Dict[UUID, Set[WebSocket]] = {}
+    def __init__(
+        self,
+        *,
+        max_concurrent_sends: int = 256,
+        send_timeout: float = 5.0,
+        encoder: JsonEncoder | None = None,
+        max_queue_size: int = 256,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST_TYPING,
+        slow_consumer_close_code: int = status.WS_1013_TRY_AGAIN_LATER,
+    ) -> None:
+        # user_id -> {WebSocket: Connection}
+        self._user_connections: Dict[UUID, Dict[WebSocket, Connection]] = {}
 
         # room_id -> set[user_id]
         self._room_members: Dict[UUID, Set[UUID]] = {}
 
+        # user_id -> set[room_id], обратный индекс к _room_members
+        self._user_rooms: Dict[UUID, Set[UUID]] = {}
+
+        self._fanout = FanOut(
+            max_concurrency=max_concurrent_sends,
+            send_timeout=send_timeout,
+        )
+
+        # событие кодируется один раз на broadcast, а не на каждого получателя
+        self._encoder = encoder or get_json_encoder()
+
+        self._max_queue_size = max_queue_size
+        self._overflow_policy = overflow_policy
+        self._slow_consumer_close_code = slow_consumer_close_code
+
     # ---------- Connection lifecycle ----------
 
     async def connect(
@@ -21,28 +54,44 @@ class ConnectionManager:
     ) -> None:
         await websocket.accept()
 
+        connection = Connection(
+            user_id,
+            websocket,
+            self._fanout,
+            max_queue_size=self._max_queue_size,
+            overflow_policy=self._overflow_policy,
+            close_code=self._slow_consumer_close_code,
+        )
+        connection.start()
+
         if user_id not in self._user_connections:
-            self._user_connections[user_id] = set()
+            self._user_connections[user_id] = {}
 
-        self._user_connections[user_id].add(websocket)
+        self._user_connections[user_id][websocket] = connection
 
     def disconnect(
         self,
         user_id: UUID,
         websocket: WebSocket,
-    ) -> None:
+    ) -> set[UUID]:
+        """Returns rooms that no longer have online members on this instance."""
         connections = self._user_connections.get(user_id)
         if not connections:
-            return
+            return set()
 
-        connections.discard(websocket)
+        connection = connections.pop(websocket, None)
+        if connection is not None:
+            connection.close()
 
         if not connections:
             del self._user_connections[user_id]
 
-        # также удаляем пользователя из всех комнат
-        for members in self._room_members.values():
-            members.discard(user_id)
+        # также удаляем пользователя из всех его комнат
+        return {
+            room_id
+            for room_id in self._user_rooms.pop(user_id, set())
+            if self._discard_room_member(room_id, user_id)
+        }
 
     # ---------- Room membership ----------
 
@@ -51,26 +100,47 @@ class ConnectionManager:
         *,
         room_id: UUID,
         user_id: UUID,
-    ) -> None:
-        if room_id not in self._room_members:
+    ) -> bool:
+        """Returns True if this is the first online member of the room on this instance."""
+        is_new_room = room_id not in self._room_members
+        if is_new_room:
             self._room_members[room_id] = set()
 
+        if user_id not in self._user_rooms:
+            self._user_rooms[user_id] = set()
+
         self._room_members[room_id].add(user_id)
+        self._user_rooms[user_id].add(room_id)
+
+        return is_new_room
 
     def leave_room(
         self,
         *,
         room_id: UUID,
         user_id: UUID,
-    ) -> None:
+    ) -> bool:
+        """Returns True if the room has no online members left on this instance."""
+        rooms = self._user_rooms.get(user_id)
+        if rooms is not None:
+            rooms.discard(room_id)
+            if not rooms:
+                del self._user_rooms[user_id]
+
+        return self._discard_room_member(room_id, user_id)
+
+    def _discard_room_member(self, room_id: UUID, user_id: UUID) -> bool:
         members = self._room_members.get(room_id)
         if not members:
-            return
+            return False
 
         members.discard(user_id)
 
         if not members:
             del self._room_members[room_id]
+            return True
+
+        return False
 
     # ---------- Messaging ----------
 
@@ -79,10 +149,25 @@ class ConnectionManager:
         *,
         user_id: UUID,
         message: dict,
-    ) -> None:
-        connections = self._user_connections.get(user_id, set())
-        for websocket in connections:
-            await websocket.send_json(message)
+    ) -> list[EnqueueResult]:
+        connections = list(self._user_connections.get(user_id, {}).values())
+        if not connections:
+            return []
+
+        return self._enqueue(connections, message)
+
+    async def send_to_connection(
+        self,
+        *,
+        user_id: UUID,
+        websocket: WebSocket,
+        message: dict,
+    ) -> list[EnqueueResult]:
+        connection = self._user_connections.get(user_id, {}).get(websocket)
+        if connection is None:
+            return []
+
+        return self._enqueue([connection], message)
 
     async def broadcast_to_room(
         self,
@@ -90,17 +175,57 @@ class ConnectionManager:
         room_id: UUID,
         message: dict,
         exclude_user_id: UUID | None = None,
-    ) -> None:
+    ) -> list[EnqueueResult]:
         members = self._room_members.get(room_id, set())
 
-        for user_id in members:
-            if exclude_user_id and user_id == exclude_user_id:
-                continue
+        connections = [
+            connection
+            for user_id in members
+            if not (exclude_user_id and user_id == exclude_user_id)
+            for connection in self._user_connections.get(user_id, {}).values()
+        ]
+
+        if not connections:
+            return []
 
-            await self.send_to_user(
-                user_id=user_id,
-                message=message,
+        return self._enqueue(connections, message)
+
+    def _enqueue(
+        self,
+        connections: list[Connection],
+        message: dict,
+    ) -> list[EnqueueResult]:
+        frame = self._to_frame(message)
+
+        return [
+            EnqueueResult(
+                connection.user_id,
+                connection.websocket,
+                connection.enqueue(frame),
             )
+            for connection in connections
+        ]
+
+    def _to_frame(self, message: dict) -> OutboundFrame:
+        data = self._encoder.encode(message)
+
+        if message.get("type") not in ("typing", "typing_stop"):
+            return OutboundFrame(data)
+
+        # объединённые кадры несут user_ids, а не user_id: ключ — только комната.
+        # typing и typing_stop делят один ключ, и в очереди остаётся последнее состояние
+        payload = message.get("payload", {})
+        return OutboundFrame(
+            data,
+            droppable=True,
+            coalesce_key=("typing", payload.get("room_id")),
+        )
+
+    async def drain(self) -> None:
+        """Waits until every outbound queue has been flushed to its socket."""
+        for connections in list(self._user_connections.values()):
+            for connection in list(connections.values()):
+                await connection.wait_idle()
 
     # ---------- Introspection ----------
 
@@ -111,8 +236,11 @@ class ConnectionManager:
         return self._room_members.get(room_id, set())
 
     def room_online_memberships(self, user_id: UUID) -> set[UUID]:
-        return {
-            room_id
-            for room_id, members in self._room_members.items()
-            if user_id in members
-        }
+        return set(self._user_rooms.get(user_id, set()))
+
+    def connection_stats(self) -> list[dict]:
+        return [
+            connection.stats()
+            for connections in self._user_connections.values()
+            for connection in connections.values()
+        ]
@@ -0,0 +1,63 @@
+"""
+One-off message retention run:
+
+    python -m app.interfaces.cli.retention [--archive-dir DIR] [--batch-size N]
+
+Uses MESSAGE_RETENTION_DAYS from settings unless --days is given.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from app.config.settings import settings
+from app.infrastructure.database.db import AsyncSessionLocal, engine
+from app.infrastructure.database.retention import MessageRetentionJob, retention_policies
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Archive and delete expired messages.")
+    parser.add_argument(
+        "--days",
+        type=json.loads,
+        default=None,
+        help='retention per room type as JSON, e.g. \'{"public": 365}\'',
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=Path,
+        default=Path(settings.message_retention_archive_dir),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.message_retention_batch_size,
+    )
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict[str, int]:
+    job = MessageRetentionJob(
+        AsyncSessionLocal,
+        policies=retention_policies(
+            args.days if args.days is not None else settings.message_retention_days
+        ),
+        archive_dir=args.archive_dir,
+        batch_size=args.batch_size,
+    )
+
+    try:
+        return await job.run_once()
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    archived = asyncio.run(run(parse_args(argv)))
+    print(json.dumps({"archived": archived}))
+
+
+if __name__ == "__main__":
+    main()
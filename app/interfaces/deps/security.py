@@ -0,0 +1,11 @@
+from app.application.security.jwt_service import JWTService
+from app.infrastructure.security.jwt_service import JoseJWTService
+from app.config.settings import settings
+
+
+# общий экземпляр для REST и WebSocket, чтобы кэш проверенных токенов жил между запросами
+_jwt_service = JoseJWTService(verified_cache_size=settings.jwt_verified_cache_size)
+
+
+def get_jwt_service() -> JWTService:
+    return _jwt_service
@@ -0,0 +1,58 @@
+import base64
+import math
+from datetime import datetime
+from uuid import UUID
+
+from app.domain.entities.message import Message
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MessageSearchHit
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> str:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode()
+
+
+def encode_message_cursor(message: Message) -> str:
+    return _encode(f"{message.created_at.isoformat()}|{message.id.value}")
+
+
+def decode_message_cursor(cursor: str) -> MessageCursor:
+    """Raises ValueError if the cursor was not produced by encode_message_cursor."""
+    try:
+        created_at_raw, message_id_raw = _decode(cursor).split("|")
+
+        return MessageCursor(
+            created_at=datetime.fromisoformat(created_at_raw),
+            message_id=UUID(message_id_raw),
+        )
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_search_cursor(hit: MessageSearchHit) -> str:
+    # repr сохраняет ранг без потерь: следующая страница сравнивает его точно
+    message = hit.message
+    return _encode(f"{hit.rank!r}|{message.created_at.isoformat()}|{message.id.value}")
+
+
+def decode_search_cursor(cursor: str) -> MessageSearchCursor:
+    """Raises ValueError if the cursor was not produced by encode_search_cursor."""
+    try:
+        rank_raw, created_at_raw, message_id_raw = _decode(cursor).split("|")
+        rank = float(rank_raw)
+        if not math.isfinite(rank):
+            raise ValueError("Invalid rank")
+
+        return MessageSearchCursor(
+            rank=rank,
+            created_at=datetime.fromisoformat(created_at_raw),
+            message_id=UUID(message_id_raw),
+        )
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -1,13 +1,63 @@
-from fastapi import Depends
+from datetime import datetime
+from typing import AsyncIterator, Callable
+
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.cache.recent_messages_cache import RecentMessagesCache
+from app.domain.entities.message import Message
 from app.domain.repositories.message_repository import MessageRepository
+from app.domain.value_objects.room_id import RoomId
 
+from app.infrastructure.cache.recent_messages_cache import CachedMessageRepository
 from app.infrastructure.database.repositories.message_repository import PostgresMessageRepository
-from app.infrastructure.database.db import get_db_session
+from app.infrastructure.database.db import AsyncSessionLocal, get_db_session
+
+from app.config.settings import settings
+
+
+def get_recent_messages_cache(request: Request) -> RecentMessagesCache | None:
+    # буфер создаётся в lifespan; без него история всегда читается из БД
+    return getattr(request.app.state, "recent_messages_cache", None)
 
 
 def get_message_repository(
     session: AsyncSession = Depends(get_db_session),
+    recent_messages: RecentMessagesCache | None = Depends(get_recent_messages_cache),
 ) -> MessageRepository:
-    return PostgresMessageRepository(session)
\ No newline at end of file
+    repository = PostgresMessageRepository(session)
+
+    if recent_messages is not None:
+        return CachedMessageRepository(
+            repository,
+            recent_messages,
+            capacity=settings.recent_messages_cache_capacity,
+        )
+
+    return repository
+
+
+MessageHistoryStream = Callable[..., AsyncIterator[Message]]
+
+
+async def _stream_room_history(
+    room_id: RoomId,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> AsyncIterator[Message]:
+    # своя сессия живёт ровно столько, сколько идёт выгрузка,
+    # а не столько, сколько живут зависимости запроса
+    async with AsyncSessionLocal() as session:
+        repository = PostgresMessageRepository(session)
+        async for message in repository.stream_room_history(
+            room_id,
+            since=since,
+            until=until,
+            batch_size=settings.message_export_batch_size,
+        ):
+            yield message
+
+
+def get_message_history_stream() -> MessageHistoryStream:
+    return _stream_room_history
@@ -1,11 +1,14 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.use_cases.room.create_room import CreateRoomUseCase
 from app.application.use_cases.room.join_room import JoinRoomUseCase
 from app.application.use_cases.room.leave_room import LeaveRoomUseCase
+from app.application.use_cases.room.check_room_membership import CheckRoomMembershipUseCase
 
 
+from app.application.cache.membership_cache import MembershipCache
+
 from app.domain.repositories.room_repository import RoomRepository
 
 from app.infrastructure.database.repositories.room_repository import PostgresRoomRepository
@@ -20,6 +23,11 @@ def get_room_repository(
     return PostgresRoomRepository(session)
 
 
+def get_membership_cache(request: Request) -> MembershipCache | None:
+    # кэш создаётся в lifespan; без него use cases работают напрямую с БД
+    return getattr(request.app.state, "membership_cache", None)
+
+
 def get_create_room_use_case(
     uow=Depends(get_uow),
     room_repository: RoomRepository = Depends(get_room_repository),
@@ -30,11 +38,31 @@ def get_create_room_use_case(
 def get_join_room_use_case(
     uow=Depends(get_uow),
     room_repository: RoomRepository = Depends(get_room_repository),
+    membership_cache: MembershipCache | None = Depends(get_membership_cache),
 ) -> JoinRoomUseCase:
-    return JoinRoomUseCase(uow=uow, room_repository=room_repository)
+    return JoinRoomUseCase(
+        uow=uow,
+        room_repository=room_repository,
+        membership_cache=membership_cache,
+    )
 
 def get_leave_room_use_case(
     uow=Depends(get_uow),
     room_repository: RoomRepository = Depends(get_room_repository),
+    membership_cache: MembershipCache | None = Depends(get_membership_cache),
 ) -> LeaveRoomUseCase:
-    return LeaveRoomUseCase(uow=uow, room_repository=room_repository)
+    return LeaveRoomUseCase(
+        uow=uow,
+        room_repository=room_repository,
+        membership_cache=membership_cache,
+    )
+
+
+def get_check_room_membership_use_case(
+    room_repository: RoomRepository = Depends(get_room_repository),
+    membership_cache: MembershipCache | None = Depends(get_membership_cache),
+) -> CheckRoomMembershipUseCase:
+    return CheckRoomMembershipUseCase(
+        room_repository=room_repository,
+        membership_cache=membership_cache,
+    )
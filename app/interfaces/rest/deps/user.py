@@ -1,39 +1,51 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID
 
-from app.domain.value_objects.user_id import UserId
 from app.infrastructure.database.db import get_db_session
 from app.infrastructure.database.repositories.user_repository import PostgresUserRepository
 from app.infrastructure.security.password_hasher import BCryptPasswordHasher
-from app.infrastructure.security.jwt_service import JoseJWTService
 from app.application.security.password_hasher import PasswordHasher
 from app.application.security.jwt_service import JWTService
+from app.application.security.authenticated_user import AuthenticatedUser
+from app.application.cache.identity_cache import IdentityCache
+from app.application.use_cases.user.authenticate_user import AuthenticateUserUseCase
+from app.application.exceptions import InactiveUserError, UserNotFoundError
 from app.infrastructure.security.jwt_service import JWTErrorInvalidToken
 from app.domain.repositories.user_repository import UserRepository
+from app.interfaces.deps.security import get_jwt_service
+from app.config.settings import settings
 
 
 async def get_user_repository(session: AsyncSession = Depends(get_db_session)):
     return PostgresUserRepository(session)
 
 
-def get_password_hasher() -> PasswordHasher:
-    return BCryptPasswordHasher()
+# один пул потоков на процесс: ограничение очереди имеет смысл только глобально
+_password_hasher = BCryptPasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
 
 
-def get_jwt_service() -> JWTService:
-    return JoseJWTService()
+def get_password_hasher() -> PasswordHasher:
+    return _password_hasher
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+def get_identity_cache(request: Request) -> IdentityCache | None:
+    return getattr(request.app.state, "identity_cache", None)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     jwt_service: JWTService = Depends(get_jwt_service),
     user_repo: UserRepository = Depends(get_user_repository),
-):
+    identity_cache: IdentityCache | None = Depends(get_identity_cache),
+) -> AuthenticatedUser:
     try:
         user_id: UUID = jwt_service.verify_access_token(token)
     except JWTErrorInvalidToken:
@@ -42,11 +54,16 @@ async def get_current_user(
             detail="Invalid or expired token",
         )
 
-    user = await user_repo.get_by_id(UserId(user_id))
-    if user is None or not user.is_active:
+    use_case = AuthenticateUserUseCase(
+        user_repository=user_repo,
+        identity_cache=identity_cache,
+    )
+
+    try:
+        return await use_case.execute(user_id)
+    except (UserNotFoundError, InactiveUserError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
-    return user
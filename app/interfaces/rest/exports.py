@@ -0,0 +1,50 @@
+import json
+import zlib
+from typing import AsyncIterator
+
+from app.domain.entities.message import Message
+
+
+def message_export_line(message: Message) -> bytes:
+    row = {
+        "id": str(message.id.value),
+        "room_id": str(message.room_id.value),
+        "sender_id": str(message.sender_id.value) if message.sender_id else None,
+        "content": message.content.value,
+        "message_type": message.message_type.value,
+        "created_at": message.created_at.isoformat(),
+    }
+    return json.dumps(row, ensure_ascii=False).encode() + b"\n"
+
+
+async def ndjson_export(
+    messages: AsyncIterator[Message],
+    *,
+    compress: bool = False,
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[bytes]:
+    """
+    Encodes messages as NDJSON and yields chunks of about `chunk_size` bytes.
+    With `compress` the output is a single gzip stream, compressed incrementally.
+    """
+    # wbits=31 — формат gzip (заголовок и CRC), а не голый zlib
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = bytearray()
+
+    async for message in messages:
+        buffer += message_export_line(message)
+        if len(buffer) < chunk_size:
+            continue
+
+        chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+        buffer.clear()
+        # компрессор может ещё копить данные у себя — пустые куски не отправляем
+        if chunk:
+            yield chunk
+
+    if compressor is None:
+        if buffer:
+            yield bytes(buffer)
+        return
+
+    yield compressor.compress(bytes(buffer)) + compressor.flush()
@@ -10,8 +10,8 @@ from app.interfaces.rest.schemas.auth_schema import (
 from app.interfaces.rest.deps.user import (
     get_user_repository,
     get_password_hasher,
-    get_jwt_service
 )
+from app.interfaces.deps.security import get_jwt_service
 from app.interfaces.rest.deps.common import get_uow
 
 from app.application.use_cases.user.register_user import RegisterUserUseCase
@@ -20,7 +20,7 @@ from app.application.use_cases.user.login_user import (
     InvalidCredentialsError,
     InactiveUserError,
 )
-from app.application.exceptions import EmailAlreadyExistsError
+from app.application.exceptions import EmailAlreadyExistsError, PasswordHasherBusyError
 from app.application.security.jwt_service import JWTService
 
 from app.infrastructure.security.jwt_service import JWTErrorInvalidToken
@@ -52,6 +52,12 @@ async def register(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already exists",
         )
+    except PasswordHasherBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
 
     return UserResponse(
         id=user.id.value,
@@ -90,6 +96,12 @@ async def login(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User is inactive",
         )
+    except PasswordHasherBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
 
     return TokenResponse(
         access_token=jwt_service.create_access_token(user.id.value),
@@ -1,23 +1,45 @@
+import html
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 
 from app.interfaces.rest.schemas.message_schema import (
     MessageListResponse,
     MessageResponse,
+    MessageSearchHitResponse,
+    MessageSearchResponse,
 )
 from app.interfaces.rest.deps.message import (
+    MessageHistoryStream,
+    get_message_history_stream,
     get_message_repository,
 )
 from app.interfaces.rest.deps.room import (
-    get_room_repository,
+    get_check_room_membership_use_case,
 )
 from app.interfaces.rest.deps.user import get_current_user
+from app.interfaces.rest.cursors import (
+    decode_message_cursor,
+    decode_search_cursor,
+    encode_message_cursor,
+    encode_search_cursor,
+)
+from app.interfaces.rest.exports import ndjson_export
 
-from app.domain.entities.user import User
+from app.application.security.authenticated_user import AuthenticatedUser
 from app.domain.value_objects.room_id import RoomId
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MATCH_START, MATCH_STOP, MessageSearchHit
+
+from app.application.use_cases.room.check_room_membership import CheckRoomMembershipUseCase
+
+from app.config.settings import settings
 
 
 router = APIRouter(prefix="/rooms", tags=["messages"])
+# поиск сразу по всем комнатам пользователя не привязан к одной комнате
+search_router = APIRouter(prefix="/messages", tags=["messages"])
 
 
 @router.get(
@@ -28,13 +50,34 @@ async def get_room_messages(
     room_id: UUID,
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    current_user: User = Depends(get_current_user),
+    before: str | None = Query(default=None),
+    after: str | None = Query(default=None),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     message_repository=Depends(get_message_repository),
-    room_repository=Depends(get_room_repository),
+    check_membership: CheckRoomMembershipUseCase = Depends(get_check_room_membership_use_case),
 ):
-    room = await room_repository.get_by_id(RoomId(room_id))
+    if before is not None and after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either before or after cursor",
+        )
+
+    try:
+        before_cursor = decode_message_cursor(before) if before else None
+        after_cursor = decode_message_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    # несуществующая комната и чужая комната неразличимы для клиента
+    is_member = await check_membership.execute(
+        room_id=room_id,
+        user_id=current_user.id.value,
+    )
 
-    if room is None or not room.is_member(current_user.id.value):
+    if not is_member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found",
@@ -44,7 +87,10 @@ async def get_room_messages(
         room_id=RoomId(room_id),
         limit=limit,
         offset=offset,
+        before=before_cursor,
+        after=after_cursor,
     )
+    messages = list(messages)
 
     return MessageListResponse(
         items=[
@@ -60,4 +106,160 @@ async def get_room_messages(
         ],
         limit=limit,
         offset=offset,
+        # неполная страница — дальше в прошлое сообщений нет
+        before=encode_message_cursor(messages[-1])
+        if len(messages) == limit
+        else None,
+        after=encode_message_cursor(messages[0]) if messages else after,
+    )
+
+
+@router.get("/{room_id}/messages/export")
+async def export_room_messages(
+    room_id: UUID,
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    gzip: bool = Query(default=False),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    stream_history: MessageHistoryStream = Depends(get_message_history_stream),
+    check_membership: CheckRoomMembershipUseCase = Depends(get_check_room_membership_use_case),
+):
+    # время без зоны считаем UTC, как и created_at сообщений
+    since = _as_utc(since)
+    until = _as_utc(until)
+
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since must be earlier than until",
+        )
+
+    is_member = await check_membership.execute(
+        room_id=room_id,
+        user_id=current_user.id.value,
+    )
+
+    if not is_member:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found",
+        )
+
+    # строки читаются и отправляются по мере готовности, память не растёт с размером комнаты
+    body = ndjson_export(
+        stream_history(RoomId(room_id), since=since, until=until),
+        compress=gzip,
+        chunk_size=settings.message_export_chunk_bytes,
+    )
+    filename = f"room-{room_id}.ndjson" + (".gz" if gzip else "")
+
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/{room_id}/messages/search",
+    response_model=MessageSearchResponse,
+)
+async def search_room_messages(
+    room_id: UUID,
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(default=20, ge=1, le=50),
+    cursor: str | None = Query(default=None),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    message_repository=Depends(get_message_repository),
+    check_membership: CheckRoomMembershipUseCase = Depends(get_check_room_membership_use_case),
+):
+    after = _decode_search_cursor(cursor)
+
+    is_member = await check_membership.execute(
+        room_id=room_id,
+        user_id=current_user.id.value,
+    )
+
+    if not is_member:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found",
+        )
+
+    hits = await message_repository.search(
+        q,
+        user_id=current_user.id.value,
+        room_id=RoomId(room_id),
+        limit=limit,
+        after=after,
+    )
+    return _search_response(hits, limit)
+
+
+@search_router.get(
+    "/search",
+    response_model=MessageSearchResponse,
+)
+async def search_messages(
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(default=20, ge=1, le=50),
+    cursor: str | None = Query(default=None),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    message_repository=Depends(get_message_repository),
+):
+    # членство проверяется внутри того же запроса к БД
+    hits = await message_repository.search(
+        q,
+        user_id=current_user.id.value,
+        limit=limit,
+        after=_decode_search_cursor(cursor),
     )
+    return _search_response(hits, limit)
+
+
+def _decode_search_cursor(cursor: str | None) -> MessageSearchCursor | None:
+    if cursor is None:
+        return None
+
+    try:
+        return decode_search_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _render_snippet(snippet: str) -> str:
+    # сначала экранируем пользовательский текст, потом вставляем свою разметку
+    return (
+        html.escape(snippet)
+        .replace(MATCH_START, "<mark>")
+        .replace(MATCH_STOP, "</mark>")
+    )
+
+
+def _search_response(hits: list[MessageSearchHit], limit: int) -> MessageSearchResponse:
+    return MessageSearchResponse(
+        items=[
+            MessageSearchHitResponse(
+                id=hit.message.id.value,
+                room_id=hit.message.room_id.value,
+                sender_id=hit.message.sender_id.value if hit.message.sender_id else None,
+                content=hit.message.content.value,
+                message_type=hit.message.message_type,
+                created_at=hit.message.created_at,
+                rank=hit.rank,
+                snippet=_render_snippet(hit.snippet),
+            )
+            for hit in hits
+        ],
+        limit=limit,
+        next_cursor=encode_search_cursor(hits[-1]) if len(hits) == limit else None,
+    )
+
+
+def _as_utc(moment: datetime | None) -> datetime | None:
+    if moment is None or moment.tzinfo is not None:
+        return moment
+    return moment.replace(tzinfo=timezone.utc)
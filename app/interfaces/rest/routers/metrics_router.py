@@ -0,0 +1,64 @@
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.infrastructure.database.db import engine
+from app.infrastructure.database.pool import pool_stats
+from app.interfaces.deps.security import get_jwt_service
+from app.interfaces.rest.deps.user import get_password_hasher
+from app.config.settings import settings
+
+
+router = APIRouter(tags=["metrics"])
+
+
+def _optional_stats(component) -> dict | None:
+    # компоненты, выключенные настройками, в state лежат как None
+    return component.stats() if component is not None else None
+
+
+def require_metrics_access(request: Request) -> None:
+    # внутренности пула, шины и кэшей не для публики: без токена эндпоинта как будто нет
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    expected = f"Bearer {settings.metrics_token}"
+    provided = request.headers.get("Authorization", "")
+    if not secrets.compare_digest(provided.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+        )
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_access)])
+async def get_metrics(request: Request):
+    state = request.app.state
+    manager = getattr(state, "ws_manager", None)
+
+    ws_stats = None
+    if manager is not None:
+        connections = manager.connection_stats()
+        ws_stats = {
+            "connections": len(connections),
+            "queued_frames": sum(c["queue_depth"] for c in connections),
+            "dropped_frames": sum(c["dropped"] for c in connections),
+            "send_timeouts": sum(c["send_timeouts"] for c in connections),
+        }
+
+    redis_bus = getattr(state, "redis_bus", None)
+
+    return {
+        "db_pool": pool_stats(engine.pool),
+        "websocket": ws_stats,
+        "event_bus": redis_bus.publish_stats() if redis_bus is not None else None,
+        "event_listener": _optional_stats(getattr(state, "event_listener", None)),
+        "typing_coalescer": _optional_stats(getattr(state, "typing_coalescer", None)),
+        "retention": _optional_stats(getattr(state, "retention_job", None)),
+        "message_writer": _optional_stats(getattr(state, "message_writer", None)),
+        "membership_cache": _optional_stats(getattr(state, "membership_cache", None)),
+        "recent_messages_cache": _optional_stats(getattr(state, "recent_messages_cache", None)),
+        "identity_cache": _optional_stats(getattr(state, "identity_cache", None)),
+        "jwt_cache": get_jwt_service().cache_stats(),
+        "password_hasher": get_password_hasher().stats(),
+    }
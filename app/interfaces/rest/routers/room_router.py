@@ -13,7 +13,7 @@ from app.interfaces.rest.deps.room import (
 )
 from app.interfaces.rest.deps.user import get_current_user
 
-from app.domain.entities.user import User
+from app.application.security.authenticated_user import AuthenticatedUser
 from app.domain.value_objects.room_id import RoomId
 
 from app.application.use_cases.room.create_room import CreateRoomUseCase
@@ -38,7 +38,7 @@ router = APIRouter(prefix="/rooms", tags=["rooms"])
 )
 async def create_room(
     data: CreateRoomRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     use_case: CreateRoomUseCase = Depends(get_create_room_use_case),
 ):
     try:
@@ -75,7 +75,7 @@ async def create_room(
 )
 async def join_room(
     room_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     use_case: JoinRoomUseCase = Depends(get_join_room_use_case),
 ):
     try:
@@ -101,9 +101,10 @@ async def join_room(
 )
 async def get_room(
     room_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     room_repository=Depends(get_room_repository),
 ):
+    # комната всё равно загружается целиком — членство проверяем по ней же, без отдельного запроса
     room = await room_repository.get_by_id(room_id=RoomId(room_id))
 
     if room is None or not room.is_member(current_user.id.value):
@@ -128,7 +129,7 @@ async def get_room(
 )
 async def leave_room(
     room_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     use_case: LeaveRoomUseCase = Depends(get_leave_room_use_case),
 ):
     try:
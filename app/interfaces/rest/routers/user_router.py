@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 
 from app.interfaces.rest.deps.user import get_current_user
-from app.domain.entities.user import User
+from app.application.security.authenticated_user import AuthenticatedUser
 from app.interfaces.rest.schemas.auth_schema import UserResponse
 
 
@@ -9,7 +9,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: AuthenticatedUser = Depends(get_current_user)):
     return UserResponse(
         id=current_user.id.value,
         email=current_user.email.value,
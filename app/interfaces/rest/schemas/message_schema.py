@@ -20,3 +20,20 @@ class MessageListResponse(BaseModel):
     items: List[MessageResponse]
     limit: int
     offset: int
+    # курсор для следующей страницы в прошлое (None — старше сообщений нет)
+    before: str | None = None
+    # курсор для подгрузки сообщений, пришедших после этой страницы
+    after: str | None = None
+
+
+class MessageSearchHitResponse(MessageResponse):
+    rank: float
+    # HTML: текст сообщения экранирован, совпадения обёрнуты в <mark>…</mark>
+    snippet: str
+
+
+class MessageSearchResponse(BaseModel):
+    items: List[MessageSearchHitResponse]
+    limit: int
+    # курсор следующей страницы (None — результатов больше нет)
+    next_cursor: str | None = None
@@ -1,8 +1,10 @@
 from fastapi import WebSocket, WebSocketException, status
 from uuid import UUID
 
-from app.infrastructure.security.jwt_service import JoseJWTService
+from app.interfaces.deps.security import get_jwt_service
 from app.domain.value_objects.user_id import UserId
+from app.application.use_cases.user.authenticate_user import AuthenticateUserUseCase
+from app.application.exceptions import InactiveUserError, UserNotFoundError
 from app.infrastructure.database.repositories.user_repository import (
     PostgresUserRepository,
 )
@@ -24,7 +26,7 @@ async def get_current_user_ws(
             reason="Missing token",
         )
 
-    jwt_service = JoseJWTService()
+    jwt_service = get_jwt_service()
 
     try:
         user_id: UUID = jwt_service.verify_access_token(token)
@@ -40,15 +42,21 @@ async def get_current_user_ws(
             reason="Invalid token payload",
         )
 
-    # проверка, что пользователь реально существует
-    async with AsyncSessionLocal() as session:
-        repo = PostgresUserRepository(session)
-        user = await repo.get_by_id(UserId(user_id))
+    # проверка, что пользователь реально существует (сессия не трогает БД при попадании в кэш)
+    identity_cache = getattr(websocket.app.state, "identity_cache", None)
 
-    if user is None or not user.is_active:
-        raise WebSocketException(
-            code=status.WS_1008_POLICY_VIOLATION,
-            reason="User not found or inactive",
+    async with AsyncSessionLocal() as session:
+        use_case = AuthenticateUserUseCase(
+            user_repository=PostgresUserRepository(session),
+            identity_cache=identity_cache,
         )
 
+        try:
+            user = await use_case.execute(user_id)
+        except (UserNotFoundError, InactiveUserError):
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason="User not found or inactive",
+            )
+
     return user.id
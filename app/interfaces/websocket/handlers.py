@@ -1,14 +1,30 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.domain.value_objects.room_id import RoomId
 from app.domain.value_objects.user_id import UserId
+from app.domain.entities.message import Message
 
 from app.application.use_cases.message.create_user_message import CreateUserMessageUseCase
 from app.application.use_cases.message.create_system_message import CreateSystemMessageUseCase
+from app.application.use_cases.message.create_system_messages import CreateSystemMessagesUseCase
+from app.application.use_cases.room.check_room_membership import CheckRoomMembershipUseCase
 from app.application.messaging.event_bus import EventBus
+from app.application.cache.membership_cache import MembershipCache
+from app.application.cache.recent_messages_cache import RecentMessagesCache
+from app.application.messaging.channels import room_channel
+from app.application.uow.unit_of_work import UnitOfWork
 
 from app.infrastructure.database.db import AsyncSessionLocal
+from app.infrastructure.messaging.typing_coalescer import TypingCoalescer
 from app.infrastructure.database.uow.sqlalchemy_uow import SQLAlchemyUnitOfWork
+from app.infrastructure.database.message_writer import (
+    BatchedMessageWriter,
+    WriteBehindMessageRepository,
+)
 from app.infrastructure.database.repositories.message_repository import (
     PostgresMessageRepository,
 )
@@ -16,6 +32,83 @@ from app.infrastructure.database.repositories.room_repository import (
     PostgresRoomRepository,
 )
 
+from app.interfaces.websocket.session_scope import ConnectionSessionScope
+
+
+@asynccontextmanager
+async def _persistence(
+    scope: ConnectionSessionScope | None,
+) -> AsyncIterator[tuple[AsyncSession, UnitOfWork]]:
+    # без scope — отдельная сессия и транзакция на событие
+    if scope is None:
+        async with AsyncSessionLocal() as session:
+            yield session, SQLAlchemyUnitOfWork(session)
+        return
+
+    yield await scope.session(), await scope.unit_of_work()
+
+
+async def _publish(
+    event_bus: EventBus,
+    event: dict,
+    scope: ConnectionSessionScope | None,
+) -> None:
+    # в общей транзакции событие нельзя отдавать до коммита
+    if scope is None:
+        await event_bus.publish(event)
+    else:
+        scope.publish_after_commit(event)
+
+
+async def _publish_many(
+    event_bus: EventBus,
+    events: list[dict],
+    scope: ConnectionSessionScope | None,
+) -> None:
+    if scope is None:
+        await event_bus.publish_many(events)
+    else:
+        for event in events:
+            scope.publish_after_commit(event)
+
+
+async def _remember(
+    recent_messages: RecentMessagesCache | None,
+    messages: list[Message],
+    scope: ConnectionSessionScope | None,
+) -> None:
+    # буфер свежей истории пополняется только закоммиченными сообщениями
+    if recent_messages is None:
+        return
+
+    if scope is None:
+        await recent_messages.append(messages)
+    else:
+        scope.after_commit(lambda: recent_messages.append(messages))
+
+
+async def _replay(
+    event_bus: EventBus,
+    manager,
+    *,
+    user_id: UserId,
+    websocket,
+    room_id: RoomId,
+    since: str,
+    limit: int,
+) -> None:
+    try:
+        events = await event_bus.replay(room_id.value, since, limit=limit)
+    except ValueError:
+        return
+
+    for event in events:
+        await manager.send_to_connection(
+            user_id=user_id.value,
+            websocket=websocket,
+            message=event["message"],
+        )
+
 
 async def handle_join_room(
     *,
@@ -23,20 +116,54 @@ async def handle_join_room(
     manager,
     user_id: UserId,
     payload: dict,
+    scope: ConnectionSessionScope | None = None,
+    websocket=None,
+    replay_limit: int = 1000,
+    recent_messages: RecentMessagesCache | None = None,
+    membership_cache: MembershipCache | None = None,
 ) -> None:
     room_id_raw = payload.get("room_id")
     if not room_id_raw:
         return
 
     room_id = RoomId(UUID(room_id_raw))
-    manager.join_room(
+
+    # догон отдаёт сохранённую историю комнаты — только её участникам
+    since = payload.get("since")
+    if since:
+        async with _persistence(scope) as (session, _):
+            is_member = await CheckRoomMembershipUseCase(
+                room_repository=PostgresRoomRepository(session),
+                membership_cache=membership_cache,
+            ).execute(room_id=room_id.value, user_id=user_id.value)
+
+        if not is_member:
+            return
+
+    is_first_local_member = manager.join_room(
         room_id=room_id.value,
         user_id=user_id.value,
     )
 
+    # инстанс слушает канал комнаты, только пока в ней есть локальные участники
+    if is_first_local_member:
+        await event_bus.subscribe_room(room_id.value)
+
+    # переподключившийся клиент догоняет пропущенное с последнего увиденного stream_id;
+    # доставка at-least-once, дубликаты клиент отбрасывает по stream_id
+    if since and websocket is not None:
+        await _replay(
+            event_bus,
+            manager,
+            user_id=user_id,
+            websocket=websocket,
+            room_id=room_id,
+            since=since,
+            limit=replay_limit,
+        )
+
     # SYSTEM message: user joined
-    async with AsyncSessionLocal() as session:
-        uow = SQLAlchemyUnitOfWork(session)
+    async with _persistence(scope) as (session, uow):
         message_repo = PostgresMessageRepository(session)
 
         use_case = CreateSystemMessageUseCase(
@@ -49,8 +176,9 @@ async def handle_join_room(
             content=f"User {user_id.value} joined the room",
         )
 
-    await event_bus.publish({
-        "channel": "ws_events",
+    await _remember(recent_messages, [message], scope)
+    await _publish(event_bus, {
+        "channel": room_channel(room_id.value),
         "message": {
             "type": "system_message",
             "payload": {
@@ -60,42 +188,49 @@ async def handle_join_room(
                 "created_at": message.created_at.isoformat(),
             },
         },
-    })
+    }, scope)
 
 
 async def handle_leave_room(
     *,
     event_bus: EventBus,
     manager,
-    user_id: UserId
+    user_id: UserId,
+    scope: ConnectionSessionScope | None = None,
+    recent_messages: RecentMessagesCache | None = None,
 ) -> None:
-    for room_id in manager.room_online_memberships(user_id.value):
-        async with AsyncSessionLocal() as session:
-            uow = SQLAlchemyUnitOfWork(session)
-            message_repo = PostgresMessageRepository(session)
+    room_ids = manager.room_online_memberships(user_id.value)
+    if not room_ids:
+        return
 
-            use_case = CreateSystemMessageUseCase(
-                uow=uow,
-                message_repository=message_repo,
-            )
+    # одна транзакция и один pipeline в Redis на все комнаты пользователя
+    async with _persistence(scope) as (session, uow):
+        use_case = CreateSystemMessagesUseCase(
+            uow=uow,
+            message_repository=PostgresMessageRepository(session),
+        )
 
-            message = await use_case.execute(
-                room_id=RoomId(room_id),
-                content=f"User {user_id.value} left the room",
-            )
+        messages = await use_case.execute(
+            room_ids=[RoomId(room_id) for room_id in room_ids],
+            content=f"User {user_id.value} left the room",
+        )
 
-        await event_bus.publish({
-            "channel": "ws_events",
+    await _remember(recent_messages, messages, scope)
+    await _publish_many(event_bus, [
+        {
+            "channel": room_channel(message.room_id.value),
             "message": {
                 "type": "system_message",
                 "payload": {
                     "id": str(message.id.value),
-                    "room_id": str(room_id),
+                    "room_id": str(message.room_id.value),
                     "content": message.content.value,
                     "created_at": message.created_at.isoformat(),
                 },
             },
-        })
+        }
+        for message in messages
+    ], scope)
 
 
 async def handle_send_message(
@@ -103,6 +238,10 @@ async def handle_send_message(
     event_bus: EventBus,
     user_id: UserId,
     payload: dict,
+    message_writer: BatchedMessageWriter | None = None,
+    membership_cache: MembershipCache | None = None,
+    scope: ConnectionSessionScope | None = None,
+    recent_messages: RecentMessagesCache | None = None,
 ) -> None:
     room_id_raw = payload.get("room_id")
     content = payload.get("content")
@@ -112,16 +251,19 @@ async def handle_send_message(
 
     room_id = RoomId(UUID(room_id_raw))
 
-    async with AsyncSessionLocal() as session:
-        uow = SQLAlchemyUnitOfWork(session)
-
+    async with _persistence(scope) as (session, uow):
         message_repo = PostgresMessageRepository(session)
         room_repo = PostgresRoomRepository(session)
 
+        # сообщение уходит в батч фонового писателя, а не в текущую транзакцию
+        if message_writer is not None:
+            message_repo = WriteBehindMessageRepository(message_writer, message_repo)
+
         use_case = CreateUserMessageUseCase(
             uow=uow,
             message_repository=message_repo,
             room_repository=room_repo,
+            membership_cache=membership_cache,
         )
 
         message = await use_case.execute(
@@ -130,8 +272,11 @@ async def handle_send_message(
             content=content,
         )
 
-    await event_bus.publish({
-        "channel": "ws_events",
+    # при write-behind буфер пополняет сам писатель — после того, как строка записана
+    if message_writer is None:
+        await _remember(recent_messages, [message], scope)
+    await _publish(event_bus, {
+        "channel": room_channel(message.room_id.value),
         "message": {
             "type": "new_message",
             "payload": {
@@ -142,7 +287,7 @@ async def handle_send_message(
                 "created_at": message.created_at.isoformat(),
             },
         },
-    })
+    }, scope)
 
 
 async def handle_typing(
@@ -150,6 +295,7 @@ async def handle_typing(
     event_bus: EventBus,
     user_id: UserId,
     payload: dict,
+    typing_coalescer: TypingCoalescer | None = None,
 ) -> None:
     room_id_raw = payload.get("room_id")
     if not room_id_raw:
@@ -157,8 +303,13 @@ async def handle_typing(
 
     room_id = UUID(room_id_raw)
 
+    # с коалесцером кадр на каждое нажатие не уходит в Redis: он публикует не чаще окна
+    if typing_coalescer is not None:
+        typing_coalescer.typing(room_id, user_id.value)
+        return
+
     await event_bus.publish({
-        "channel": "ws_events",
+        "channel": room_channel(room_id),
         "message": {
             "type": "typing",
             "payload": {
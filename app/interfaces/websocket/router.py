@@ -1,3 +1,4 @@
+import asyncio
 import json
 from uuid import UUID
 
@@ -5,13 +6,42 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.interfaces.websocket.auth import get_current_user_ws
 from app.interfaces.websocket.handlers import handle_join_room, handle_typing, handle_send_message, handle_leave_room
+from app.interfaces.websocket.session_scope import ConnectionSessionScope
 
 from app.domain.value_objects.user_id import UserId
+from app.infrastructure.database.db import AsyncSessionLocal
+from app.config.settings import settings
 
 
 router = APIRouter()
 
 
+async def _read_frames(websocket: WebSocket, frames: asyncio.Queue) -> None:
+    # читатель складывает кадры в очередь, чтобы обработчик видел, что пришло пачкой
+    try:
+        while True:
+            await frames.put(await websocket.receive_text())
+    except Exception as exc:
+        await frames.put(exc)
+
+
+async def _next_batch(frames: asyncio.Queue, max_frames: int) -> list[str]:
+    item = await frames.get()
+    if isinstance(item, Exception):
+        raise item
+
+    batch = [item]
+    while len(batch) < max_frames and not frames.empty():
+        item = frames.get_nowait()
+        if isinstance(item, Exception):
+            # разрыв обработаем следующей итерацией, после пришедших до него кадров
+            frames.put_nowait(item)
+            break
+        batch.append(item)
+
+    return batch
+
+
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     # 1. WS auth
@@ -22,49 +52,132 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(user_id.value, websocket)
 
     event_bus = websocket.app.state.redis_bus
+    message_writer = getattr(websocket.app.state, "message_writer", None)
+    membership_cache = getattr(websocket.app.state, "membership_cache", None)
+    typing_coalescer = getattr(websocket.app.state, "typing_coalescer", None)
+    recent_messages = getattr(websocket.app.state, "recent_messages_cache", None)
+
+    # сессия БД живёт, пока есть необработанные кадры, а не всё время соединения
+    scope = ConnectionSessionScope(AsyncSessionLocal, event_bus)
+    # ограниченная очередь сохраняет backpressure: читатель не убегает вперёд обработки
+    frames: asyncio.Queue = asyncio.Queue(maxsize=settings.ws_max_frames_per_transaction)
+    reader = asyncio.create_task(_read_frames(websocket, frames))
 
     try:
         while True:
-            raw_data = await websocket.receive_text()
-            data = json.loads(raw_data)
-
-            event_type = data.get("type")
-            payload = data.get("payload", {})
-
-            if event_type == "join_room":
-                await handle_join_room(
-                    event_bus=event_bus,
-                    manager=manager,
-                    user_id=user_id,
-                    payload=payload,
-                )
-
-            elif event_type == "send_message":
-                await handle_send_message(
-                    event_bus=event_bus,
-                    user_id=user_id,
-                    payload=payload,
-                )
-
-            elif event_type == "typing":
-                await handle_typing(
-                    event_bus=event_bus,
-                    user_id=user_id,
-                    payload=payload,
-                )
-
-            else:
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "payload": {"message": "Unknown event type"},
-                    }
-                )
+            batch = await _next_batch(frames, settings.ws_max_frames_per_transaction)
+            scope.begin_batch(len(batch))
+
+            error: BaseException | None = None
+            for raw_data in batch:
+                scope.begin_frame()
+                try:
+                    await _dispatch(
+                        websocket,
+                        raw_data,
+                        event_bus=event_bus,
+                        manager=manager,
+                        user_id=user_id,
+                        scope=scope,
+                        message_writer=message_writer,
+                        membership_cache=membership_cache,
+                        typing_coalescer=typing_coalescer,
+                        recent_messages=recent_messages,
+                    )
+                except BaseException as exc:
+                    # откатывается только упавший кадр, предыдущие кадры пачки фиксируются ниже
+                    await scope.discard_frame()
+                    error = exc
+                    break
+                await scope.end_frame()
+
+            try:
+                await scope.commit()
+            except BaseException:
+                if error is None:
+                    raise
+                await scope.close()
+
+            if error is not None:
+                raise error
 
     except WebSocketDisconnect:
-        await handle_leave_room(
+        pass
+    finally:
+        reader.cancel()
+        await scope.close()
+        # сокет мог быть закрыт и сервером (вытеснение медленного клиента),
+        # поэтому очистка выполняется при любом выходе из цикла
+        try:
+            await handle_leave_room(
+                event_bus=event_bus,
+                manager=manager,
+                user_id=user_id,
+                recent_messages=recent_messages,
+            )
+        finally:
+            inactive_rooms = manager.disconnect(user_id.value, websocket)
+            for room_id in inactive_rooms:
+                await event_bus.unsubscribe_room(room_id)
+
+
+async def _dispatch(
+    websocket: WebSocket,
+    raw_data: str,
+    *,
+    event_bus,
+    manager,
+    user_id: UserId,
+    scope: ConnectionSessionScope,
+    message_writer,
+    membership_cache,
+    typing_coalescer,
+    recent_messages,
+) -> None:
+    data = json.loads(raw_data)
+
+    event_type = data.get("type")
+    payload = data.get("payload", {})
+
+    if event_type == "join_room":
+        await handle_join_room(
             event_bus=event_bus,
             manager=manager,
             user_id=user_id,
+            payload=payload,
+            scope=scope,
+            websocket=websocket,
+            replay_limit=settings.event_stream_replay_limit,
+            recent_messages=recent_messages,
+            membership_cache=membership_cache,
+        )
+
+    elif event_type == "send_message":
+        await handle_send_message(
+            event_bus=event_bus,
+            user_id=user_id,
+            payload=payload,
+            message_writer=message_writer,
+            membership_cache=membership_cache,
+            scope=scope,
+            recent_messages=recent_messages,
+        )
+
+    elif event_type == "typing":
+        await handle_typing(
+            event_bus=event_bus,
+            user_id=user_id,
+            payload=payload,
+            typing_coalescer=typing_coalescer,
+        )
+
+    else:
+        # ответ идёт через очередь соединения, чтобы не писать в сокет параллельно с writer'ом
+        await manager.send_to_connection(
+            user_id=user_id.value,
+            websocket=websocket,
+            message={
+                "type": "error",
+                "payload": {"message": "Unknown event type"},
+            },
         )
-        manager.disconnect(user_id.value, websocket)
@@ -0,0 +1,128 @@
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction, async_sessionmaker
+
+from app.application.messaging.event_bus import EventBus
+from app.application.uow.unit_of_work import UnitOfWork
+
+
+class ConnectionSessionScope:
+    """
+    Persistence context of one WebSocket connection.
+    A session is checked out lazily when a frame needs the database and is
+    released by commit(), so an idle connection holds no pool slot. Frames
+    handled between two commits share one transaction, and their events are
+    published only after that commit. A failed frame is discarded on its own:
+    in a batch of several frames each frame that touches the database runs in
+    its own savepoint, while a single frame runs in the plain transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        event_bus: EventBus,
+    ) -> None:
+        self._session_factory = session_factory
+        self._event_bus = event_bus
+        self._session: AsyncSession | None = None
+        self._pending_events: list[dict] = []
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+        self._frames_in_batch = 1
+        self._in_frame = False
+        self._frame_savepoint: AsyncSessionTransaction | None = None
+        self._frame_marks = (0, 0)
+
+    def begin_batch(self, frames: int) -> None:
+        """Declares how many frames will share the next transaction."""
+        self._frames_in_batch = frames
+
+    def begin_frame(self) -> None:
+        self._in_frame = True
+        self._frame_marks = (len(self._pending_events), len(self._after_commit))
+
+    async def end_frame(self) -> None:
+        """Keeps the frame's work in the shared transaction."""
+        self._in_frame = False
+        if self._frame_savepoint is not None:
+            savepoint, self._frame_savepoint = self._frame_savepoint, None
+            await savepoint.commit()
+
+    async def discard_frame(self) -> None:
+        """Rolls back the current frame's writes and drops its events; earlier frames stay."""
+        self._in_frame = False
+        events_mark, callbacks_mark = self._frame_marks
+        del self._pending_events[events_mark:]
+        del self._after_commit[callbacks_mark:]
+
+        if self._frame_savepoint is not None:
+            savepoint, self._frame_savepoint = self._frame_savepoint, None
+            await savepoint.rollback()
+        elif self._session is not None and self._frames_in_batch == 1:
+            # кадр в пачке один — транзакция целиком его
+            await self._session.rollback()
+
+    async def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_factory()
+
+        # SAVEPOINT/RELEASE — лишние round-trip'ы, нужны только чтобы кадры пачки не мешали друг другу
+        if self._in_frame and self._frames_in_batch > 1 and self._frame_savepoint is None:
+            self._frame_savepoint = await self._session.begin_nested()
+
+        return self._session
+
+    async def unit_of_work(self) -> UnitOfWork:
+        await self.session()
+        return _FrameUnitOfWork(self)
+
+    def publish_after_commit(self, event: dict) -> None:
+        self._pending_events.append(event)
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Runs `callback` once the shared transaction is committed, before publishing."""
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        """Commits the shared transaction, releases the session, publishes events."""
+        events, self._pending_events = self._pending_events, []
+        callbacks, self._after_commit = self._after_commit, []
+
+        if self._session is not None:
+            session, self._session = self._session, None
+            try:
+                await session.commit()
+            finally:
+                await session.close()
+
+        for callback in callbacks:
+            await callback()
+
+        if events:
+            await self._event_bus.publish_many(events)
+
+    async def close(self) -> None:
+        """Drops uncommitted work without publishing it."""
+        self._pending_events.clear()
+        self._after_commit.clear()
+        self._in_frame = False
+        self._frame_savepoint = None
+
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+
+class _FrameUnitOfWork(UnitOfWork):
+    """
+    Unit of work of one frame inside the connection's shared transaction.
+    commit() is a no-op, the scope commits; rollback() discards only this frame.
+    """
+
+    def __init__(self, scope: ConnectionSessionScope):
+        self._scope = scope
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        await self._scope.discard_frame()
@@ -1,46 +1,227 @@
 from fastapi import FastAPI
 import asyncio
+from pathlib import Path
+import redis.asyncio as redis
 from contextlib import asynccontextmanager
 
 from app.infrastructure.websocket.manager import ConnectionManager
+from app.infrastructure.websocket.connection import OverflowPolicy
+from app.infrastructure.websocket.encoders import get_json_encoder
 from app.infrastructure.messaging.redis_event_bus import RedisEventBus
-from app.infrastructure.messaging.handlers import WebSocketEventHandler
+from app.infrastructure.messaging.redis_stream_event_bus import RedisStreamEventBus
+from app.infrastructure.messaging.codecs import get_event_codec
+from app.infrastructure.messaging.handlers import ControlEventHandler, WebSocketEventHandler
+from app.infrastructure.messaging.listener import SupervisedListener, as_batches
+from app.infrastructure.messaging.typing_coalescer import TypingCoalescer
+from app.infrastructure.cache.membership_cache import InMemoryMembershipCache
+from app.infrastructure.cache.identity_cache import (
+    InMemoryIdentityCache,
+    RedisIdentityCache,
+    TieredIdentityCache,
+)
+from app.infrastructure.cache.recent_messages_cache import (
+    InMemoryRecentMessagesCache,
+    RedisRecentMessagesCache,
+    TieredRecentMessagesCache,
+)
+from app.infrastructure.database.db import AsyncSessionLocal
+from app.infrastructure.database.message_writer import BatchedMessageWriter
+from app.infrastructure.database.partitions import MessagePartitionMaintainer
+from app.infrastructure.database.retention import MessageRetentionJob, retention_policies
 
 from app.interfaces.rest.routers.auth_router import router as auth_router
 from app.interfaces.rest.routers.user_router import router as user_router
 from app.interfaces.rest.routers.room_router import router as room_router
 from app.interfaces.rest.routers.message_router import router as message_router
+from app.interfaces.rest.routers.message_router import search_router as message_search_router
+from app.interfaces.rest.routers.metrics_router import router as metrics_router
 from app.interfaces.websocket.router import router as ws_router
+from app.interfaces.rest.deps.user import get_password_hasher
 
 
-from app.config.settings import settings
-
+from app.application.messaging.channels import CONTROL_CHANNEL
 
-async def listen_redis(redis_bus: RedisEventBus, handler: WebSocketEventHandler):
-    async for event in redis_bus.subscribe("ws_events"):
-        await handler.handle(event['message'])
+from app.config.settings import settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    manager = ConnectionManager()
+    manager = ConnectionManager(
+        max_concurrent_sends=settings.ws_max_concurrent_sends,
+        send_timeout=settings.ws_send_timeout_seconds,
+        encoder=get_json_encoder(settings.ws_json_encoder),
+        max_queue_size=settings.ws_send_queue_size,
+        overflow_policy=OverflowPolicy(settings.ws_queue_overflow_policy),
+        slow_consumer_close_code=settings.ws_slow_consumer_close_code,
+    )
     handler = WebSocketEventHandler(manager)
-    redis_bus = RedisEventBus(redis_url=settings.redis_url)
+    if settings.event_bus_backend == "streams":
+        redis_bus = RedisStreamEventBus(
+            redis_url=settings.redis_url,
+            max_len=settings.event_stream_max_len,
+            read_count=settings.event_stream_read_count,
+            block_ms=settings.event_stream_block_ms,
+            ttl_seconds=settings.event_stream_ttl_seconds,
+            codec=get_event_codec(settings.redis_event_codec),
+        )
+    else:
+        redis_bus = RedisEventBus(
+            redis_url=settings.redis_url,
+            publish_flush_interval=settings.redis_publish_flush_interval_ms / 1000
+            if settings.redis_publish_batching_enabled
+            else None,
+            publish_batch_size=settings.redis_publish_batch_size,
+            codec=get_event_codec(settings.redis_event_codec),
+        )
 
     await redis_bus.init()
 
+    # партиции messages на ближайшие месяцы создаются заранее, до первых вставок в них
+    partition_maintainer = MessagePartitionMaintainer(
+        AsyncSessionLocal,
+        months_ahead=settings.message_partitions_months_ahead,
+        check_interval=settings.message_partitions_check_interval_seconds,
+    )
+    await partition_maintainer.start()
+
+    retention_job = None
+    if settings.message_retention_enabled and settings.message_retention_days:
+        retention_job = MessageRetentionJob(
+            AsyncSessionLocal,
+            policies=retention_policies(settings.message_retention_days),
+            archive_dir=Path(settings.message_retention_archive_dir),
+            batch_size=settings.message_retention_batch_size,
+            interval=settings.message_retention_interval_seconds,
+        )
+        await retention_job.start()
+
+    typing_coalescer = None
+    if settings.typing_coalescing_enabled:
+        typing_coalescer = TypingCoalescer(
+            redis_bus,
+            window=settings.typing_window_ms / 1000,
+            flush_interval=settings.typing_flush_interval_ms / 1000,
+            stop_after=settings.typing_stop_after_ms / 1000,
+        )
+        await typing_coalescer.start()
+
+    membership_cache = None
+    if settings.membership_cache_enabled:
+        membership_cache = InMemoryMembershipCache(
+            max_entries=settings.membership_cache_max_entries,
+            ttl_seconds=settings.membership_cache_ttl_seconds,
+            event_bus=redis_bus,
+        )
+
+    # отдельные клиенты Redis кэшей; закрываются при остановке
+    cache_redis_clients = []
+
+    recent_messages_cache = None
+    if settings.recent_messages_cache_enabled:
+        recent_messages_cache = InMemoryRecentMessagesCache(
+            capacity=settings.recent_messages_cache_capacity,
+            ttl_seconds=settings.recent_messages_cache_ttl_seconds,
+            idle_seconds=settings.recent_messages_cache_idle_seconds,
+            max_bytes=settings.recent_messages_cache_max_bytes,
+        )
+        if settings.recent_messages_cache_redis_enabled:
+            cache_redis_clients.append(redis.from_url(settings.redis_url))
+            recent_messages_cache = TieredRecentMessagesCache(
+                recent_messages_cache,
+                RedisRecentMessagesCache(
+                    cache_redis_clients[-1],
+                    capacity=settings.recent_messages_cache_capacity,
+                    ttl_seconds=settings.recent_messages_cache_redis_ttl_seconds,
+                ),
+            )
+
+    message_writer = None
+    if settings.message_write_behind_enabled:
+        message_writer = BatchedMessageWriter(
+            AsyncSessionLocal,
+            max_batch_size=settings.message_write_batch_size,
+            flush_interval=settings.message_write_flush_interval_ms / 1000,
+            # в буфер свежей истории попадают только реально записанные сообщения
+            on_flushed=recent_messages_cache.append if recent_messages_cache is not None else None,
+        )
+        await message_writer.start()
+
+    identity_cache = None
+    if settings.identity_cache_enabled:
+        identity_cache = InMemoryIdentityCache(
+            max_entries=settings.identity_cache_max_entries,
+            ttl_seconds=settings.identity_cache_ttl_seconds,
+            event_bus=redis_bus,
+        )
+        if settings.identity_cache_redis_enabled:
+            cache_redis_clients.append(redis.from_url(settings.redis_url))
+            identity_cache = TieredIdentityCache(
+                identity_cache,
+                RedisIdentityCache(
+                    cache_redis_clients[-1],
+                    ttl_seconds=settings.identity_cache_redis_ttl_seconds,
+                ),
+            )
+
     # сохраняем в state
     app.state.ws_manager = manager
     app.state.ws_event_handler = handler
     app.state.redis_bus = redis_bus
-
-
-    task = asyncio.create_task(listen_redis(redis_bus, handler))
+    app.state.message_writer = message_writer
+    app.state.retention_job = retention_job
+    app.state.typing_coalescer = typing_coalescer
+    app.state.membership_cache = membership_cache
+    app.state.recent_messages_cache = recent_messages_cache
+    app.state.identity_cache = identity_cache
+
+
+    # listener-ы переживают обрывы Redis: переподключаются с backoff и восстанавливают подписки
+    listener_options = dict(
+        initial_backoff=settings.event_listener_initial_backoff_seconds,
+        max_backoff=settings.event_listener_max_backoff_seconds,
+    )
+    event_listener = SupervisedListener(
+        lambda: redis_bus.listen_batches(settings.event_listener_batch_size),
+        handler.handle,
+        name="room events",
+        reconnect=redis_bus.reconnect,
+        **listener_options,
+    )
+    app.state.event_listener = event_listener
+
+    tasks = [asyncio.create_task(event_listener.run())]
+    if membership_cache is not None or identity_cache is not None:
+        control_handler = ControlEventHandler(
+            membership_cache=membership_cache,
+            identity_cache=identity_cache,
+        )
+        control_listener = SupervisedListener(
+            lambda: as_batches(redis_bus.subscribe(CONTROL_CHANNEL)),
+            control_handler.handle,
+            name="control events",
+            **listener_options,
+        )
+        tasks.append(asyncio.create_task(control_listener.run()))
 
     try:
         yield
     finally:
-        task.cancel()
+        for task in tasks:
+            task.cancel()
+        get_password_hasher().shutdown()
+        await partition_maintainer.stop()
+        if retention_job is not None:
+            await retention_job.stop()
+        if typing_coalescer is not None:
+            await typing_coalescer.stop()
+        # последние события (например, уведомления о выходе) не должны потеряться в буфере
+        await redis_bus.close()
+        # дописываем в БД всё, что ещё лежит в буфере
+        if message_writer is not None:
+            await message_writer.stop()
+        # после писателя: его последний батч ещё дописывается в буфер истории
+        for client in cache_redis_clients:
+            await client.aclose()
 
 
 def create_app() -> FastAPI:
@@ -50,7 +231,9 @@ def create_app() -> FastAPI:
     app.include_router(user_router)
     app.include_router(room_router)
     app.include_router(message_router)
+    app.include_router(message_search_router)
     app.include_router(ws_router)
+    app.include_router(metrics_router)
 
 
     return app
@@ -0,0 +1,49 @@
+import time
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock
+
+from app.infrastructure.websocket.manager import ConnectionManager
+
+
+USERS = 300
+ROOMS_PER_USER = 5
+
+
+async def measure_reconnect_storm(total_rooms: int) -> float:
+    """
+    Time spent on join / membership lookup / disconnect for USERS users
+    while the manager already tracks `total_rooms` unrelated live rooms.
+    """
+    manager = ConnectionManager()
+
+    for _ in range(total_rooms):
+        manager.join_room(room_id=uuid4(), user_id=uuid4())
+
+    users = []
+    for _ in range(USERS):
+        user_id = uuid4()
+        websocket = AsyncMock()
+        await manager.connect(user_id=user_id, websocket=websocket)
+        users.append((user_id, websocket, [uuid4() for _ in range(ROOMS_PER_USER)]))
+
+    started = time.perf_counter()
+
+    for user_id, websocket, rooms in users:
+        for room_id in rooms:
+            manager.join_room(room_id=room_id, user_id=user_id)
+        assert len(manager.room_online_memberships(user_id)) == ROOMS_PER_USER
+        manager.disconnect(user_id=user_id, websocket=websocket)
+
+    return time.perf_counter() - started
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cost_does_not_grow_with_live_rooms():
+    small = min([await measure_reconnect_storm(100) for _ in range(3)])
+    large = min([await measure_reconnect_storm(50_000) for _ in range(3)])
+
+    print(f"\n100 rooms: {small * 1000:.2f} ms, 50k rooms: {large * 1000:.2f} ms")
+
+    # при линейном проходе по всем комнатам разница была бы ~500x
+    assert large < small * 5 + 0.01
@@ -0,0 +1,64 @@
+import time
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.infrastructure.messaging.codecs import decode_event, get_event_codec
+
+
+EVENTS = 2_000
+
+
+def make_events() -> list[dict]:
+    events = []
+    for _ in range(EVENTS):
+        room_id = uuid4()
+        events.append({
+            "channel": f"ws_events:room:{room_id}",
+            "message": {
+                "type": "new_message",
+                "payload": {
+                    "id": str(uuid4()),
+                    "room_id": str(room_id),
+                    "sender_id": str(uuid4()),
+                    "content": "see you at 7",
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                },
+            },
+        })
+    return events
+
+
+def measure(codec_name: str, events: list[dict]) -> tuple[float, float, float]:
+    codec = get_event_codec(codec_name)
+
+    started = time.perf_counter()
+    encoded = [codec.encode(event) for event in events]
+    encode_s = time.perf_counter() - started
+
+    frames = [e.encode() if isinstance(e, str) else e for e in encoded]
+
+    started = time.perf_counter()
+    for frame in frames:
+        decode_event(frame)
+    decode_s = time.perf_counter() - started
+
+    bytes_per_event = sum(len(frame) for frame in frames) / len(frames)
+    return bytes_per_event, encode_s, decode_s
+
+
+def test_msgpack_codec_is_more_compact_than_json():
+    pytest.importorskip("msgpack")
+    events = make_events()
+
+    for name in ("json", "msgpack"):
+        size, encode_s, decode_s = measure(name, events)
+        print(
+            f"\n{name}: {size:.0f} bytes/event, "
+            f"encode {encode_s / EVENTS * 1e6:.1f} us, decode {decode_s / EVENTS * 1e6:.1f} us"
+        )
+
+    json_size = measure("json", events)[0]
+    msgpack_size = measure("msgpack", events)[0]
+
+    assert msgpack_size < json_size * 0.8
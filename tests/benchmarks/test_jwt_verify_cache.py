@@ -0,0 +1,31 @@
+import time
+from uuid import uuid4
+
+from app.infrastructure.security.jwt_service import JoseJWTService
+
+
+ITERATIONS = 2_000
+
+
+def measure_verifications(service: JoseJWTService, token: str) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        service.verify_access_token(token)
+    return time.perf_counter() - started
+
+
+def test_cached_verification_is_faster_than_cold():
+    cold_service = JoseJWTService()
+    cached_service = JoseJWTService(verified_cache_size=1_000)
+
+    token = cold_service.create_access_token(uuid4())
+
+    cold = min(measure_verifications(cold_service, token) for _ in range(3))
+    cached = min(measure_verifications(cached_service, token) for _ in range(3))
+
+    print(
+        f"\ncold: {ITERATIONS / cold:,.0f} verifications/s, "
+        f"cached: {ITERATIONS / cached:,.0f} verifications/s"
+    )
+
+    assert cached * 5 < cold
@@ -1,9 +1,14 @@
 import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 from app.domain.entities.message import Message
 from app.domain.enums.message_type import MessageType
 from app.domain.value_objects.message_id import MessageId
 from app.domain.value_objects.message_content import MessageContent
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MATCH_START, MATCH_STOP
 from app.domain.value_objects.room_id import RoomId
 from app.domain.value_objects.user_id import UserId
 
@@ -122,3 +127,177 @@ async def test_system_message_persistence(
     assert msg.message_type == MessageType.SYSTEM
     assert msg.sender_id is None
     assert msg.content.value == "User joined"
+
+
+@pytest.mark.asyncio
+async def test_message_history_keyset_pagination(
+    db_session,
+    uow,
+    message_repository,
+    room
+):
+    sender_id = UserId(room.owner_id)
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    messages = [
+        Message(
+            message_id=MessageId(),
+            room_id=RoomId(room.id.value),
+            sender_id=sender_id,
+            content=MessageContent(f"msg {i}"),
+            created_at=started + timedelta(seconds=i),
+        )
+        for i in range(5)
+    ]
+
+    async with uow:
+        for msg in messages:
+            await message_repository.add(msg)
+
+    first_page = await message_repository.get_room_history(
+        room_id=RoomId(room.id.value),
+        limit=3,
+    )
+    assert [m.content.value for m in first_page] == ["msg 4", "msg 3", "msg 2"]
+
+    older = await message_repository.get_room_history(
+        room_id=RoomId(room.id.value),
+        limit=3,
+        before=MessageCursor(first_page[-1].created_at, first_page[-1].id.value),
+    )
+    assert [m.content.value for m in older] == ["msg 1", "msg 0"]
+
+    newer = await message_repository.get_room_history(
+        room_id=RoomId(room.id.value),
+        limit=2,
+        after=MessageCursor(older[0].created_at, older[0].id.value),
+    )
+    # страница «после курсора» тоже отдаётся от новых к старым
+    assert [m.content.value for m in newer] == ["msg 3", "msg 2"]
+
+
+@pytest.mark.asyncio
+async def test_add_many_inserts_all_messages(
+    db_session,
+    uow,
+    message_repository,
+    room
+):
+    messages = [
+        Message.system(room_id=RoomId(room.id.value), content=f"notice {i}")
+        for i in range(3)
+    ]
+
+    async with uow:
+        await message_repository.add_many(messages)
+
+    history = await message_repository.get_room_history(
+        room_id=RoomId(room.id.value),
+        limit=10,
+    )
+
+    assert {m.content.value for m in history} == {"notice 0", "notice 1", "notice 2"}
+
+
+@pytest.mark.asyncio
+async def test_history_reaches_messages_older_than_recent_partitions(
+    db_session,
+    uow,
+    message_repository,
+    room
+):
+    now = datetime.now(timezone.utc)
+    # одно свежее сообщение и одно старше всех окон — попадёт в старую или DEFAULT-партицию
+    messages = [
+        Message(
+            message_id=MessageId(),
+            room_id=RoomId(room.id.value),
+            sender_id=UserId(room.owner_id),
+            content=MessageContent(text),
+            created_at=created_at,
+        )
+        for text, created_at in (("old", now - timedelta(days=400)), ("new", now))
+    ]
+
+    async with uow:
+        await message_repository.add_many(messages)
+
+    history = await message_repository.get_room_history(
+        room_id=RoomId(room.id.value),
+        limit=10,
+    )
+
+    assert [m.content.value for m in history] == ["new", "old"]
+
+
+@pytest.mark.asyncio
+async def test_stream_room_history_returns_range_oldest_first(
+    db_session,
+    uow,
+    message_repository,
+    room
+):
+    now = datetime.now(timezone.utc)
+    messages = [
+        Message(
+            message_id=MessageId(),
+            room_id=RoomId(room.id.value),
+            sender_id=UserId(room.owner_id),
+            content=MessageContent(f"m{days}"),
+            created_at=now - timedelta(days=days),
+        )
+        for days in (1, 40, 400)
+    ]
+
+    async with uow:
+        await message_repository.add_many(messages)
+
+    exported = [
+        message.content.value
+        async for message in message_repository.stream_room_history(
+            RoomId(room.id.value),
+            since=now - timedelta(days=500),
+            until=now - timedelta(hours=1),
+            batch_size=2,
+        )
+    ]
+
+    assert exported == ["m400", "m40", "m1"]
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_matches_and_skips_foreign_rooms(
+    db_session,
+    uow,
+    message_repository,
+    room
+):
+    messages = [
+        Message(
+            message_id=MessageId(),
+            room_id=RoomId(room.id.value),
+            sender_id=UserId(room.owner_id),
+            content=MessageContent(text),
+        )
+        for text in ("deploy deploy tonight", "deploy later", "lunch?")
+    ]
+
+    async with uow:
+        await message_repository.add_many(messages)
+
+    hits = await message_repository.search(
+        "deploy",
+        user_id=room.owner_id,
+        room_id=RoomId(room.id.value),
+        limit=1,
+    )
+
+    assert [hit.message.content.value for hit in hits] == ["deploy deploy tonight"]
+    assert f"{MATCH_START}deploy{MATCH_STOP}" in hits[0].snippet
+
+    cursor = MessageSearchCursor(hits[0].rank, hits[0].message.created_at, hits[0].message.id.value)
+    next_page = await message_repository.search("deploy", user_id=room.owner_id, limit=10, after=cursor)
+    assert [hit.message.content.value for hit in next_page] == ["deploy later"]
+
+    # не участник комнаты ничего не находит
+    assert await message_repository.search("deploy", user_id=uuid4(), limit=10) == []
@@ -114,3 +114,34 @@ async def test_get_nonexistent_room_returns_none(room_repository):
     result = await room_repository.get_by_id(RoomId())
 
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_membership_point_and_batch_lookup(room_repository, uow):
+    owner_id = uuid4()
+    outsider_id = uuid4()
+
+    rooms = [
+        Room(
+            room_id=RoomId(),
+            name=RoomName(f"Membership room {i}"),
+            owner_id=owner_id,
+            room_type=RoomType.PUBLIC,
+        )
+        for i in range(2)
+    ]
+
+    async with uow:
+        for room in rooms:
+            await room_repository.add(room)
+
+    assert await room_repository.is_member(rooms[0].id, owner_id) is True
+    assert await room_repository.is_member(rooms[0].id, outsider_id) is False
+    assert await room_repository.exists(rooms[0].id) is True
+    assert await room_repository.exists(RoomId()) is False
+
+    member_rooms = await room_repository.get_member_room_ids(
+        [rooms[0].id, rooms[1].id, RoomId()],
+        owner_id,
+    )
+    assert member_rooms == {rooms[0].id.value, rooms[1].id.value}
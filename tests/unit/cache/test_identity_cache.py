@@ -0,0 +1,100 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from app.application.security.authenticated_user import AuthenticatedUser
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.user_id import UserId
+from app.infrastructure.cache.identity_cache import (
+    IDENTITY_INVALIDATED,
+    InMemoryIdentityCache,
+    RedisIdentityCache,
+    TieredIdentityCache,
+)
+from app.infrastructure.messaging.handlers import ControlEventHandler
+
+
+def make_identity(is_active: bool = True) -> AuthenticatedUser:
+    return AuthenticatedUser(
+        user_id=UserId(),
+        email=Email("cached@example.com"),
+        is_active=is_active,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.mark.asyncio
+async def test_size_bound_evicts_least_recent():
+    cache = InMemoryIdentityCache(max_entries=1)
+    first, second = make_identity(), make_identity()
+
+    await cache.set(first)
+    await cache.set(second)
+
+    assert await cache.get(first.id.value) is None
+    assert await cache.get(second.id.value) is second
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_fills_local_cache():
+    redis = FakeRedis()
+    identity = make_identity()
+
+    await RedisIdentityCache(redis).set(identity)
+
+    local = InMemoryIdentityCache()
+    tiered = TieredIdentityCache(local, RedisIdentityCache(redis))
+
+    cached = await tiered.get(identity.id.value)
+
+    assert cached.email == identity.email
+    assert cached.created_at == identity.created_at
+    assert await local.get(identity.id.value) is not None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_shared_tier_and_other_nodes():
+    redis = FakeRedis()
+    event_bus = AsyncMock()
+    identity = make_identity()
+
+    tiered = TieredIdentityCache(
+        InMemoryIdentityCache(event_bus=event_bus),
+        RedisIdentityCache(redis),
+    )
+    await tiered.set(identity)
+
+    await tiered.invalidate(identity.id.value)
+
+    assert redis.data == {}
+    event = event_bus.publish.call_args.args[0]
+    assert event["message"]["type"] == IDENTITY_INVALIDATED
+
+
+@pytest.mark.asyncio
+async def test_control_event_drops_local_identity():
+    cache = InMemoryIdentityCache()
+    identity = make_identity()
+    await cache.set(identity)
+
+    await ControlEventHandler(identity_cache=cache).handle({
+        "type": IDENTITY_INVALIDATED,
+        "payload": {"user_id": str(identity.id.value)},
+    })
+
+    assert await cache.get(identity.id.value) is None
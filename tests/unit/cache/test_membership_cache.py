@@ -0,0 +1,89 @@
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock
+
+from app.application.messaging.channels import CONTROL_CHANNEL
+from app.infrastructure.cache.membership_cache import (
+    InMemoryMembershipCache,
+    MEMBERSHIP_INVALIDATED,
+)
+from app.infrastructure.messaging.handlers import ControlEventHandler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_miss_then_hit_is_counted():
+    cache = InMemoryMembershipCache()
+    room_id, user_id = uuid4(), uuid4()
+
+    assert cache.get(room_id, user_id) is None
+    cache.set(room_id, user_id, True)
+    assert cache.get(room_id, user_id) is True
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache = InMemoryMembershipCache(ttl_seconds=10, clock=clock)
+    room_id, user_id = uuid4(), uuid4()
+
+    cache.set(room_id, user_id, False)
+    clock.now = 9.9
+    assert cache.get(room_id, user_id) is False
+
+    clock.now = 10.0
+    assert cache.get(room_id, user_id) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = InMemoryMembershipCache(max_entries=2)
+    room_id = uuid4()
+    first, second, third = uuid4(), uuid4(), uuid4()
+
+    cache.set(room_id, first, True)
+    cache.set(room_id, second, True)
+    cache.get(room_id, first)  # first становится «свежим»
+    cache.set(room_id, third, True)
+
+    assert cache.get(room_id, second) is None
+    assert cache.get(room_id, first) is True
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_entry_and_notifies_other_nodes():
+    event_bus = AsyncMock()
+    cache = InMemoryMembershipCache(event_bus=event_bus)
+    room_id, user_id = uuid4(), uuid4()
+    cache.set(room_id, user_id, True)
+
+    await cache.invalidate(room_id, user_id)
+
+    assert cache.get(room_id, user_id) is None
+    event = event_bus.publish.call_args.args[0]
+    assert event["channel"] == CONTROL_CHANNEL
+    assert event["message"]["type"] == MEMBERSHIP_INVALIDATED
+
+
+@pytest.mark.asyncio
+async def test_control_event_invalidates_local_entry():
+    cache = InMemoryMembershipCache()
+    room_id, user_id = uuid4(), uuid4()
+    cache.set(room_id, user_id, True)
+
+    await ControlEventHandler(cache).handle({
+        "type": MEMBERSHIP_INVALIDATED,
+        "payload": {"room_id": str(room_id), "user_id": str(user_id)},
+    })
+
+    assert cache.get(room_id, user_id) is None
@@ -0,0 +1,227 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+from app.domain.entities.message import Message
+from app.domain.repositories.message_repository import MessageRepository
+from app.domain.value_objects.message_content import MessageContent
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_id import MessageId
+from app.domain.value_objects.room_id import RoomId
+from app.domain.value_objects.user_id import UserId
+
+from app.infrastructure.cache.recent_messages_cache import (
+    CachedMessageRepository,
+    InMemoryRecentMessagesCache,
+    RedisRecentMessagesCache,
+    _encode_message,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def make_messages(room_id: RoomId, count: int, start: int = 0) -> list[Message]:
+    """Newest-first, like the repository returns them."""
+    return [
+        Message(
+            message_id=MessageId(),
+            room_id=room_id,
+            sender_id=UserId(),
+            content=MessageContent(f"msg-{i}"),
+            created_at=_START + timedelta(seconds=i),
+        )
+        for i in reversed(range(start, start + count))
+    ]
+
+
+def contents(messages) -> list[str]:
+    return [message.content.value for message in messages]
+
+
+@pytest.mark.asyncio
+async def test_first_page_is_served_from_buffer_after_load():
+    room_id = RoomId()
+    cache = InMemoryRecentMessagesCache(capacity=10)
+
+    assert await cache.get(room_id.value, 5) is None
+
+    await cache.load(room_id.value, make_messages(room_id, 10), complete=False)
+
+    assert contents(await cache.get(room_id.value, 3)) == ["msg-9", "msg-8", "msg-7"]
+    # буфер неполной истории не отвечает на страницу длиннее себя
+    assert await cache.get(room_id.value, 11) is None
+
+
+@pytest.mark.asyncio
+async def test_append_keeps_ring_buffer_bounded_and_ordered():
+    room_id = RoomId()
+    cache = InMemoryRecentMessagesCache(capacity=3)
+
+    await cache.load(room_id.value, make_messages(room_id, 2), complete=True)
+    await cache.append(reversed(make_messages(room_id, 2, start=2)))
+
+    assert contents(await cache.get(room_id.value, 3)) == ["msg-3", "msg-2", "msg-1"]
+    # самое старое вытеснено — история больше не полная
+    assert await cache.get(room_id.value, 4) is None
+
+    # незагруженная комната не заполняется дописыванием
+    other = RoomId()
+    await cache.append(make_messages(other, 1))
+    assert await cache.get(other.value, 1) is None
+
+
+@pytest.mark.asyncio
+async def test_complete_history_answers_longer_pages():
+    room_id = RoomId()
+    cache = InMemoryRecentMessagesCache(capacity=10)
+
+    await cache.load(room_id.value, [], complete=True)
+    assert await cache.get(room_id.value, 50) == []
+
+    await cache.append(make_messages(room_id, 1))
+    assert contents(await cache.get(room_id.value, 50)) == ["msg-0"]
+
+
+@pytest.mark.asyncio
+async def test_buffers_expire_by_ttl_and_idle_time():
+    clock = FakeClock()
+    cache = InMemoryRecentMessagesCache(ttl_seconds=10, idle_seconds=3, clock=clock)
+    room_id = RoomId()
+
+    await cache.load(room_id.value, make_messages(room_id, 5), complete=True)
+
+    clock.now += 2
+    assert await cache.get(room_id.value, 5) is not None
+    clock.now += 4
+    assert await cache.get(room_id.value, 5) is None
+
+    await cache.load(room_id.value, make_messages(room_id, 5), complete=True)
+    for _ in range(5):
+        clock.now += 2.5
+        result = await cache.get(room_id.value, 5)
+    # каждое чтение продлевает простой, но не срок жизни загрузки
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_memory_budget_evicts_least_recently_read_rooms():
+    first, second, third = RoomId(), RoomId(), RoomId()
+    one_room_bytes = sum(len(m.content.value) + 600 for m in make_messages(first, 5))
+    cache = InMemoryRecentMessagesCache(max_bytes=one_room_bytes * 2)
+
+    await cache.load(first.value, make_messages(first, 5), complete=True)
+    await cache.load(second.value, make_messages(second, 5), complete=True)
+    await cache.get(first.value, 5)
+    await cache.load(third.value, make_messages(third, 5), complete=True)
+
+    assert await cache.get(second.value, 5) is None
+    assert await cache.get(first.value, 5) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] <= one_room_bytes * 2
+
+
+@pytest.mark.asyncio
+async def test_cached_repository_reads_database_once_per_buffer():
+    room_id = RoomId()
+    read_repository = AsyncMock(spec=MessageRepository)
+    read_repository.get_room_history.return_value = make_messages(room_id, 20)
+    repository = CachedMessageRepository(
+        read_repository,
+        InMemoryRecentMessagesCache(capacity=100),
+        capacity=100,
+    )
+
+    first = await repository.get_room_history(room_id, limit=5)
+    second = await repository.get_room_history(room_id, limit=20)
+
+    assert contents(first) == contents(second)[:5]
+    read_repository.get_room_history.assert_awaited_once_with(room_id, limit=100)
+
+    # страницы по курсору всегда идут в БД
+    cursor = MessageCursor(created_at=_START, message_id=MessageId().value)
+    await repository.get_room_history(room_id, limit=5, before=cursor)
+    assert read_repository.get_room_history.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_append_skips_messages_already_loaded():
+    room_id = RoomId()
+    cache = InMemoryRecentMessagesCache(capacity=10)
+    messages = make_messages(room_id, 3)
+
+    # буфер перечитан из БД после коммита, а append того же коммита пришёл позже
+    await cache.load(room_id.value, messages, complete=True)
+    await cache.append([messages[0]])
+
+    assert contents(await cache.get(room_id.value, 10)) == ["msg-2", "msg-1", "msg-0"]
+
+
+def make_redis():
+    redis = Mock()
+    redis.pipeline.return_value = pipe = Mock()
+    pipe.execute = AsyncMock()
+    redis.register_script.return_value = script = AsyncMock()
+    redis.zrevrange = AsyncMock()
+    return redis, pipe, script
+
+
+@pytest.mark.asyncio
+async def test_mirror_load_merges_instead_of_replacing():
+    room_id = RoomId()
+    redis, pipe, _ = make_redis()
+    cache = RedisRecentMessagesCache(redis, capacity=10, ttl_seconds=60)
+    messages = make_messages(room_id, 3)
+
+    await cache.load(room_id.value, messages, complete=True)
+
+    # DELETE перед записью стёр бы сообщения, добавленные append'ом другого узла
+    pipe.delete.assert_not_called()
+    (key, items), _ = pipe.zadd.call_args
+    assert items[_encode_message(messages[0])] == messages[0].created_at.timestamp()
+    assert items[RedisRecentMessagesCache._HISTORY_START] == float("-inf")
+    pipe.zremrangebyrank.assert_called_once_with(key, 0, -11)
+    pipe.pexpire.assert_called_once_with(key, 60_000)
+
+
+@pytest.mark.asyncio
+async def test_mirror_append_does_not_extend_ttl():
+    room_id = RoomId()
+    redis, pipe, script = make_redis()
+    cache = RedisRecentMessagesCache(redis, capacity=10)
+    (message,) = make_messages(room_id, 1)
+
+    await cache.append([message])
+
+    script.assert_awaited_once_with(
+        keys=[f"recent_messages:room:{room_id.value}"],
+        args=[10, message.created_at.timestamp(), _encode_message(message)],
+        client=pipe,
+    )
+    pipe.pexpire.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_mirror_get_orders_by_position_and_sees_history_start():
+    room_id = RoomId()
+    redis, _, _ = make_redis()
+    cache = RedisRecentMessagesCache(redis, capacity=10)
+    newer, older = make_messages(room_id, 2)
+    redis.zrevrange.return_value = [
+        _encode_message(older).encode(),
+        _encode_message(newer).encode(),
+        RedisRecentMessagesCache._HISTORY_START,
+    ]
+
+    assert contents(await cache.get(room_id.value, 5)) == ["msg-1", "msg-0"]
+
+    redis.zrevrange.return_value = [_encode_message(newer).encode()]
+    assert await cache.get(room_id.value, 5) is None
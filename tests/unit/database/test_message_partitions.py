@@ -0,0 +1,175 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_id import MessageId
+from app.domain.value_objects.room_id import RoomId
+
+from app.infrastructure.database.partitions import (
+    add_months,
+    create_message_partition_sql,
+    drop_message_partitions_before,
+    ensure_message_partitions,
+    message_partition_name,
+    parse_message_partition_name,
+)
+from app.infrastructure.database.repositories.message_repository import PostgresMessageRepository
+
+
+def test_month_arithmetic_and_names():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    assert message_partition_name(date(2026, 3, 1)) == "messages_p2026_03"
+    assert parse_message_partition_name("messages_p2026_03") == date(2026, 3, 1)
+    assert parse_message_partition_name("messages_default") is None
+
+    assert create_message_partition_sql(date(2026, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS messages_p2026_12 PARTITION OF messages "
+        "FOR VALUES FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')"
+    )
+
+
+def fake_session(partition_names: list[str]):
+    session = AsyncMock()
+    executed = []
+
+    async def execute(stmt, params=None):
+        executed.append(str(stmt))
+        result = Mock()
+        result.scalars.return_value = iter(partition_names)
+        return result
+
+    session.execute.side_effect = execute
+    return session, executed
+
+
+@pytest.mark.asyncio
+async def test_ensure_creates_only_missing_future_partitions():
+    session, executed = fake_session(["messages_p2026_10", "messages_default"])
+
+    created = await ensure_message_partitions(
+        session,
+        months_ahead=2,
+        now=datetime(2026, 10, 18, tzinfo=timezone.utc),
+    )
+
+    assert created == ["messages_p2026_11", "messages_p2026_12"]
+    assert sum("CREATE TABLE" in sql for sql in executed) == 2
+    assert session.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_drop_before_keeps_partitions_overlapping_cutoff():
+    session, executed = fake_session(
+        ["messages_p2026_01", "messages_p2026_02", "messages_p2026_03", "messages_default"],
+    )
+
+    dropped = await drop_message_partitions_before(
+        session,
+        datetime(2026, 3, 1, 12, tzinfo=timezone.utc),
+    )
+
+    assert dropped == ["messages_p2026_01", "messages_p2026_02"]
+    assert not any("messages_default" in sql for sql in executed)
+    # каждый DROP в своей транзакции и с ограничением ожидания блокировки
+    assert sum("SET LOCAL lock_timeout" in sql for sql in executed) == 2
+    assert session.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_drop_skips_partition_when_lock_times_out():
+    session, executed = fake_session(["messages_p2026_01", "messages_p2026_02"])
+    execute = session.execute.side_effect
+
+    async def execute_with_busy_partition(stmt, params=None):
+        if "DROP TABLE IF EXISTS messages_p2026_01" in str(stmt):
+            raise DBAPIError("DROP", {}, Exception("canceling statement due to lock timeout"))
+        return await execute(stmt, params)
+
+    session.execute.side_effect = execute_with_busy_partition
+
+    dropped = await drop_message_partitions_before(
+        session,
+        datetime(2026, 3, 1, tzinfo=timezone.utc),
+    )
+
+    assert dropped == ["messages_p2026_02"]
+    session.rollback.assert_awaited_once()
+
+
+def history_repository(page_sizes: list[int]):
+    """Repository whose session returns `page_sizes[i]` rows for the i-th query."""
+    session = AsyncMock()
+    statements = []
+
+    async def execute(stmt):
+        statements.append(stmt.compile(dialect=postgresql.dialect()))
+        result = Mock()
+        result.scalars.return_value.all.return_value = [
+            Mock(
+                id=MessageId().value,
+                room_id=RoomId().value,
+                sender_id=None,
+                content="hi",
+                message_type="system",
+                created_at=datetime.now(timezone.utc),
+            )
+            for _ in range(page_sizes[len(statements) - 1])
+        ]
+        return result
+
+    session.execute.side_effect = execute
+    return PostgresMessageRepository(session), statements
+
+
+@pytest.mark.asyncio
+async def test_history_reads_recent_window_first():
+    repository, statements = history_repository([10])
+
+    messages = await repository.get_room_history(RoomId(), limit=10)
+
+    assert len(messages) == 10
+    assert len(statements) == 1
+    # простое условие на created_at позволяет отсечь старые партиции
+    assert "messages.created_at >= " in str(statements[0])
+
+
+@pytest.mark.asyncio
+async def test_history_falls_back_to_one_unbounded_query():
+    repository, statements = history_repository([2, 7])
+    before = MessageCursor(
+        created_at=datetime(2026, 6, 1, tzinfo=timezone.utc),
+        message_id=MessageId().value,
+    )
+
+    messages = await repository.get_room_history(RoomId(), limit=10, before=before)
+
+    assert len(messages) == 7
+    assert len(statements) == 2
+
+    floors = [
+        {value for value in statement.params.values() if isinstance(value, datetime)}
+        for statement in statements
+    ]
+    assert before.created_at - timedelta(days=31) in floors[0]
+    assert floors[1] == {before.created_at}
+
+    last = statements[-1]
+    # верхняя граница курсора тоже дублируется простым условием
+    assert "messages.created_at <= " in str(last)
+
+
+@pytest.mark.asyncio
+async def test_small_room_costs_at_most_two_queries():
+    # в комнате всего три сообщения: ни окно, ни полный запрос страницу не наполнят
+    repository, statements = history_repository([3, 3])
+
+    messages = await repository.get_room_history(RoomId(), limit=50)
+
+    assert len(messages) == 3
+    assert len(statements) == 2
@@ -0,0 +1,150 @@
+import gzip
+import json
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from app.domain.enums.message_type import MessageType
+from app.domain.enums.room_type import RoomType
+
+from app.infrastructure.database.retention import (
+    MessageRetentionJob,
+    append_archive_batch,
+    retention_policies,
+)
+from app.interfaces.cli.retention import parse_args
+
+
+NOW = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+
+
+class FakeSession:
+    def __init__(self, log: list):
+        self._log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        self._log.append(("execute", str(stmt).split()[0]))
+
+    async def commit(self):
+        self._log.append(("commit",))
+
+
+def make_rows(count: int) -> list[Mock]:
+    return [
+        Mock(
+            id=uuid4(),
+            room_id=uuid4(),
+            sender_id=None,
+            content=f"old-{i}",
+            message_type=MessageType.SYSTEM,
+            created_at=NOW - timedelta(days=400),
+        )
+        for i in range(count)
+    ]
+
+
+def read_archive(path) -> list[dict]:
+    with gzip.open(path, "rt") as archive:
+        return [json.loads(line) for line in archive]
+
+
+def test_archive_batches_are_appended_as_gzip_members(tmp_path):
+    path = tmp_path / "nested" / "archive.jsonl.gz"
+
+    append_archive_batch(path, [{"n": 1}, {"n": 2}])
+    append_archive_batch(path, [{"n": 3}])
+
+    assert read_archive(path) == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+
+@pytest.mark.asyncio
+async def test_expired_rows_are_archived_then_deleted_in_batches(tmp_path):
+    log = []
+    job = MessageRetentionJob(
+        lambda: FakeSession(log),
+        policies={RoomType.PUBLIC: timedelta(days=365)},
+        archive_dir=tmp_path,
+        batch_size=2,
+        clock=lambda: NOW,
+    )
+    job._lock_batch = AsyncMock(side_effect=[make_rows(2), make_rows(1)])
+
+    archived = await job.run_once()
+
+    assert archived == {"public": 3}
+    # один DELETE и один COMMIT на батч; неполный батч завершает проход
+    assert log == [("execute", "DELETE"), ("commit",)] * 2
+    assert job._lock_batch.await_count == 2
+    _, room_type, cutoff = job._lock_batch.await_args.args
+    assert room_type == RoomType.PUBLIC
+    assert cutoff == NOW - timedelta(days=365)
+
+    (archive_path,) = tmp_path.iterdir()
+    assert archive_path.name == "messages-public-20261018T120000Z.jsonl.gz"
+    assert [row["content"] for row in read_archive(archive_path)] == ["old-0", "old-1", "old-0"]
+    assert job.stats()["archived"] == 3
+
+
+@pytest.mark.asyncio
+async def test_room_types_without_policy_are_kept(tmp_path):
+    job = MessageRetentionJob(
+        lambda: FakeSession([]),
+        policies=retention_policies({"private": 30}),
+        archive_dir=tmp_path,
+        clock=lambda: NOW,
+    )
+    job._lock_batch = AsyncMock(return_value=[])
+    job._drop_empty_partitions = AsyncMock()
+
+    assert await job.run_once() == {"private": 0}
+
+    assert [call.args[1] for call in job._lock_batch.await_args_list] == [RoomType.PRIVATE]
+    # без политики для всех типов старые партиции могут быть непустыми
+    job._drop_empty_partitions.assert_not_awaited()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cli_accepts_policy_override(tmp_path):
+    args = parse_args(["--days", '{"public": 90}', "--archive-dir", str(tmp_path), "--batch-size", "10"])
+
+    assert retention_policies(args.days) == {RoomType.PUBLIC: timedelta(days=90)}
+    assert args.archive_dir == tmp_path
+    assert args.batch_size == 10
+
+
+@pytest.mark.asyncio
+async def test_empty_partitions_are_dropped_with_lock_timeout(tmp_path, monkeypatch):
+    executed = []
+
+    class PartitionSession(FakeSession):
+        async def execute(self, stmt):
+            executed.append(str(stmt))
+            return Mock(**{"scalar.return_value": True})
+
+        async def rollback(self):
+            pass
+
+    monkeypatch.setattr(
+        "app.infrastructure.database.retention.list_message_partitions",
+        AsyncMock(return_value=[("messages_p2025_01", date(2025, 1, 1))]),
+    )
+    job = MessageRetentionJob(
+        lambda: PartitionSession([]),
+        policies={},
+        archive_dir=tmp_path,
+    )
+
+    await job._drop_empty_partitions(NOW)
+
+    assert executed[-2:] == [
+        "SET LOCAL lock_timeout = '2s'",
+        "DROP TABLE IF EXISTS messages_p2025_01",
+    ]
+    assert job.stats()["dropped_partitions"] == 1
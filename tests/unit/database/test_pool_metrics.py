@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import Mock
+
+from fastapi import HTTPException
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.infrastructure.database.pool import (
+    InstrumentedAsyncQueuePool,
+    pool_metrics,
+    pool_stats,
+)
+from app.interfaces.rest.routers.metrics_router import require_metrics_access
+from app.config.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkouts_and_timeouts():
+    pool = InstrumentedAsyncQueuePool(
+        creator=lambda: Mock(),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.01,
+    )
+    checkouts_before = pool_metrics.checkouts
+    timeouts_before = pool_metrics.timeouts
+
+    connection = await greenlet_spawn(pool.connect)
+
+    with pytest.raises(exc.TimeoutError):
+        await greenlet_spawn(pool.connect)
+
+    stats = pool_stats(pool)
+    assert stats["checked_out"] == 1
+    assert pool_metrics.checkouts == checkouts_before + 1
+    assert pool_metrics.timeouts == timeouts_before + 1
+
+    await greenlet_spawn(connection.close)
+    assert pool_stats(pool)["checked_out"] == 0
+
+
+@pytest.mark.parametrize(
+    ("token", "header", "status_code"),
+    [
+        (None, "Bearer anything", 404),
+        ("s3cret", None, 401),
+        ("s3cret", "Bearer wrong", 401),
+    ],
+)
+def test_metrics_endpoint_requires_configured_token(monkeypatch, token, header, status_code):
+    monkeypatch.setattr(settings, "metrics_token", token)
+    request = Mock(headers={"Authorization": header} if header else {})
+
+    with pytest.raises(HTTPException) as exc_info:
+        require_metrics_access(request)
+
+    assert exc_info.value.status_code == status_code
+
+
+def test_metrics_endpoint_accepts_valid_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "s3cret")
+
+    require_metrics_access(Mock(headers={"Authorization": "Bearer s3cret"}))
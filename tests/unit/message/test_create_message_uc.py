@@ -4,6 +4,7 @@ from app.application.use_cases.message.create_user_message import CreateUserMess
 from app.application.exceptions import RoomNotFoundError, UserNotInRoomError
 from app.domain.entities.message import Message
 from app.domain.value_objects.room_id import RoomId
+from app.infrastructure.cache.membership_cache import InMemoryMembershipCache
 
 
 @pytest.mark.asyncio
@@ -14,7 +15,7 @@ async def test_send_message_success(
     room,
     owner_id,
 ):
-    room_repository.get_by_id.return_value = room
+    room_repository.is_member.return_value = True
 
     use_case = CreateUserMessageUseCase(
         uow=uow,
@@ -28,7 +29,8 @@ async def test_send_message_success(
         content="Hello from unit test",
     )
 
-    room_repository.get_by_id.assert_awaited_once_with(room.id)
+    room_repository.is_member.assert_awaited_once_with(room.id, owner_id.value)
+    room_repository.get_by_id.assert_not_awaited()
     message_repository.add.assert_awaited_once()
     assert isinstance(message, Message)
     assert message.content.value == "Hello from unit test"
@@ -43,7 +45,8 @@ async def test_send_message_room_not_found(
     room_repository,
     owner_id,
 ):
-    room_repository.get_by_id.return_value = None
+    room_repository.is_member.return_value = False
+    room_repository.exists.return_value = False
 
     use_case = CreateUserMessageUseCase(
         uow=uow,
@@ -71,7 +74,8 @@ async def test_send_message_user_not_in_room(
     room,
     outsider_id,
 ):
-    room_repository.get_by_id.return_value = room
+    room_repository.is_member.return_value = False
+    room_repository.exists.return_value = True
 
     use_case = CreateUserMessageUseCase(
         uow=uow,
@@ -89,3 +93,60 @@ async def test_send_message_user_not_in_room(
     message_repository.add.assert_not_called()
     assert uow.committed is False
     assert uow.rolled_back is True
+
+
+@pytest.mark.asyncio
+async def test_send_message_uses_cached_membership(
+    uow,
+    message_repository,
+    room_repository,
+    room,
+    owner_id,
+):
+    cache = InMemoryMembershipCache()
+    cache.set(room.id.value, owner_id.value, True)
+
+    use_case = CreateUserMessageUseCase(
+        uow=uow,
+        message_repository=message_repository,
+        room_repository=room_repository,
+        membership_cache=cache,
+    )
+
+    await use_case.execute(
+        room_id=room.id,
+        sender_id=owner_id,
+        content="Hello",
+    )
+
+    room_repository.is_member.assert_not_awaited()
+    message_repository.add.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_send_message_caches_membership_on_miss(
+    uow,
+    message_repository,
+    room_repository,
+    room,
+    outsider_id,
+):
+    room_repository.is_member.return_value = False
+    room_repository.exists.return_value = True
+    cache = InMemoryMembershipCache()
+
+    use_case = CreateUserMessageUseCase(
+        uow=uow,
+        message_repository=message_repository,
+        room_repository=room_repository,
+        membership_cache=cache,
+    )
+
+    with pytest.raises(UserNotInRoomError):
+        await use_case.execute(
+            room_id=room.id,
+            sender_id=outsider_id,
+            content="Hello",
+        )
+
+    assert cache.get(room.id.value, outsider_id.value) is False
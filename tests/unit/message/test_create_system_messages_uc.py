@@ -0,0 +1,34 @@
+import pytest
+
+from app.application.use_cases.message.create_system_messages import CreateSystemMessagesUseCase
+from app.domain.enums.message_type import MessageType
+from app.domain.value_objects.room_id import RoomId
+
+
+@pytest.mark.asyncio
+async def test_system_messages_are_written_in_one_batch(uow, message_repository):
+    room_ids = [RoomId() for _ in range(3)]
+
+    use_case = CreateSystemMessagesUseCase(
+        uow=uow,
+        message_repository=message_repository,
+    )
+
+    messages = await use_case.execute(room_ids=room_ids, content="User left the room")
+
+    assert [m.room_id for m in messages] == room_ids
+    assert all(m.message_type == MessageType.SYSTEM for m in messages)
+    message_repository.add_many.assert_awaited_once_with(messages)
+    message_repository.add.assert_not_awaited()
+    assert uow.committed is True
+
+
+@pytest.mark.asyncio
+async def test_no_rooms_means_no_insert(uow, message_repository):
+    use_case = CreateSystemMessagesUseCase(
+        uow=uow,
+        message_repository=message_repository,
+    )
+
+    assert await use_case.execute(room_ids=[], content="left") == []
+    message_repository.add_many.assert_not_awaited()
@@ -0,0 +1,60 @@
+import pytest
+from datetime import datetime, timezone
+
+from app.domain.entities.message import Message
+from app.domain.value_objects.message_content import MessageContent
+from app.domain.value_objects.message_cursor import MessageCursor
+from app.domain.value_objects.message_id import MessageId
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MessageSearchHit
+from app.domain.value_objects.room_id import RoomId
+from app.domain.value_objects.user_id import UserId
+from app.interfaces.rest.cursors import (
+    decode_message_cursor,
+    decode_search_cursor,
+    encode_message_cursor,
+    encode_search_cursor,
+)
+
+
+def test_cursor_round_trip():
+    message = Message(
+        message_id=MessageId(),
+        room_id=RoomId(),
+        sender_id=UserId(),
+        content=MessageContent("hello"),
+        created_at=datetime(2025, 5, 1, 12, 30, 0, 123456, tzinfo=timezone.utc),
+    )
+
+    cursor = decode_message_cursor(encode_message_cursor(message))
+
+    assert cursor == MessageCursor(message.created_at, message.id.value)
+
+
+@pytest.mark.parametrize("raw", ["", "not-a-cursor", "Zm9vfGJhcg"])
+def test_invalid_cursor_is_rejected(raw):
+    with pytest.raises(ValueError):
+        decode_message_cursor(raw)
+
+
+def test_search_cursor_keeps_rank_exactly():
+    message = Message.system(room_id=RoomId(), content="hello")
+    hit = MessageSearchHit(message=message, rank=0.060792710632085800, snippet="hello")
+
+    cursor = decode_search_cursor(encode_search_cursor(hit))
+
+    assert cursor == MessageSearchCursor(hit.rank, message.created_at, message.id.value)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "",
+        "Zm9vfGJhcg",
+        # nan|2025-01-01T00:00:00+00:00|<uuid>: NaN не сравнивается, такой курсор бесполезен
+        "bmFufDIwMjUtMDEtMDFUMDA6MDA6MDArMDA6MDB8MDAwMDAwMDAtMDAwMC0wMDAwLTAwMDAtMDAwMDAwMDAwMDAx",
+    ],
+)
+def test_invalid_search_cursor_is_rejected(raw):
+    with pytest.raises(ValueError):
+        decode_search_cursor(raw)
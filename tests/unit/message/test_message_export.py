@@ -0,0 +1,98 @@
+import gzip
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.domain.entities.message import Message
+from app.domain.value_objects.room_id import RoomId
+
+from app.infrastructure.database.repositories.message_repository import PostgresMessageRepository
+from app.interfaces.rest.exports import ndjson_export
+
+
+ROOM_ID = RoomId()
+
+
+async def as_stream(messages):
+    for message in messages:
+        yield message
+
+
+def make_messages(count: int) -> list[Message]:
+    return [Message.system(room_id=ROOM_ID, content=f"notice {i}") for i in range(count)]
+
+
+async def collect(chunks) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_export_emits_one_json_line_per_message_in_bounded_chunks():
+    messages = make_messages(50)
+
+    chunks = await collect(ndjson_export(as_stream(messages), chunk_size=256))
+
+    assert len(chunks) > 1
+    # каждый кусок кроме последнего — чуть больше порога, а не вся выгрузка
+    assert all(len(chunk) < 256 * 2 for chunk in chunks)
+
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["content"] for row in rows] == [f"notice {i}" for i in range(50)]
+    assert rows[0] == {
+        "id": str(messages[0].id.value),
+        "room_id": str(ROOM_ID.value),
+        "sender_id": None,
+        "content": "notice 0",
+        "message_type": messages[0].message_type.value,
+        "created_at": messages[0].created_at.isoformat(),
+    }
+
+
+@pytest.mark.asyncio
+async def test_gzip_export_is_a_single_valid_gzip_stream():
+    chunks = await collect(
+        ndjson_export(as_stream(make_messages(200)), compress=True, chunk_size=512),
+    )
+
+    lines = gzip.decompress(b"".join(chunks)).splitlines()
+    assert len(lines) == 200
+    assert json.loads(lines[-1])["content"] == "notice 199"
+
+
+@pytest.mark.asyncio
+async def test_empty_export_still_produces_valid_gzip():
+    chunks = await collect(ndjson_export(as_stream([]), compress=True))
+
+    assert gzip.decompress(b"".join(chunks)) == b""
+
+
+@pytest.mark.asyncio
+async def test_repository_streams_through_server_side_cursor():
+    session = AsyncMock()
+    result = Mock()
+    result.close = AsyncMock()
+    result.__aiter__ = lambda self: as_stream([])
+    session.stream_scalars.return_value = result
+
+    since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    until = since + timedelta(days=30)
+    repository = PostgresMessageRepository(session)
+
+    exported = [
+        message
+        async for message in repository.stream_room_history(
+            ROOM_ID, since=since, until=until, batch_size=500,
+        )
+    ]
+
+    assert exported == []
+    (stmt,), _ = session.stream_scalars.await_args
+    assert stmt.get_execution_options()["yield_per"] == 500
+
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    assert {since, until} <= set(compiled.params.values())
+    assert "ORDER BY messages.created_at ASC, messages.id ASC" in str(compiled)
+    result.close.assert_awaited_once()
@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.domain.enums.message_type import MessageType
+from app.domain.value_objects.message_search_cursor import MessageSearchCursor
+from app.domain.value_objects.message_search_hit import MATCH_START, MATCH_STOP
+from app.domain.value_objects.room_id import RoomId
+
+from app.infrastructure.database.repositories.message_repository import PostgresMessageRepository
+from app.interfaces.rest.routers.message_router import _render_snippet
+
+
+def search_repository(rows: list):
+    session = AsyncMock()
+    session.execute.return_value = Mock(**{"all.return_value": rows})
+    return PostgresMessageRepository(session), session
+
+
+def compiled(session) -> str:
+    (stmt,), _ = session.execute.await_args
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_cross_room_search_is_one_query_scoped_to_memberships():
+    repository, session = search_repository([])
+
+    await repository.search("hello world", user_id=uuid4(), limit=20)
+
+    session.execute.assert_awaited_once()
+    sql = compiled(session)
+    assert "messages.search_vector @@ websearch_to_tsquery('simple'::regconfig" in sql
+    assert "messages.room_id IN (SELECT room_members.room_id" in sql
+    assert "messages.room_id = " not in sql
+    # сниппеты строятся снаружи подзапроса страницы, т.е. только для limit строк
+    assert sql.index("ts_headline") < sql.index("FROM (SELECT")
+
+
+@pytest.mark.asyncio
+async def test_room_search_continues_after_cursor():
+    repository, session = search_repository([])
+    after = MessageSearchCursor(0.25, datetime(2026, 5, 1, tzinfo=timezone.utc), uuid4())
+
+    await repository.search("hello", user_id=uuid4(), room_id=RoomId(), limit=20, after=after)
+
+    sql = compiled(session)
+    assert "messages.room_id = " in sql
+    assert "messages.created_at, messages.id) < (" in sql
+
+    (stmt,), _ = session.execute.await_args
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert {0.25, after.created_at, after.message_id} <= set(params.values())
+
+
+@pytest.mark.asyncio
+async def test_rows_are_mapped_to_hits():
+    row = Mock(
+        id=uuid4(),
+        room_id=uuid4(),
+        sender_id=uuid4(),
+        content="hello world",
+        message_type=MessageType.TEXT,
+        created_at=datetime.now(timezone.utc),
+        rank=0.0607927,
+        snippet=f"{MATCH_START}hello{MATCH_STOP} world",
+    )
+    repository, _ = search_repository([row])
+
+    (hit,) = await repository.search("hello", user_id=uuid4(), limit=20)
+
+    assert hit.message.id.value == row.id
+    assert hit.message.content.value == "hello world"
+    assert hit.rank == row.rank
+    assert hit.snippet == f"{MATCH_START}hello{MATCH_STOP} world"
+
+
+def test_snippet_text_is_escaped_before_highlighting():
+    snippet = f'<img src=x onerror="alert(1)"> {MATCH_START}deploy{MATCH_STOP} now'
+
+    assert _render_snippet(snippet) == (
+        "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>deploy</mark> now"
+    )
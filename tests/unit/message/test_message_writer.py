@@ -0,0 +1,199 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from sqlalchemy.exc import IntegrityError
+
+from app.domain.entities.message import Message
+from app.domain.value_objects.message_content import MessageContent
+from app.domain.value_objects.message_id import MessageId
+from app.domain.value_objects.room_id import RoomId
+from app.domain.value_objects.user_id import UserId
+from app.domain.repositories.message_repository import MessageRepository
+
+from app.infrastructure.database.message_writer import (
+    BatchedMessageWriter,
+    WriteBehindMessageRepository,
+)
+
+
+class FakeSession:
+    def __init__(self, factory):
+        self._factory = factory
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, rows):
+        if self._factory.failures:
+            self._factory.failures -= 1
+            raise ConnectionError("db is down")
+        if any(row["content"] in self._factory.rejected for row in rows):
+            self._factory.attempts += 1
+            raise IntegrityError("INSERT INTO messages", rows, Exception("constraint violated"))
+        self._factory.batches.append(rows)
+
+    async def commit(self):
+        pass
+
+
+class FakeSessionFactory:
+    def __init__(self, failures: int = 0, rejected: frozenset[str] = frozenset()):
+        self.failures = failures
+        self.rejected = rejected
+        self.attempts = 0
+        self.batches: list[list[dict]] = []
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+def make_message(room_id: RoomId, text: str = "hi") -> Message:
+    return Message(
+        message_id=MessageId(),
+        room_id=room_id,
+        sender_id=UserId(),
+        content=MessageContent(text),
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_flushed_without_waiting_for_interval():
+    factory = FakeSessionFactory()
+    writer = BatchedMessageWriter(factory, max_batch_size=3, flush_interval=10)
+    await writer.start()
+
+    room_id = RoomId()
+    for _ in range(3):
+        writer.submit(make_message(room_id))
+
+    await asyncio.sleep(0.01)
+
+    assert len(factory.batches) == 1
+    assert len(factory.batches[0]) == 3
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_after_interval():
+    factory = FakeSessionFactory()
+    writer = BatchedMessageWriter(factory, max_batch_size=100, flush_interval=0.01)
+    await writer.start()
+
+    writer.submit(make_message(RoomId()))
+    assert factory.batches == []
+
+    await asyncio.sleep(0.05)
+
+    assert len(factory.batches) == 1
+    assert writer.stats()["rows"] == 1
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_buffer_in_submission_order():
+    factory = FakeSessionFactory()
+    writer = BatchedMessageWriter(factory, max_batch_size=2, flush_interval=10)
+    await writer.start()
+
+    room_id = RoomId()
+    messages = [make_message(room_id, f"msg-{i}") for i in range(5)]
+    for message in messages:
+        writer.submit(message)
+
+    await writer.stop()
+
+    written = [row["content"] for batch in factory.batches for row in batch]
+    assert written == [f"msg-{i}" for i in range(5)]
+    assert writer.stats()["pending"] == 0
+
+    with pytest.raises(RuntimeError):
+        writer.submit(make_message(room_id))
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried():
+    factory = FakeSessionFactory(failures=1)
+    writer = BatchedMessageWriter(factory, max_batch_size=1, flush_interval=0.001)
+    await writer.start()
+
+    writer.submit(make_message(RoomId()))
+    await writer.stop()
+
+    stats = writer.stats()
+    assert stats["rows"] == 1
+    assert stats["failed_rows"] == 0
+
+
+@pytest.mark.asyncio
+async def test_only_persisted_batches_are_reported():
+    flushed = []
+
+    async def on_flushed(batch):
+        flushed.extend(batch)
+
+    # три попытки подряд неудачны: батч потерян и подписчику не отдаётся
+    factory = FakeSessionFactory(failures=3)
+    writer = BatchedMessageWriter(
+        factory,
+        max_batch_size=1,
+        flush_interval=0.001,
+        on_flushed=on_flushed,
+    )
+    await writer.start()
+
+    lost = make_message(RoomId(), "lost")
+    saved = make_message(RoomId(), "saved")
+    writer.submit(lost)
+    writer.submit(saved)
+    await writer.stop()
+
+    assert flushed == [saved]
+
+
+@pytest.mark.asyncio
+async def test_rejected_rows_are_split_out_of_the_batch():
+    flushed = []
+
+    async def on_flushed(batch):
+        flushed.extend(message.content.value for message in batch)
+
+    factory = FakeSessionFactory(rejected=frozenset({"msg-2", "msg-5"}))
+    writer = BatchedMessageWriter(
+        factory,
+        max_batch_size=8,
+        flush_interval=0.001,
+        on_flushed=on_flushed,
+    )
+    await writer.start()
+
+    room_id = RoomId()
+    for i in range(8):
+        writer.submit(make_message(room_id, f"msg-{i}"))
+    await writer.stop()
+
+    expected = ["msg-0", "msg-1", "msg-3", "msg-4", "msg-6", "msg-7"]
+    written = [row["content"] for batch in factory.batches for row in batch]
+    assert written == expected
+    assert flushed == expected
+
+    stats = writer.stats()
+    assert stats["rows"] == 6
+    assert stats["failed_rows"] == 2
+    # ошибка строки не повторяется: только деление пополам до плохих строк
+    assert factory.attempts == 7
+
+
+@pytest.mark.asyncio
+async def test_write_behind_repository_submits_instead_of_adding():
+    writer = BatchedMessageWriter(FakeSessionFactory())
+    read_repository = AsyncMock(spec=MessageRepository)
+    repository = WriteBehindMessageRepository(writer, read_repository)
+
+    await repository.add(make_message(RoomId()))
+
+    assert writer.stats()["pending"] == 1
+    read_repository.add.assert_not_awaited()
@@ -0,0 +1,55 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.infrastructure.messaging.codecs import (
+    JsonEventCodec,
+    MSGPACK_V1,
+    decode_event,
+    get_event_codec,
+)
+
+
+def sample_event() -> dict:
+    room_id = uuid4()
+    return {
+        "channel": f"ws_events:room:{room_id}",
+        "message": {
+            "type": "new_message",
+            "payload": {
+                "id": str(uuid4()),
+                "room_id": str(room_id),
+                "sender_id": str(uuid4()),
+                "content": "hello",
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+        },
+    }
+
+
+def test_json_codec_is_wire_compatible_with_plain_json():
+    event = sample_event()
+
+    encoded = JsonEventCodec().encode(event)
+
+    assert encoded == json.dumps(event)
+    assert decode_event(encoded.encode()) == event
+
+
+def test_msgpack_round_trip_is_lossless():
+    pytest.importorskip("msgpack")
+    event = sample_event()
+    event["message"]["payload"]["content"] = "not-a-uuid-but-36-characters-long!!"
+    event["message"]["payload"]["edited_at"] = "2025-01-01T12:00:00+03:00"
+    event["message"]["payload"]["sent_at"] = "2025-01-01T12:00:00+00:00"
+
+    encoded = get_event_codec("msgpack").encode(event)
+
+    assert encoded[0] == MSGPACK_V1
+    assert decode_event(encoded) == event
+
+
+def test_unknown_version_is_rejected():
+    with pytest.raises(ValueError):
+        decode_event(b"\x7fpayload")
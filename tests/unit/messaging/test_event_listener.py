@@ -0,0 +1,149 @@
+import asyncio
+import json
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from app.application.messaging.channels import room_channel
+from app.infrastructure.messaging.listener import SupervisedListener
+from app.infrastructure.messaging.redis_event_bus import RedisEventBus
+
+
+def room_event(room_id, n: int, **payload) -> dict:
+    return {
+        "channel": room_channel(room_id),
+        "message": {"type": "new_message", "payload": {"room_id": str(room_id), "n": n, **payload}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_with_backoff_after_source_failure():
+    room_id = uuid4()
+    attempts = 0
+
+    async def source():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ConnectionError("redis is down")
+        yield [room_event(room_id, 1)]
+        await asyncio.Event().wait()
+
+    handled = []
+
+    async def handle(message):
+        handled.append(message)
+
+    reconnect = AsyncMock()
+    listener = SupervisedListener(
+        source,
+        handle,
+        name="test",
+        reconnect=reconnect,
+        initial_backoff=0.001,
+    )
+
+    task = asyncio.create_task(listener.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    reconnect.assert_awaited_once()
+    assert [message["payload"]["n"] for message in handled] == [1]
+
+    stats = listener.stats()
+    assert stats["reconnects"] == 1
+    assert stats["connected"] is True
+    assert stats["events"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rooms_are_dispatched_in_parallel_and_in_order():
+    slow_room, fast_room = uuid4(), uuid4()
+    release = asyncio.Event()
+    handled = []
+
+    async def handle(message):
+        if message["payload"]["room_id"] == str(slow_room):
+            await release.wait()
+        handled.append((message["payload"]["room_id"], message["payload"]["n"]))
+
+    listener = SupervisedListener(Mock(), handle, name="test")
+
+    batch = [room_event(slow_room, 1), room_event(fast_room, 1), room_event(slow_room, 2)]
+    dispatch = asyncio.create_task(listener._dispatch(batch))
+    await asyncio.sleep(0.01)
+
+    # медленная комната не задерживает остальные
+    assert handled == [(str(fast_room), 1)]
+
+    release.set()
+    await dispatch
+
+    assert handled[1:] == [(str(slow_room), 1), (str(slow_room), 2)]
+
+
+@pytest.mark.asyncio
+async def test_failing_handler_does_not_stop_batch():
+    room_id = uuid4()
+    handle = AsyncMock(side_effect=[ValueError("broken"), None])
+
+    listener = SupervisedListener(Mock(), handle, name="test")
+    await listener._dispatch([room_event(room_id, 1), room_event(room_id, 2)])
+
+    assert handle.await_count == 2
+    assert listener.stats()["failed_events"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stats_report_rate_and_lag():
+    now = 1_700_000_000.0
+    listener = SupervisedListener(Mock(), AsyncMock(), name="test", clock=lambda: now)
+
+    event = room_event(uuid4(), 1)
+    event["message"]["stream_id"] = f"{int((now - 0.25) * 1000)}-0"
+    await listener._dispatch([event] * 20)
+
+    stats = listener.stats()
+    assert stats["events_per_second"] == 2.0
+    assert stats["last_lag_ms"] == pytest.approx(250, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_pubsub_listen_batches_drains_buffered_messages():
+    room_id = uuid4()
+    events = [room_event(room_id, n) for n in range(3)]
+
+    pubsub_mock = AsyncMock()
+    pubsub_mock.get_message = AsyncMock(
+        side_effect=[{"type": "message", "data": json.dumps(event)} for event in events] + [None],
+    )
+    redis_mock = Mock()
+    redis_mock.pubsub.return_value = pubsub_mock
+
+    bus = RedisEventBus("redis://test")
+    bus._redis = redis_mock
+    await bus.subscribe_room(room_id)
+
+    batch = await anext(bus.listen_batches(max_batch_size=10))
+
+    assert batch == events
+
+
+@pytest.mark.asyncio
+async def test_pubsub_reconnect_resubscribes_to_all_rooms():
+    stale, fresh = AsyncMock(), AsyncMock()
+    redis_mock = Mock()
+    redis_mock.pubsub.side_effect = [stale, fresh]
+
+    bus = RedisEventBus("redis://test")
+    bus._redis = redis_mock
+
+    rooms = [uuid4(), uuid4()]
+    for room_id in rooms:
+        await bus.subscribe_room(room_id)
+
+    await bus.reconnect()
+
+    stale.aclose.assert_awaited_once()
+    fresh.subscribe.assert_awaited_once()
+    assert set(fresh.subscribe.await_args.args) == {room_channel(room_id) for room_id in rooms}
@@ -1,7 +1,10 @@
+import asyncio
 import json
 import pytest
+from uuid import uuid4
 from unittest.mock import AsyncMock, Mock
 
+from app.application.messaging.channels import room_channel
 from app.infrastructure.messaging.redis_event_bus import RedisEventBus
 
 
@@ -63,3 +66,140 @@ async def test_subscribe_yields_only_message_events():
             "payload": {"text": "hi"},
         }
     ]
+
+
+@pytest.mark.asyncio
+async def test_room_subscriptions_follow_local_interest():
+    pubsub_mock = AsyncMock()
+
+    redis_mock = Mock()
+    redis_mock.pubsub.return_value = pubsub_mock
+
+    bus = RedisEventBus("redis://test")
+    bus._redis = redis_mock
+
+    room_id = uuid4()
+
+    await bus.subscribe_room(room_id)
+    await bus.subscribe_room(room_id)
+
+    pubsub_mock.subscribe.assert_awaited_once_with(room_channel(room_id))
+
+    await bus.unsubscribe_room(room_id)
+    await bus.unsubscribe_room(room_id)
+
+    pubsub_mock.unsubscribe.assert_awaited_once_with(room_channel(room_id))
+
+
+@pytest.mark.asyncio
+async def test_listen_yields_room_events():
+    room_id = uuid4()
+    event = {"channel": room_channel(room_id), "message": {"type": "typing"}}
+
+    pubsub_mock = AsyncMock()
+    pubsub_mock.get_message = AsyncMock(
+        side_effect=[
+            None,
+            {"type": "message", "data": json.dumps(event)},
+        ]
+    )
+
+    redis_mock = Mock()
+    redis_mock.pubsub.return_value = pubsub_mock
+
+    bus = RedisEventBus("redis://test")
+    bus._redis = redis_mock
+
+    await bus.subscribe_room(room_id)
+
+    async for received in bus.listen():
+        assert received == event
+        break
+
+
+@pytest.mark.asyncio
+async def test_publish_many_uses_single_pipeline():
+    pipe = Mock()
+    pipe.execute = AsyncMock()
+    redis_mock = Mock()
+    redis_mock.pipeline.return_value = pipe
+
+    bus = RedisEventBus("redis://test")
+    bus._redis = redis_mock
+
+    events = [{"channel": room_channel(uuid4()), "message": {"n": i}} for i in range(3)]
+
+    await bus.publish_many(events)
+
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    assert pipe.publish.call_count == 3
+    pipe.execute.assert_awaited_once()
+
+
+def buffered_bus(**kwargs):
+    sent_batches = []
+
+    class FakePipeline:
+        def __init__(self):
+            self.events = []
+
+        def publish(self, channel, data):
+            self.events.append(json.loads(data))
+
+        async def execute(self):
+            sent_batches.append(self.events)
+
+    redis_mock = Mock()
+    redis_mock.ping = AsyncMock()
+    redis_mock.pipeline.side_effect = lambda transaction: FakePipeline()
+    redis_mock.publish = AsyncMock(
+        side_effect=lambda channel, data: sent_batches.append([json.loads(data)])
+    )
+
+    bus = RedisEventBus("redis://test", **kwargs)
+    bus._redis = redis_mock
+    return bus, sent_batches
+
+
+@pytest.mark.asyncio
+async def test_buffered_publish_sends_window_in_one_pipeline():
+    bus, sent_batches = buffered_bus(publish_flush_interval=0.01)
+    await bus.init()
+
+    for i in range(5):
+        await bus.publish({"channel": "c", "n": i})
+    assert sent_batches == []
+
+    await asyncio.sleep(0.05)
+
+    assert [[e["n"] for e in batch] for batch in sent_batches] == [[0, 1, 2, 3, 4]]
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_is_flushed_before_window_ends():
+    bus, sent_batches = buffered_bus(publish_flush_interval=10, publish_batch_size=2)
+    await bus.init()
+
+    await bus.publish({"channel": "c", "n": 0})
+    await bus.publish({"channel": "c", "n": 1})
+    await asyncio.sleep(0.01)
+
+    assert len(sent_batches) == 1
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_close_and_publish_many_keep_buffered_events_in_order():
+    bus, sent_batches = buffered_bus(publish_flush_interval=10)
+    await bus.init()
+
+    await bus.publish({"channel": "c", "n": 0})
+    await bus.publish_many([{"channel": "c", "n": 1}, {"channel": "c", "n": 2}])
+    await bus.publish({"channel": "c", "n": 3})
+
+    await bus.close()
+
+    sent = [e["n"] for batch in sent_batches for e in batch]
+    assert sent == [0, 1, 2, 3]
+    assert bus.publish_stats()["buffered"] == 0
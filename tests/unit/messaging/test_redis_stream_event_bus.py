@@ -0,0 +1,141 @@
+import json
+import pytest
+from uuid import uuid4
+
+from app.application.messaging.channels import room_channel
+from app.infrastructure.messaging.redis_stream_event_bus import RedisStreamEventBus
+
+
+class FakeStreams:
+    """Minimal in-memory stand-in for the stream commands the bus uses."""
+
+    def __init__(self):
+        self.streams: dict[str, list[tuple[bytes, dict]]] = {}
+        self.ttls: dict[str, int] = {}
+        self._seq = 0
+
+    async def xadd(self, name, fields, maxlen=None, approximate=True):
+        self._seq += 1
+        entry_id = f"1-{self._seq}".encode()
+        entries = self.streams.setdefault(name, [])
+        entries.append((entry_id, fields))
+        if maxlen is not None:
+            del entries[:-maxlen]
+        return entry_id
+
+    async def pexpire(self, name, ttl_ms):
+        self.ttls[name] = ttl_ms
+
+    def _after(self, name, last_id):
+        last = tuple(int(part) for part in last_id.split("-"))
+        return [
+            (entry_id, fields)
+            for entry_id, fields in self.streams.get(name, [])
+            if tuple(int(part) for part in entry_id.decode().split("-")) > last
+        ]
+
+    async def xrevrange(self, name, count=None):
+        return list(reversed(self.streams.get(name, [])))[:count]
+
+    async def xrange(self, name, min="-", max="+", count=None):
+        return self._after(name, min.lstrip("("))[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        response = []
+        for name, last_id in streams.items():
+            entries = self._after(name, last_id)[:count]
+            if entries:
+                response.append((name.encode(), entries))
+        return response
+
+    def pipeline(self, transaction=False):
+        fake = self
+        calls = []
+
+        class Pipeline:
+            def xadd(self, *args, **kwargs):
+                calls.append((fake.xadd, args, kwargs))
+
+            def pexpire(self, *args, **kwargs):
+                calls.append((fake.pexpire, args, kwargs))
+
+            async def execute(self):
+                return [await command(*args, **kwargs) for command, args, kwargs in calls]
+
+        return Pipeline()
+
+
+def make_bus(**kwargs) -> tuple[RedisStreamEventBus, FakeStreams]:
+    bus = RedisStreamEventBus("redis://test", **kwargs)
+    bus._redis = FakeStreams()
+    return bus, bus._redis
+
+
+def room_event(room_id, text="hi", event_type="new_message") -> dict:
+    return {
+        "channel": room_channel(room_id),
+        "message": {
+            "type": event_type,
+            "payload": {"room_id": str(room_id), "content": text},
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_publish_appends_to_capped_room_stream():
+    bus, redis_mock = make_bus(max_len=2)
+    room_id = uuid4()
+
+    for i in range(3):
+        await bus.publish(room_event(room_id, f"msg-{i}"))
+
+    entries = redis_mock.streams[room_channel(room_id)]
+    assert [json.loads(fields[b"event"])["message"]["payload"]["content"] for _, fields in entries] == [
+        "msg-1",
+        "msg-2",
+    ]
+    # каждая публикация продлевает срок жизни потока
+    assert redis_mock.ttls == {room_channel(room_id): 24 * 3600 * 1000}
+
+
+@pytest.mark.asyncio
+async def test_listen_continues_from_last_seen_id():
+    bus, _ = make_bus()
+    room_id = uuid4()
+
+    await bus.publish(room_event(room_id, "before-subscribe"))
+    await bus.subscribe_room(room_id)
+    await bus.publish_many([room_event(room_id, "first"), room_event(room_id, "second")])
+
+    listener = bus.listen()
+    first = await anext(listener)
+    second = await anext(listener)
+
+    assert first["message"]["payload"]["content"] == "first"
+    assert second["message"]["payload"]["content"] == "second"
+    assert bus._last_ids[room_channel(room_id)] == second["message"]["stream_id"]
+
+    # новое событие читается после последнего увиденного, без повторов
+    await bus.publish(room_event(room_id, "third"))
+    assert (await anext(listener))["message"]["payload"]["content"] == "third"
+
+
+@pytest.mark.asyncio
+async def test_replay_returns_events_after_id_without_typing():
+    bus, _ = make_bus()
+    room_id = uuid4()
+
+    await bus.publish(room_event(room_id, "seen"))
+    await bus.subscribe_room(room_id)
+    seen_id = bus._last_ids[room_channel(room_id)]
+
+    await bus.publish(room_event(room_id, "missed"))
+    await bus.publish(room_event(room_id, event_type="typing"))
+
+    events = await bus.replay(room_id, seen_id)
+
+    assert [event["message"]["payload"]["content"] for event in events] == ["missed"]
+
+    with pytest.raises(ValueError):
+        await bus.replay(room_id, "not-an-id")
+
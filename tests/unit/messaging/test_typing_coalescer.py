@@ -0,0 +1,134 @@
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from app.application.messaging.channels import room_channel
+from app.application.messaging.event_bus import EventBus
+from app.domain.value_objects.user_id import UserId
+from app.infrastructure.messaging.handlers import WebSocketEventHandler
+from app.infrastructure.messaging.typing_coalescer import TypingCoalescer
+from app.interfaces.websocket.handlers import handle_typing
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_coalescer(**kwargs):
+    event_bus = AsyncMock(spec=EventBus)
+    clock = FakeClock()
+    coalescer = TypingCoalescer(event_bus, window=1.0, stop_after=3.0, clock=clock, **kwargs)
+    return coalescer, event_bus, clock
+
+
+def published(event_bus) -> list[dict]:
+    return [
+        event["message"]
+        for call in event_bus.publish_many.await_args_list
+        for event in call.args[0]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_keystrokes_within_window_publish_once():
+    coalescer, event_bus, clock = make_coalescer()
+    room_id, user_id = uuid4(), uuid4()
+
+    for _ in range(10):
+        coalescer.typing(room_id, user_id)
+        await coalescer.flush()
+        clock.now += 0.05
+
+    assert published(event_bus) == [
+        {"type": "typing", "payload": {"room_id": str(room_id), "user_ids": [str(user_id)]}},
+    ]
+    assert coalescer.stats()["suppressed"] == 9
+
+    # по истечении окна пара снова может опубликоваться
+    clock.now += 1.0
+    coalescer.typing(room_id, user_id)
+    await coalescer.flush()
+    assert len(published(event_bus)) == 2
+
+
+@pytest.mark.asyncio
+async def test_pending_users_of_room_merge_into_one_event():
+    coalescer, event_bus, _ = make_coalescer()
+    room_id = uuid4()
+    users = [uuid4() for _ in range(3)]
+
+    for user_id in users:
+        coalescer.typing(room_id, user_id)
+    coalescer.typing(uuid4(), users[0])
+
+    await coalescer.flush()
+
+    event_bus.publish_many.assert_awaited_once()
+    events = event_bus.publish_many.await_args.args[0]
+    assert len(events) == 2
+    assert events[0]["channel"] == room_channel(room_id)
+    assert events[0]["message"]["payload"]["user_ids"] == sorted(str(user_id) for user_id in users)
+
+
+@pytest.mark.asyncio
+async def test_typing_stop_is_sent_after_silence():
+    coalescer, event_bus, clock = make_coalescer()
+    room_id, user_id = uuid4(), uuid4()
+
+    coalescer.typing(room_id, user_id)
+    await coalescer.flush()
+
+    clock.now += 2.0
+    await coalescer.flush()
+    assert len(published(event_bus)) == 1
+
+    clock.now += 1.5
+    await coalescer.flush()
+
+    assert published(event_bus)[-1] == {
+        "type": "typing_stop",
+        "payload": {"room_id": str(room_id), "user_ids": [str(user_id)]},
+    }
+    assert coalescer.stats()["typing_now"] == 0
+
+
+@pytest.mark.asyncio
+async def test_handle_typing_goes_through_coalescer():
+    event_bus = AsyncMock()
+    coalescer = Mock(spec=TypingCoalescer)
+    user_id = UserId(uuid4())
+    room_id = uuid4()
+
+    await handle_typing(
+        event_bus=event_bus,
+        user_id=user_id,
+        payload={"room_id": str(room_id)},
+        typing_coalescer=coalescer,
+    )
+
+    coalescer.typing.assert_called_once_with(room_id, user_id.value)
+    event_bus.publish.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_merged_typing_frame_is_not_excluded_for_anyone():
+    manager = AsyncMock()
+    handler = WebSocketEventHandler(manager)
+    room_id, single = uuid4(), uuid4()
+
+    await handler.handle({
+        "type": "typing",
+        "payload": {"room_id": str(room_id), "user_ids": [str(uuid4()), str(uuid4())]},
+    })
+    await handler.handle({
+        "type": "typing_stop",
+        "payload": {"room_id": str(room_id), "user_ids": [str(single)]},
+    })
+
+    first, second = manager.broadcast_to_room.await_args_list
+    assert first.kwargs["exclude_user_id"] is None
+    assert second.kwargs["exclude_user_id"] == single
@@ -2,9 +2,11 @@ import pytest
 from unittest.mock import AsyncMock, patch, Mock
 from uuid import uuid4
 
+from app.application.messaging.channels import room_channel
 from app.domain.value_objects.user_id import UserId
 from app.interfaces.websocket.handlers import (
     handle_join_room,
+    handle_leave_room,
     handle_send_message,
     handle_typing,
 )
@@ -58,7 +60,31 @@ async def test_handle_join_room_creates_system_message_and_publishes():
         )
 
     manager.join_room.assert_called_once()
+    event_bus.subscribe_room.assert_awaited_once_with(room_id)
     event_bus.publish.assert_awaited_once()
+    assert event_bus.publish.call_args.args[0]["channel"] == room_channel(room_id)
+
+
+@pytest.mark.asyncio
+async def test_handle_join_room_skips_subscribe_for_known_room():
+    event_bus = AsyncMock()
+    manager = Mock()
+    manager.join_room.return_value = False
+
+    fake_uc = AsyncMock()
+
+    with patch(
+        "app.interfaces.websocket.handlers.CreateSystemMessageUseCase",
+        return_value=fake_uc,
+    ):
+        await handle_join_room(
+            event_bus=event_bus,
+            manager=manager,
+            user_id=UserId(uuid4()),
+            payload={"room_id": str(uuid4())},
+        )
+
+    event_bus.subscribe_room.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -92,3 +118,94 @@ async def test_handle_send_message_creates_user_message_and_publishes():
 
     event_bus.publish.assert_awaited_once()
 
+
+
+@pytest.mark.asyncio
+async def test_handle_leave_room_publishes_all_notices_at_once():
+    event_bus = AsyncMock()
+    manager = Mock()
+    room_ids = [uuid4() for _ in range(3)]
+    manager.room_online_memberships.return_value = set(room_ids)
+
+    with patch(
+        "app.interfaces.websocket.handlers.PostgresMessageRepository",
+    ) as repository_cls:
+        repository_cls.return_value.add_many = AsyncMock()
+        await handle_leave_room(
+            event_bus=event_bus,
+            manager=manager,
+            user_id=UserId(uuid4()),
+        )
+
+    repository_cls.return_value.add_many.assert_awaited_once()
+    event_bus.publish.assert_not_awaited()
+    events = event_bus.publish_many.call_args.args[0]
+    assert {event["channel"] for event in events} == {room_channel(r) for r in room_ids}
+
+
+@pytest.mark.asyncio
+async def test_handle_join_room_replays_missed_events_to_connection():
+    event_bus = AsyncMock()
+    room_id = uuid4()
+    missed = {
+        "channel": room_channel(room_id),
+        "message": {"type": "new_message", "stream_id": "1-6"},
+    }
+    event_bus.replay.return_value = [missed]
+
+    manager = Mock()
+    manager.join_room.return_value = False
+    manager.send_to_connection = AsyncMock()
+    websocket = Mock()
+    user_id = UserId(uuid4())
+
+    with patch(
+        "app.interfaces.websocket.handlers.CreateSystemMessageUseCase",
+        return_value=AsyncMock(),
+    ), patch(
+        "app.interfaces.websocket.handlers.CheckRoomMembershipUseCase",
+    ) as membership_cls:
+        membership_cls.return_value.execute = AsyncMock(return_value=True)
+
+        await handle_join_room(
+            event_bus=event_bus,
+            manager=manager,
+            user_id=user_id,
+            payload={"room_id": str(room_id), "since": "1-5"},
+            websocket=websocket,
+            replay_limit=50,
+        )
+
+    event_bus.replay.assert_awaited_once_with(room_id, "1-5", limit=50)
+    manager.send_to_connection.assert_awaited_once_with(
+        user_id=user_id.value,
+        websocket=websocket,
+        message=missed["message"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_join_room_drops_replay_for_non_member():
+    event_bus = AsyncMock()
+    manager = Mock()
+    manager.send_to_connection = AsyncMock()
+
+    with patch(
+        "app.interfaces.websocket.handlers.CreateSystemMessageUseCase",
+    ) as use_case_cls, patch(
+        "app.interfaces.websocket.handlers.CheckRoomMembershipUseCase",
+    ) as membership_cls:
+        membership_cls.return_value.execute = AsyncMock(return_value=False)
+
+        await handle_join_room(
+            event_bus=event_bus,
+            manager=manager,
+            user_id=UserId(uuid4()),
+            payload={"room_id": str(uuid4()), "since": "0"},
+            websocket=Mock(),
+        )
+
+    # история комнаты не уходит чужому сокету, и сам join не выполняется
+    event_bus.replay.assert_not_awaited()
+    manager.join_room.assert_not_called()
+    use_case_cls.assert_not_called()
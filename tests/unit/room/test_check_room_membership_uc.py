@@ -0,0 +1,58 @@
+import pytest
+from uuid import uuid4
+
+from app.application.use_cases.room.check_room_membership import CheckRoomMembershipUseCase
+from app.domain.value_objects.room_id import RoomId
+from app.infrastructure.cache.membership_cache import InMemoryMembershipCache
+
+
+@pytest.mark.asyncio
+async def test_check_membership_uses_point_lookup(room_repository):
+    room_id, user_id = uuid4(), uuid4()
+    room_repository.is_member.return_value = True
+
+    use_case = CheckRoomMembershipUseCase(room_repository=room_repository)
+
+    assert await use_case.execute(room_id=room_id, user_id=user_id) is True
+    room_repository.is_member.assert_awaited_once_with(RoomId(room_id), user_id)
+    room_repository.get_by_id.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_check_membership_is_served_from_cache(room_repository):
+    room_id, user_id = uuid4(), uuid4()
+    room_repository.is_member.return_value = False
+
+    use_case = CheckRoomMembershipUseCase(
+        room_repository=room_repository,
+        membership_cache=InMemoryMembershipCache(),
+    )
+
+    assert await use_case.execute(room_id=room_id, user_id=user_id) is False
+    assert await use_case.execute(room_id=room_id, user_id=user_id) is False
+    room_repository.is_member.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_check_many_queries_only_uncached_rooms(room_repository):
+    user_id = uuid4()
+    cached_room, member_room, foreign_room = uuid4(), uuid4(), uuid4()
+
+    cache = InMemoryMembershipCache()
+    cache.set(cached_room, user_id, True)
+    room_repository.get_member_room_ids.return_value = {member_room}
+
+    use_case = CheckRoomMembershipUseCase(
+        room_repository=room_repository,
+        membership_cache=cache,
+    )
+
+    result = await use_case.execute_many(
+        room_ids=[cached_room, member_room, foreign_room],
+        user_id=user_id,
+    )
+
+    assert result == {cached_room, member_room}
+    queried = room_repository.get_member_room_ids.call_args.args[0]
+    assert queried == [RoomId(member_room), RoomId(foreign_room)]
+    assert cache.get(foreign_room, user_id) is False
@@ -3,6 +3,7 @@ from uuid import uuid4
 
 from app.application.use_cases.room.join_room import JoinRoomUseCase
 from app.application.exceptions import RoomNotFoundError, UserAlreadyInRoomError
+from app.infrastructure.cache.membership_cache import InMemoryMembershipCache
 
 
 @pytest.mark.asyncio
@@ -73,3 +74,29 @@ async def test_join_room_user_already_member(
 
     assert uow.committed is False
     assert uow.rolled_back is True
+
+
+@pytest.mark.asyncio
+async def test_join_room_invalidates_membership_cache(
+    uow,
+    room_repository,
+    public_room,
+):
+    new_user_id = uuid4()
+    room_repository.get_by_id.return_value = public_room
+
+    cache = InMemoryMembershipCache()
+    cache.set(public_room.id.value, new_user_id, False)
+
+    use_case = JoinRoomUseCase(
+        uow=uow,
+        room_repository=room_repository,
+        membership_cache=cache,
+    )
+
+    await use_case.execute(
+        room_id=public_room.id.value,
+        user_id=new_user_id,
+    )
+
+    assert cache.get(public_room.id.value, new_user_id) is None
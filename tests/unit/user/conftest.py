@@ -21,6 +21,8 @@ def password_hasher():
     hasher = Mock(spec=PasswordHasher)
     hasher.verify.return_value = True
     hasher.hash.return_value = "hashed-password"
+    hasher.verify_async.return_value = True
+    hasher.hash_async.return_value = "hashed-password"
     return hasher
 
 
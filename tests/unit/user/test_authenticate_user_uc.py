@@ -0,0 +1,72 @@
+import pytest
+
+from app.application.use_cases.user.authenticate_user import AuthenticateUserUseCase
+from app.application.use_cases.user.deactivate_user import DeactivateUserUseCase
+from app.application.exceptions import InactiveUserError, UserNotFoundError
+from app.infrastructure.cache.identity_cache import InMemoryIdentityCache
+
+
+@pytest.mark.asyncio
+async def test_authenticate_caches_identity(user_repository, active_user):
+    user_repository.get_by_id.return_value = active_user
+    cache = InMemoryIdentityCache()
+
+    use_case = AuthenticateUserUseCase(
+        user_repository=user_repository,
+        identity_cache=cache,
+    )
+
+    first = await use_case.execute(active_user.id.value)
+    second = await use_case.execute(active_user.id.value)
+
+    assert first.id == active_user.id
+    assert second.email == active_user.email
+    assert not hasattr(second, "password")
+    user_repository.get_by_id.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_rejects_cached_inactive_user(user_repository, inactive_user):
+    user_repository.get_by_id.return_value = inactive_user
+
+    use_case = AuthenticateUserUseCase(
+        user_repository=user_repository,
+        identity_cache=InMemoryIdentityCache(),
+    )
+
+    for _ in range(2):
+        with pytest.raises(InactiveUserError):
+            await use_case.execute(inactive_user.id.value)
+
+    user_repository.get_by_id.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_unknown_user(user_repository, active_user):
+    user_repository.get_by_id.return_value = None
+
+    use_case = AuthenticateUserUseCase(user_repository=user_repository)
+
+    with pytest.raises(UserNotFoundError):
+        await use_case.execute(active_user.id.value)
+
+
+@pytest.mark.asyncio
+async def test_deactivate_user_invalidates_identity(uow, user_repository, active_user):
+    user_repository.get_by_id.return_value = active_user
+    cache = InMemoryIdentityCache()
+
+    await AuthenticateUserUseCase(
+        user_repository=user_repository,
+        identity_cache=cache,
+    ).execute(active_user.id.value)
+
+    await DeactivateUserUseCase(
+        uow=uow,
+        user_repository=user_repository,
+        identity_cache=cache,
+    ).execute(active_user.id.value)
+
+    user_repository.update.assert_awaited_once_with(active_user)
+    assert uow.committed is True
+    assert await cache.get(active_user.id.value) is None
@@ -0,0 +1,55 @@
+import time
+import pytest
+from uuid import uuid4
+
+from app.infrastructure.security.jwt_service import JoseJWTService, JWTErrorInvalidToken
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+def test_access_token_is_verified_once():
+    service = JoseJWTService(verified_cache_size=10)
+    user_id = uuid4()
+    token = service.create_access_token(user_id)
+
+    assert service.verify_access_token(token) == user_id
+    assert service.verify_access_token(token) == user_id
+
+    stats = service.cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_cached_token_expires_with_exp():
+    clock = FakeClock()
+    service = JoseJWTService(verified_cache_size=10, clock=clock)
+    token = service.create_access_token(uuid4())
+
+    service.verify_access_token(token)
+    clock.now += 16 * 60
+
+    # после exp запись не используется, токен проверяется заново
+    service.verify_access_token(token)
+
+    assert service.cache_stats()["misses"] == 2
+
+
+def test_cache_is_bounded_and_skips_refresh_tokens():
+    service = JoseJWTService(verified_cache_size=2)
+
+    for _ in range(3):
+        service.verify_access_token(service.create_access_token(uuid4()))
+
+    refresh_token = service.create_refresh_token(uuid4())
+    service.verify_refresh_token(refresh_token)
+
+    assert service.cache_stats()["size"] == 2
+
+    with pytest.raises(JWTErrorInvalidToken):
+        service.verify_access_token(refresh_token)
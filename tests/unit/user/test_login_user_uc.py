@@ -36,7 +36,7 @@ async def test_login_success(
     assert uow.committed is True
     assert uow.rolled_back is False
 
-    password_hasher.verify.assert_called_once_with(
+    password_hasher.verify_async.assert_awaited_once_with(
         "plain-password",
         active_user.password.value,
     )
@@ -90,7 +90,7 @@ async def test_login_invalid_password(
     active_user,
 ):
     user_repository.get_by_email.return_value = active_user
-    password_hasher.verify.return_value = False
+    password_hasher.verify_async.return_value = False
 
     with pytest.raises(InvalidCredentialsError):
         await use_case.execute(
@@ -98,5 +98,6 @@ async def test_login_invalid_password(
             raw_password="wrong-password",
         )
 
-    assert uow.committed is False
-    assert uow.rolled_back is True
+    # пароль проверяется уже после выхода из транзакции чтения
+    assert uow.committed is True
+    assert uow.rolled_back is False
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import pytest
+
+from app.application.exceptions import PasswordHasherBusyError
+from app.infrastructure.security.password_hasher import BCryptPasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_round_trip():
+    hasher = BCryptPasswordHasher(max_workers=1)
+
+    hashed = await hasher.hash_async("strong-password")
+
+    assert await hasher.verify_async("strong-password", hashed) is True
+    assert await hasher.verify_async("wrong-password", hashed) is False
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_fast():
+    hasher = BCryptPasswordHasher(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    def slow_verify(raw_password, hashed_password):
+        release.wait(timeout=5)
+        return True
+
+    hasher.verify = slow_verify
+
+    running = asyncio.create_task(hasher.verify_async("a", "h"))
+    queued = asyncio.create_task(hasher.verify_async("b", "h"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherBusyError):
+        await hasher.verify_async("c", "h")
+
+    release.set()
+    assert await running is True
+    assert await queued is True
+    assert hasher.stats()["rejected"] == 1
+    hasher.shutdown()
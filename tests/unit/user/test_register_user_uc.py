@@ -57,4 +57,22 @@ async def test_password_is_hashed_before_user_creation(use_case, password_hasher
         raw_password="plain-password",
     )
 
-    password_hasher.hash.assert_called_once_with("plain-password")
+    password_hasher.hash_async.assert_awaited_once_with("plain-password")
+
+
+@pytest.mark.asyncio
+async def test_password_is_hashed_outside_transaction(use_case, password_hasher, user_repository, uow):
+    async def hash_async(raw_password):
+        # транзакция проверки email уже закрыта, вставки ещё не было
+        assert uow.committed is True
+        user_repository.add.assert_not_called()
+        return "hashed-password"
+
+    password_hasher.hash_async.side_effect = hash_async
+
+    await use_case.execute(
+        email="test@example.com",
+        raw_password="plain-password",
+    )
+
+    user_repository.add.assert_awaited_once()
@@ -12,5 +12,5 @@ def manager() -> ConnectionManager:
 def websocket() -> AsyncMock:
     ws = AsyncMock()
     ws.accept = AsyncMock()
-    ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
     return ws
\ No newline at end of file
@@ -1,6 +1,16 @@
+import asyncio
+import json
 import pytest
 from uuid import uuid4
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
+
+from app.infrastructure.websocket.encoders import StdlibJsonEncoder, get_json_encoder
+from app.infrastructure.websocket.connection import EnqueueStatus
+from app.infrastructure.websocket.manager import ConnectionManager
+
+
+def frame(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"))
 
 
 @pytest.mark.asyncio
@@ -43,8 +53,9 @@ async def test_send_to_user_sends_message(manager, websocket):
 
     await manager.connect(user_id=user_id, websocket=websocket)
     await manager.send_to_user(user_id=user_id, message=message)
+    await manager.drain()
 
-    websocket.send_json.assert_awaited_once_with(message)
+    websocket.send_text.assert_awaited_once_with(frame(message))
 
 
 @pytest.mark.asyncio
@@ -55,11 +66,11 @@ async def test_broadcast_to_room(manager):
 
     ws1 = AsyncMock()
     ws1.accept = AsyncMock()
-    ws1.send_json = AsyncMock()
+    ws1.send_text = AsyncMock()
 
     ws2 = AsyncMock()
     ws2.accept = AsyncMock()
-    ws2.send_json = AsyncMock()
+    ws2.send_text = AsyncMock()
 
     await manager.connect(user_id=user1, websocket=ws1)
     await manager.connect(user_id=user2, websocket=ws2)
@@ -70,9 +81,10 @@ async def test_broadcast_to_room(manager):
     message = {"type": "broadcast"}
 
     await manager.broadcast_to_room(room_id=room_id, message=message)
+    await manager.drain()
 
-    ws1.send_json.assert_awaited_once_with(message)
-    ws2.send_json.assert_awaited_once_with(message)
+    ws1.send_text.assert_awaited_once_with(frame(message))
+    ws2.send_text.assert_awaited_once_with(frame(message))
 
 
 @pytest.mark.asyncio
@@ -83,11 +95,11 @@ async def test_broadcast_excludes_user(manager):
 
     ws1 = AsyncMock()
     ws1.accept = AsyncMock()
-    ws1.send_json = AsyncMock()
+    ws1.send_text = AsyncMock()
 
     ws2 = AsyncMock()
     ws2.accept = AsyncMock()
-    ws2.send_json = AsyncMock()
+    ws2.send_text = AsyncMock()
 
     await manager.connect(user_id=user1, websocket=ws1)
     await manager.connect(user_id=user2, websocket=ws2)
@@ -102,6 +114,185 @@ async def test_broadcast_excludes_user(manager):
         message=message,
         exclude_user_id=user1,
     )
+    await manager.drain()
+
+    ws1.send_text.assert_not_awaited()
+    ws2.send_text.assert_awaited_once_with(frame(message))
+
+
+@pytest.mark.asyncio
+async def test_broadcast_slow_socket_does_not_block_others():
+    manager = ConnectionManager(send_timeout=0.05)
+    room_id = uuid4()
+    slow_user = uuid4()
+    fast_user = uuid4()
+
+    async def hang(data):
+        await asyncio.sleep(10)
+
+    slow_ws = AsyncMock()
+    slow_ws.send_text = AsyncMock(side_effect=hang)
+    fast_ws = AsyncMock()
+
+    await manager.connect(user_id=slow_user, websocket=slow_ws)
+    await manager.connect(user_id=fast_user, websocket=fast_ws)
+    manager.join_room(room_id=room_id, user_id=slow_user)
+    manager.join_room(room_id=room_id, user_id=fast_user)
+
+    results = await manager.broadcast_to_room(room_id=room_id, message={"type": "broadcast"})
+    await asyncio.wait_for(manager.drain(), timeout=1)
+
+    assert {result.status for result in results} == {EnqueueStatus.QUEUED}
+    fast_ws.send_text.assert_awaited_once_with(frame({"type": "broadcast"}))
+
+    stats = {item["user_id"]: item for item in manager.connection_stats()}
+    assert stats[str(slow_user)]["send_timeouts"] == 1
+    assert stats[str(fast_user)]["sent"] == 1
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reports_failed_socket():
+    manager = ConnectionManager()
+    room_id = uuid4()
+    user_id = uuid4()
+
+    broken_ws = AsyncMock()
+    broken_ws.send_text = AsyncMock(side_effect=RuntimeError("closed"))
+
+    await manager.connect(user_id=user_id, websocket=broken_ws)
+    manager.join_room(room_id=room_id, user_id=user_id)
+
+    await manager.broadcast_to_room(room_id=room_id, message={"type": "broadcast"})
+    await manager.drain()
+
+    assert manager.connection_stats()[0]["send_errors"] == 1
+
+    results = await manager.broadcast_to_room(room_id=room_id, message={"type": "broadcast"})
+
+    assert [result.status for result in results] == [EnqueueStatus.CLOSED]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_caps_concurrent_sends():
+    manager = ConnectionManager(max_concurrent_sends=2)
+    room_id = uuid4()
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def send(data):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    for _ in range(10):
+        user_id = uuid4()
+        ws = AsyncMock()
+        ws.send_text = AsyncMock(side_effect=send)
+        await manager.connect(user_id=user_id, websocket=ws)
+        manager.join_room(room_id=room_id, user_id=user_id)
+
+    results = await manager.broadcast_to_room(room_id=room_id, message={"type": "broadcast"})
+    await manager.drain()
+
+    assert len(results) == 10
+    assert all(item["sent"] == 1 for item in manager.connection_stats())
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_message_once():
+    encoder = Mock(wraps=StdlibJsonEncoder())
+    manager = ConnectionManager(encoder=encoder)
+    room_id = uuid4()
+
+    sockets = []
+    for _ in range(5):
+        user_id = uuid4()
+        ws = AsyncMock()
+        sockets.append(ws)
+        await manager.connect(user_id=user_id, websocket=ws)
+        manager.join_room(room_id=room_id, user_id=user_id)
+
+    message = {"type": "new_message", "payload": {"content": "привет"}}
+
+    await manager.broadcast_to_room(room_id=room_id, message=message)
+    await manager.drain()
+
+    encoder.encode.assert_called_once_with(message)
+    for ws in sockets:
+        ws.send_text.assert_awaited_once_with(
+            json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        )
+
+
+def test_typing_and_typing_stop_share_room_coalesce_key(manager):
+    room_id = str(uuid4())
+
+    typing = manager._to_frame(
+        {"type": "typing", "payload": {"room_id": room_id, "user_ids": [str(uuid4())]}},
+    )
+    typing_stop = manager._to_frame(
+        {"type": "typing_stop", "payload": {"room_id": room_id, "user_ids": [str(uuid4())]}},
+    )
+
+    # stop заменяет стоящий в очереди typing, а не обгоняется им
+    assert typing.coalesce_key == typing_stop.coalesce_key == ("typing", room_id)
+    assert typing_stop.droppable is True
+
+
+def test_orjson_encoder_matches_stdlib_format():
+    pytest.importorskip("orjson")
+    orjson_encoder = get_json_encoder("orjson")
+    message = {"type": "typing", "payload": {"room_id": str(uuid4()), "text": "ёж"}}
+
+    assert orjson_encoder.encode(message) == StdlibJsonEncoder().encode(message)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_removes_user_from_all_rooms(manager, websocket):
+    user_id = uuid4()
+    other_user = uuid4()
+    rooms = [uuid4() for _ in range(3)]
+
+    await manager.connect(user_id=user_id, websocket=websocket)
+    for room_id in rooms:
+        manager.join_room(room_id=room_id, user_id=user_id)
+    manager.join_room(room_id=rooms[0], user_id=other_user)
+
+    assert manager.room_online_memberships(user_id) == set(rooms)
+
+    manager.disconnect(user_id=user_id, websocket=websocket)
+
+    assert manager.room_online_memberships(user_id) == set()
+    assert manager.room_online_members(rooms[0]) == {other_user}
+    assert manager.room_online_members(rooms[1]) == set()
+
+
+def test_leave_room_updates_reverse_index(manager):
+    user_id = uuid4()
+    room_a = uuid4()
+    room_b = uuid4()
+
+    manager.join_room(room_id=room_a, user_id=user_id)
+    manager.join_room(room_id=room_b, user_id=user_id)
+    manager.leave_room(room_id=room_a, user_id=user_id)
+
+    assert manager.room_online_memberships(user_id) == {room_b}
+
+
+@pytest.mark.asyncio
+async def test_room_activation_is_reported_on_first_join_and_last_leave(manager, websocket):
+    room_id = uuid4()
+    user1 = uuid4()
+    user2 = uuid4()
+
+    await manager.connect(user_id=user1, websocket=websocket)
+
+    assert manager.join_room(room_id=room_id, user_id=user1) is True
+    assert manager.join_room(room_id=room_id, user_id=user2) is False
 
-    ws1.send_json.assert_not_awaited()
-    ws2.send_json.assert_awaited_once_with(message)
+    assert manager.leave_room(room_id=room_id, user_id=user2) is False
+    assert manager.disconnect(user_id=user1, websocket=websocket) == {room_id}
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock
+
+from app.infrastructure.websocket.connection import (
+    Connection,
+    EnqueueStatus,
+    OutboundFrame,
+    OverflowPolicy,
+)
+from app.infrastructure.websocket.fanout import FanOut
+
+
+def typing_frame(user_id="u1") -> OutboundFrame:
+    return OutboundFrame(
+        f"typing:{user_id}",
+        droppable=True,
+        coalesce_key=("typing", "room", user_id),
+    )
+
+
+async def blocked_connection(policy: OverflowPolicy, max_queue_size: int = 2):
+    """Connection whose writer is stuck on the first frame, so the queue fills up."""
+    release = asyncio.Event()
+
+    async def send(data):
+        await release.wait()
+
+    websocket = AsyncMock()
+    websocket.send_text = AsyncMock(side_effect=send)
+
+    connection = Connection(
+        uuid4(),
+        websocket,
+        FanOut(send_timeout=5),
+        max_queue_size=max_queue_size,
+        overflow_policy=policy,
+    )
+    connection.start()
+
+    connection.enqueue(OutboundFrame("in-flight"))
+    await asyncio.sleep(0)  # writer забирает первый кадр и зависает на нём
+
+    return connection, websocket, release
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_typing_makes_room_for_messages():
+    connection, websocket, release = await blocked_connection(OverflowPolicy.DROP_OLDEST_TYPING)
+
+    connection.enqueue(typing_frame())
+    connection.enqueue(OutboundFrame("msg-1"))
+
+    assert connection.enqueue(OutboundFrame("msg-2")) == EnqueueStatus.QUEUED
+
+    release.set()
+    await connection.wait_idle()
+
+    sent = [call.args[0] for call in websocket.send_text.await_args_list]
+    assert sent == ["in-flight", "msg-1", "msg-2"]
+    assert connection.stats()["dropped"] == 1
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_replaces_queued_typing_frame():
+    connection, websocket, release = await blocked_connection(OverflowPolicy.COALESCE)
+
+    connection.enqueue(typing_frame())
+    connection.enqueue(OutboundFrame("msg-1"))
+
+    newer_typing = OutboundFrame("typing:newer", droppable=True, coalesce_key=("typing", "room", "u1"))
+    assert connection.enqueue(newer_typing) == EnqueueStatus.COALESCED
+    assert connection.queue_depth == 2
+
+    release.set()
+    await connection.wait_idle()
+
+    sent = [call.args[0] for call in websocket.send_text.await_args_list]
+    assert sent == ["in-flight", "typing:newer", "msg-1"]
+    assert connection.stats()["coalesced"] == 1
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_of_messages_evicts_slow_consumer():
+    connection, websocket, release = await blocked_connection(OverflowPolicy.DROP_OLDEST_TYPING)
+
+    connection.enqueue(OutboundFrame("msg-1"))
+    connection.enqueue(OutboundFrame("msg-2"))
+
+    assert connection.enqueue(typing_frame()) == EnqueueStatus.DROPPED
+    assert connection.enqueue(OutboundFrame("msg-3")) == EnqueueStatus.EVICTED
+    assert connection.enqueue(OutboundFrame("msg-4")) == EnqueueStatus.CLOSED
+
+    release.set()
+    await connection.wait_idle()
+    await asyncio.sleep(0)
+
+    websocket.close.assert_awaited_once_with(code=1013)
+    stats = connection.stats()
+    assert stats["evicted"] is True
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_evicts_immediately():
+    connection, websocket, release = await blocked_connection(
+        OverflowPolicy.DISCONNECT,
+        max_queue_size=1,
+    )
+
+    connection.enqueue(typing_frame())
+
+    assert connection.enqueue(typing_frame("u2")) == EnqueueStatus.EVICTED
+    assert connection.evicted is True
+
+    release.set()
+    await connection.wait_idle()
+    await asyncio.sleep(0)
+
+    websocket.close.assert_awaited_once_with(code=1013)
+
+
+@pytest.mark.asyncio
+async def test_send_timeout_closes_connection_as_slow_consumer():
+    async def send(data):
+        await asyncio.Event().wait()
+
+    websocket = AsyncMock()
+    websocket.send_text = AsyncMock(side_effect=send)
+
+    connection = Connection(uuid4(), websocket, FanOut(send_timeout=0.01))
+    connection.start()
+
+    connection.enqueue(OutboundFrame("msg-1"))
+    connection.enqueue(OutboundFrame("msg-2"))
+    await connection.wait_idle()
+    await asyncio.sleep(0)
+
+    # после обрыва кадра писать в сокет дальше нельзя
+    websocket.send_text.assert_awaited_once_with("msg-1")
+    websocket.close.assert_awaited_once_with(code=1013)
+    assert connection.enqueue(OutboundFrame("msg-3")) == EnqueueStatus.CLOSED
+
+    stats = connection.stats()
+    assert stats["send_timeouts"] == 1
+    assert stats["evicted"] is True
@@ -0,0 +1,195 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi import WebSocketDisconnect
+
+from app.domain.value_objects.user_id import UserId
+from app.interfaces.websocket.handlers import handle_send_message
+from app.interfaces.websocket.router import _next_batch
+from app.interfaces.websocket.session_scope import ConnectionSessionScope
+
+
+def make_scope():
+    session = AsyncMock()
+    session_factory = Mock(return_value=session)
+    event_bus = AsyncMock()
+    return ConnectionSessionScope(session_factory, event_bus), session_factory, session, event_bus
+
+
+@pytest.mark.asyncio
+async def test_session_is_checked_out_lazily_and_released_on_commit():
+    scope, session_factory, session, event_bus = make_scope()
+
+    await scope.commit()
+    session_factory.assert_not_called()
+
+    assert await scope.session() is await scope.session()
+    await scope.commit()
+
+    session_factory.assert_called_once()
+    session.commit.assert_awaited_once()
+    session.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_events_are_published_only_after_commit():
+    scope, _, session, event_bus = make_scope()
+    order = []
+    session.commit.side_effect = lambda: order.append("commit")
+    event_bus.publish_many.side_effect = lambda events: order.extend(e["n"] for e in events)
+
+    await scope.session()
+    scope.publish_after_commit({"n": 1})
+    scope.publish_after_commit({"n": 2})
+    assert order == []
+
+    await scope.commit()
+
+    assert order == ["commit", 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_after_commit_callbacks_run_between_commit_and_publish():
+    scope, _, session, event_bus = make_scope()
+    order = []
+    session.commit.side_effect = lambda: order.append("commit")
+    event_bus.publish_many.side_effect = lambda events: order.append("publish")
+
+    async def remember():
+        order.append("callback")
+
+    await scope.session()
+    scope.after_commit(remember)
+    scope.publish_after_commit({"n": 1})
+    await scope.commit()
+
+    assert order == ["commit", "callback", "publish"]
+
+
+@pytest.mark.asyncio
+async def test_close_drops_uncommitted_events():
+    scope, _, session, event_bus = make_scope()
+
+    await scope.session()
+    scope.publish_after_commit({"n": 1})
+    await scope.close()
+
+    session.commit.assert_not_awaited()
+    session.close.assert_awaited_once()
+    event_bus.publish_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_send_message_in_scope_defers_publish():
+    scope, _, _, event_bus = make_scope()
+    room_id = uuid4()
+
+    fake_message = AsyncMock()
+    fake_message.room_id.value = room_id
+    fake_message.created_at.isoformat.return_value = "now"
+
+    fake_uc = AsyncMock()
+    fake_uc.execute.return_value = fake_message
+
+    with patch(
+        "app.interfaces.websocket.handlers.CreateUserMessageUseCase",
+        return_value=fake_uc,
+    ):
+        await handle_send_message(
+            event_bus=event_bus,
+            user_id=UserId(uuid4()),
+            payload={"room_id": str(room_id), "content": "hello"},
+            scope=scope,
+        )
+
+    event_bus.publish_many.assert_not_awaited()
+    await scope.commit()
+    event_bus.publish_many.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_frames_that_arrived_together_form_one_batch():
+    frames = asyncio.Queue()
+    for raw in ("a", "b", "c"):
+        frames.put_nowait(raw)
+    frames.put_nowait(WebSocketDisconnect())
+
+    assert await _next_batch(frames, max_frames=2) == ["a", "b"]
+    assert await _next_batch(frames, max_frames=2) == ["c"]
+
+    with pytest.raises(WebSocketDisconnect):
+        await _next_batch(frames, max_frames=2)
+
+
+@pytest.mark.asyncio
+async def test_single_frame_batch_skips_savepoint():
+    scope, _, session, _ = make_scope()
+    scope.begin_batch(1)
+
+    async with await scope.unit_of_work():
+        pass
+
+    session.begin_nested.assert_not_called()
+    session.commit.assert_not_awaited()
+
+    await scope.commit()
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_multi_frame_batch_isolates_frames_in_savepoints():
+    scope, _, session, _ = make_scope()
+    scope.begin_batch(3)
+
+    scope.begin_frame()
+    async with await scope.unit_of_work():
+        pass
+    await scope.end_frame()
+
+    session.begin_nested.assert_awaited_once()
+    session.begin_nested.return_value.commit.assert_awaited_once()
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_frame_is_discarded_and_earlier_frames_commit():
+    scope, _, session, event_bus = make_scope()
+    first, second = AsyncMock(), AsyncMock()
+    session.begin_nested.side_effect = [first, second]
+    scope.begin_batch(2)
+
+    scope.begin_frame()
+    await scope.session()
+    scope.publish_after_commit({"n": 1})
+    await scope.end_frame()
+
+    scope.begin_frame()
+    await scope.session()
+    scope.publish_after_commit({"n": 2})
+    await scope.discard_frame()
+
+    await scope.commit()
+
+    first.commit.assert_awaited_once()
+    second.rollback.assert_awaited_once()
+    second.commit.assert_not_awaited()
+    session.commit.assert_awaited_once()
+    event_bus.publish_many.assert_awaited_once_with([{"n": 1}])
+
+
+@pytest.mark.asyncio
+async def test_failed_single_frame_rolls_back_the_transaction():
+    scope, _, session, event_bus = make_scope()
+    scope.begin_batch(1)
+
+    scope.begin_frame()
+    await scope.session()
+    scope.publish_after_commit({"n": 1})
+    await scope.discard_frame()
+    await scope.commit()
+
+    session.begin_nested.assert_not_called()
+    session.rollback.assert_awaited_once()
+    event_bus.publish_many.assert_not_awaited()